@@ -1,71 +1,291 @@
+import time
 from pathlib import Path
+from typing import Any, Mapping, Optional
 
-from flask                 import Flask
+from flask                 import Flask, redirect, url_for
 from flask_cors            import CORS
 from flask_session         import Session
-from utils.database_util   import DatabaseManager
-from utils.config_util     import ConfigManager as Config
-from flask import redirect, url_for
-
-from routes.auth import auth_bp
-from routes.main_page import mainpage_bp
-from routes.meal import meal_bp
-from routes.schedule import schedule_bp
-from routes.timetable import timetable_bp
-from routes.post import post_bp
-
-app = Flask(__name__)
-
-# 프론트엔드와 세션 유지 가능하게 설정 (프론트엔드에서 꼭 withCredentials: true 확인!)
-CORS(app, supports_credentials=True)
-Config().read_file("config.json")
-config_data = Config().get()
-
-
-# Flask 세션 설정 추가
-app.config['SECRET_KEY']         = config_data["Session"]["Key"]
-app.config['SESSION_TYPE']       = config_data["Session"]["Type"]
-app.config['SESSION_PERMANENT']  = config_data["Session"]["Permanent"]
-app.config['SESSION_USE_SIGNER'] = config_data["Session"]["UseSigner"]
-app.config['SESSION_KEY_PREFIX'] = config_data["Session"]["KeyPrefix"]
-
-# 업로드 관련 설정
-uploads_cfg = config_data.get("Uploads", {})
-raw_upload_dir = uploads_cfg.get("PostImageFolder", "uploads/posts")
-upload_dir_path = Path(raw_upload_dir)
-if not upload_dir_path.is_absolute():
-    upload_dir_path = Path(app.root_path) / upload_dir_path
-upload_dir_path.mkdir(parents=True, exist_ok=True)
-app.config['POST_IMAGE_UPLOAD_FOLDER'] = str(upload_dir_path)
-allowed_exts = uploads_cfg.get("AllowedExtensions", ["jpg", "jpeg", "png", "gif", "webp"])
-app.config['POST_IMAGE_ALLOWED_EXTENSIONS'] = {ext.lower() for ext in allowed_exts}
-app.config['POST_IMAGE_MAX_BYTES'] = int(uploads_cfg.get("MaxImageSizeMB", 5) * 1024 * 1024)
-max_request_mb = uploads_cfg.get("MaxRequestSizeMB", 20)
-if max_request_mb:
-    app.config['MAX_CONTENT_LENGTH'] = int(max_request_mb * 1024 * 1024)
-
-Session(app)
-
-# 데이터베이스 연결 초기화
-DatabaseManager().connect(
-    host     = config_data["Database"]["Host"],
-    username = config_data["Database"]["Username"],
-    password = config_data["Database"]["Password"],
-)
-
-app.register_blueprint(auth_bp)
-app.register_blueprint(mainpage_bp)
-app.register_blueprint(meal_bp)
-app.register_blueprint(schedule_bp)
-app.register_blueprint(timetable_bp)
-app.register_blueprint(post_bp)
-
-@app.route("/")
-def home():
-    return redirect(url_for('main.main_page'))
+from werkzeug.middleware.proxy_fix import ProxyFix
+from utils.config_util     import ConfigManager as Config, notify_config_listeners, register_config_listener
+
+
+def _resolve_path(app: Flask, raw_path: str) -> Path:
+    path = Path(raw_path)
+    if not path.is_absolute():
+        path = Path(app.root_path) / path
+    return path
+
+
+def load_config(app: Flask, config_data: Mapping[str, Any]) -> None:
+    """
+    `config.json` 내용을 `app.config`에 옮김. 설정을 다시 읽었을 때도 호출됨.
+    """
+    # Flask 세션 설정 추가
+    app.config['SECRET_KEY']         = config_data["Session"]["Key"]
+    app.config['SESSION_TYPE']       = config_data["Session"]["Type"]
+    app.config['SESSION_PERMANENT']  = config_data["Session"]["Permanent"]
+    app.config['SESSION_USE_SIGNER'] = config_data["Session"]["UseSigner"]
+    app.config['SESSION_KEY_PREFIX'] = config_data["Session"]["KeyPrefix"]
+    # 세션에 넣어 둔 로그인 정보를 DB 확인 없이 믿는 시간(초)
+    app.config['SESSION_CLAIMS_MAX_AGE'] = config_data["Session"].get("ClaimsMaxAge", 600)
+
+    # 업로드 관련 설정
+    uploads_cfg = config_data.get("Uploads", {})
+    upload_dir_path = _resolve_path(app, uploads_cfg.get("PostImageFolder", "uploads/posts"))
+    upload_dir_path.mkdir(parents=True, exist_ok=True)
+    app.config['POST_IMAGE_UPLOAD_FOLDER'] = str(upload_dir_path)
+    allowed_exts = uploads_cfg.get("AllowedExtensions", ["jpg", "jpeg", "png", "gif", "webp"])
+    app.config['POST_IMAGE_ALLOWED_EXTENSIONS'] = {ext.lower() for ext in allowed_exts}
+    app.config['POST_IMAGE_MAX_BYTES'] = int(uploads_cfg.get("MaxImageSizeMB", 5) * 1024 * 1024)
+    max_request_mb = uploads_cfg.get("MaxRequestSizeMB", 20)
+    app.config['MAX_CONTENT_LENGTH'] = int(max_request_mb * 1024 * 1024) if max_request_mb else None
+    # 업로드 이미지 변환 (목록용 썸네일/상세용 크기/WebP, Pillow 필요)
+    renditions_cfg = uploads_cfg.get("Renditions", {})
+    app.config['POST_IMAGE_RENDITIONS']        = renditions_cfg.get("Enabled", True)
+    app.config['POST_IMAGE_RENDITION_WORKERS'] = renditions_cfg.get("Workers", 2)
+    app.config['POST_IMAGE_THUMB_SIZE']        = renditions_cfg.get("ThumbSize", 320)
+    app.config['POST_IMAGE_DETAIL_SIZE']       = renditions_cfg.get("DetailSize", 1280)
+    app.config['POST_IMAGE_RENDITION_QUALITY'] = renditions_cfg.get("Quality", 82)
+    app.config['POST_IMAGE_WEBP']              = renditions_cfg.get("WebP", True)
+    # 원본 최대 픽셀 수 (가로 x 세로). 넘으면 디코딩하지 않고 변환 실패로 표시함 (압축 폭탄 방지)
+    app.config['POST_IMAGE_MAX_PIXELS']        = renditions_cfg.get("MaxPixels", 40_000_000)
+    # 이미지 전송 방식: "flask"(직접 전송), "x-accel-redirect"(nginx), "x-sendfile"(Apache 등)
+    app.config['POST_IMAGE_SERVE_MODE']   = uploads_cfg.get("ServeMode", "flask").lower()
+    app.config['POST_IMAGE_ACCEL_PREFIX'] = uploads_cfg.get("AccelRedirectPrefix", "/protected/posts/")
+    app.config['USE_X_SENDFILE']          = app.config['POST_IMAGE_SERVE_MODE'] == "x-sendfile"
+    # 이미지 저장소: {"Type": "local"} 또는 {"Type": "s3", "Bucket": ..., "EndpointURL": ...} (utils.storage_util 참고)
+    # s3면 업로드 폴더에는 업로드/변환 중인 임시 파일만 남음
+    app.config['POST_IMAGE_STORAGE'] = uploads_cfg.get("Storage", {"Type": "local"})
+
+    # 게시물 목록/상세 캐시 설정
+    cache_cfg = config_data.get("Cache", {})
+    app.config['POST_LIST_CACHE_MAX_ENTRIES']   = cache_cfg.get("PostListMaxEntries", 256)
+    app.config['POST_LIST_CACHE_TTL']           = cache_cfg.get("PostListTTL", 30)
+    app.config['POST_DETAIL_CACHE_MAX_ENTRIES'] = cache_cfg.get("PostDetailMaxEntries", 512)
+    app.config['POST_DETAIL_CACHE_TTL']         = cache_cfg.get("PostDetailTTL", 30)
+
+    # 급식 캐시 설정 (한 달치 급식표를 SQLite 파일에 저장)
+    meal_cfg = config_data.get("Meal", {})
+    app.config['MEAL_CACHE_PATH']          = str(_resolve_path(app, meal_cfg.get("CachePath", "cache/meal_cache.sqlite3")))
+    app.config['MEAL_REFRESH_HOURS']       = meal_cfg.get("RefreshHours", 24)
+    app.config['MEAL_EMPTY_RETRY_MINUTES'] = meal_cfg.get("EmptyRetryMinutes", 60)
+    app.config['MEAL_REFRESH_PAST_MONTHS'] = meal_cfg.get("RefreshPastMonths", False)
+
+    # 시간표 캐시 설정 (전 학년/전 반 주간 시간표를 메모리에 보관)
+    timetable_cfg = config_data.get("Timetable", {})
+    app.config['TIMETABLE_REFRESH_MINUTES']    = timetable_cfg.get("RefreshMinutes", 60)
+    app.config['TIMETABLE_BACKGROUND_REFRESH'] = timetable_cfg.get("BackgroundRefresh", True)
+
+    # 학사일정 캐시 설정 (fresh 동안은 그대로 쓰고, 그 뒤 stale 동안은 예전 값을 주면서 백그라운드 갱신)
+    schedule_cfg = config_data.get("Schedule", {})
+    app.config['SCHEDULE_FRESH_SECONDS'] = schedule_cfg.get("FreshSeconds", 600)
+    app.config['SCHEDULE_STALE_SECONDS'] = schedule_cfg.get("StaleSeconds", 7 * 86400)
+
+    # 메인 화면 "오늘" 정보 응답 대기 시간(초)
+    app.config['MAIN_TODAY_TIMEOUT'] = config_data.get("Main", {}).get("TodayTimeout", 3)
+    # `/main/status`를 관리자 로그인 없이 볼 수 있게 할지 (내부 모니터링 서버에서만 켤 것)
+    app.config['MAIN_PUBLIC_STATUS'] = config_data.get("Main", {}).get("PublicStatus", False)
+    # 항목별 제한 시간(초), 예: {"timetable": 2, "schedule": 1.5}. 없는 항목은 TodayTimeout을 씀
+    app.config['MAIN_TODAY_SECTION_TIMEOUTS'] = dict(config_data.get("Main", {}).get("TodayTimeouts", {}))
+
+    # 좋아요 수 쓰기 지연(모아서 반영) 설정
+    likes_cfg = config_data.get("Likes", {})
+    app.config['POST_LIKE_WRITE_BEHIND']   = likes_cfg.get("WriteBehind", False)
+    app.config['POST_LIKE_FLUSH_INTERVAL'] = likes_cfg.get("FlushInterval", 2)
+
+    # 학생 명부(학번 -> 이름/관리자 여부) 메모리 캐시 갱신 주기
+    students_cfg = config_data.get("Students", {})
+    app.config['STUDENT_DIRECTORY_REFRESH_SECONDS']     = students_cfg.get("RefreshSeconds", 60)
+    app.config['STUDENT_DIRECTORY_FULL_RELOAD_MINUTES'] = students_cfg.get("FullReloadMinutes", 60)
+
+    # 로그인/글쓰기 요청 한도 (엔드포인트별 IP/학번 토큰 버킷, 기본값은 utils.rate_limit_util.DEFAULT_LIMITS)
+    app.config['RATE_LIMIT'] = config_data.get("RateLimit", {})
+
+
+def init_session(app: Flask, session_cfg: Mapping[str, Any]) -> None:
+    """
+    세션 저장소를 설정함.
+    `sqlite`/`memory`/`redis`는 `utils.session_util`의 저장소를, `cookie`는 Flask 기본 서명 쿠키를,
+    그 밖의 값(`filesystem` 등)은 flask_session을 사용함.
+    """
+    from utils.session_util import StoreSessionInterface, build_session_store
+
+    session_type = str(session_cfg["Type"])
+    if session_type.lower() == "cookie":
+        return
+    store = build_session_store(app, session_type, session_cfg)
+    if store is None:
+        Session(app)
+        return
+    app.session_interface = StoreSessionInterface(store, sweep_interval=session_cfg.get("SweepInterval", 300))
+
+
+def connect_database(config_data: Mapping[str, Any]) -> None:
+    """
+    DB 연결 풀을 설정함. 실제 연결은 처음 사용할 때 열리고,
+    멀티 워커 서버에서 fork된 워커는 각자 새 풀을 만듦.
+    """
+    from utils.database_util import DatabaseManager
+
+    DatabaseManager().connect(
+        host     = config_data["Database"]["Host"],
+        username = config_data["Database"]["Username"],
+        password = config_data["Database"]["Password"],
+        pool_size     = config_data["Database"].get("PoolSize", 10),
+        pool_timeout  = config_data["Database"].get("PoolTimeout", 10),
+        ping_interval = config_data["Database"].get("PingInterval", 30),
+    )
+
+
+def configure_neis(app: Flask, config_data: Mapping[str, Any]) -> None:
+    from utils.neis_util import NeisClient
+
+    # NEIS API 클라이언트 초기화 (급식/학사일정/시간표 공용)
+    # Mode가 record/replay면 FixtureDir에 응답을 저장하거나 저장된 응답으로 대신함 (부하 테스트용)
+    neis_cfg = dict(config_data["NICEAPI"])
+    neis_cfg["FixtureDir"] = str(_resolve_path(app, neis_cfg.get("FixtureDir", "fixtures/neis")))
+    NeisClient().configure(neis_cfg)
+
+
+def configure_student_directory(config: Mapping[str, Any]) -> None:
+    from utils.student_directory_util import StudentDirectory
+
+    StudentDirectory().configure(
+        refresh_seconds     = config.get('STUDENT_DIRECTORY_REFRESH_SECONDS'),
+        full_reload_seconds = config.get('STUDENT_DIRECTORY_FULL_RELOAD_MINUTES') * 60,
+    )
+
+
+def configure_rate_limits(config: Mapping[str, Any]) -> None:
+    from utils.rate_limit_util import RateLimiter
+
+    RateLimiter().configure(config.get('RATE_LIMIT', {}))
+
+
+def init_services(app: Flask, config_data: Mapping[str, Any]) -> None:
+    from utils.database_util import DatabaseManager
+    from utils.student_directory_util import StudentDirectory
+
+    connect_database(config_data)
+    configure_neis(app, config_data)
+    register_config_listener(app, configure_student_directory)
+    register_config_listener(app, configure_rate_limits)
+
+    @app.before_request
+    def warm_student_directory():
+        # 워커마다 첫 요청 때 백그라운드에서 학생 명부를 읽고, 이후 주기마다 바뀐 학생만 다시 읽음
+        StudentDirectory().warm()
+
+    # 요청이 끝나면 빌린 DB 연결을 풀에 반납
+    @app.teardown_appcontext
+    def release_db_connection(error):
+        DatabaseManager().release(error)
+
+
+def apply_config_change(app: Flask, new: Mapping[str, Any], old: Optional[Mapping[str, Any]]) -> None:
+    """
+    다시 읽은 설정을 재시작 없이 반영함. 캐시와 연결은 유지하고 크기/주기만 바꿈.
+    DB 접속 정보나 NEIS 설정이 바뀐 경우에만 연결 풀/세션을 새로 만듦.
+    (세션 저장 방식 `Session.Type`은 재시작해야 반영됨)
+    """
+    from utils.database_util import DatabaseManager
+
+    load_config(app, new)
+
+    db_new, db_old = new["Database"], (old or {}).get("Database", {})
+    if any(db_new.get(key) != db_old.get(key) for key in ("Host", "Username", "Password")):
+        connect_database(new)
+    else:
+        DatabaseManager().resize(
+            pool_size     = db_new.get("PoolSize", 10),
+            pool_timeout  = db_new.get("PoolTimeout", 10),
+            ping_interval = db_new.get("PingInterval", 30),
+        )
+    if old is None or new["NICEAPI"] != old.get("NICEAPI"):
+        configure_neis(app, new)
+
+    notify_config_listeners(app)
+    app.logger.info("설정 다시 읽음 (version %s)", Config().version)
+
+
+def register_blueprints(app: Flask) -> None:
+    # 라우트 모듈은 앱을 만들 때 불러옴 (`import app`만으로는 DB/NEIS 관련 모듈을 불러오지 않음)
+    from routes.auth      import auth_bp
+    from routes.main_page import mainpage_bp
+    from routes.meal      import meal_bp
+    from routes.schedule  import schedule_bp
+    from routes.timetable import timetable_bp
+    from routes.post      import post_bp
+
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(mainpage_bp)
+    app.register_blueprint(meal_bp)
+    app.register_blueprint(schedule_bp)
+    app.register_blueprint(timetable_bp)
+    app.register_blueprint(post_bp)
+
+
+def create_app(config_path: str = "config.json") -> Flask:
+    """
+    Flask 앱을 만듦. 설정 파일은 여기서 읽고, 이후에는 파일이 바뀌었을 때만 다시 읽음.
+    멀티 워커 서버에서는 `gunicorn "app:create_app()"`처럼 사용.
+    :param config_path: 설정 파일 경로
+    :return: 설정과 블루프린트가 등록된 앱
+    """
+    started = time.perf_counter()
+    app = Flask(__name__)
+
+    # 프론트엔드와 세션 유지 가능하게 설정 (프론트엔드에서 꼭 withCredentials: true 확인!)
+    CORS(app, supports_credentials=True)
+    Config().read_file(config_path)
+    config_data = Config().get()
+
+    load_config(app, config_data)
+    # 리버스 프록시 뒤라면 X-Forwarded-For에서 프록시 수(TrustedHops)만큼만 믿어 클라이언트 IP를 구함
+    # (요청 한도가 `request.remote_addr`로 IP를 구분함). 0이면 헤더를 무시하며, 바꾸면 재시작해야 반영됨
+    trusted_hops = int(config_data.get("Proxy", {}).get("TrustedHops", 0))
+    if trusted_hops > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_hops, x_proto=trusted_hops)
+    init_session(app, config_data["Session"])
+    init_services(app, config_data)
+    register_blueprints(app)
+
+    # 설정 파일이 바뀌면 재시작 없이 반영 (Reload.WatchInterval초마다 확인, 0이면 끔)
+    reload_cfg = config_data.get("Reload", {})
+    watch_interval = float(reload_cfg.get("WatchInterval", 2))
+    Config().subscribe(lambda new, old: apply_config_change(app, new, old))
+    if reload_cfg.get("Signal"):
+        Config().install_signal_handler(reload_cfg["Signal"])
+
+    @app.before_request
+    def start_config_watcher():
+        # 워커 프로세스마다 첫 요청 때 시작함 (fork 전에 만든 스레드는 자식 프로세스로 넘어가지 않음)
+        if watch_interval > 0 and not Config().watching:
+            Config().start_watching(watch_interval)
+
+    @app.route("/")
+    def home():
+        return redirect(url_for('main.main_page'))
+
+    app.config['STARTUP_SECONDS'] = time.perf_counter() - started
+    return app
+
+
+_app = None
+
+
+def __getattr__(name: str):
+    # 예전처럼 `app:app`으로 불러와도 동작하도록, 처음 접근할 때 앱을 만듦
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
     try:
-        app.run(debug=False)
+        create_app().run(debug=False)
     except Exception as e:
         print(e)
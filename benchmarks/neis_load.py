@@ -0,0 +1,84 @@
+"""
+급식/학사일정/시간표 API 부하 테스트 스크립트.
+
+실행 중인 서버에 여러 스레드로 요청을 보내 경로별 p50/p95/max 지연 시간과
+상태 코드, 오래된 데이터(`X-Data-Stale`) 응답 수를 출력함.
+실제 NEIS 대신 `neis_stub.py`나 `NICEAPI.Mode = "replay"`로 띄운 서버에 실행할 것.
+
+사용법:
+    python benchmarks/neis_load.py --url http://127.0.0.1:5000 --concurrency 50 --requests 2000
+"""
+import argparse
+import statistics
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+DEFAULT_PATHS = ["/meal_lunch", "/meal_dinner", "/schedule"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="급식/학사일정/시간표 API 부하 테스트")
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--path", action="append", dest="paths", help="요청할 경로 (여러 번 지정 가능)")
+    parser.add_argument("--timetable", default="", help="시간표도 요청하려면 '학년,반' (예: 2,3)")
+    parser.add_argument("--date", default="", help="급식/시간표 날짜 YYYYMMDD (기본: 오늘)")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=500, help="경로마다 보낼 요청 수")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args()
+
+    jobs = []
+    for path in args.paths or DEFAULT_PATHS:
+        if args.date and path.startswith("/meal"):
+            path = f"{path}?date={args.date}"
+        jobs.extend(("GET", path, None) for _ in range(args.requests))
+    if args.timetable:
+        grade, class_nm = args.timetable.split(",")
+        body = {"grade": grade, "class": class_nm}
+        if args.date:
+            body["date"] = args.date
+        jobs.extend(("POST", "/timetable", body) for _ in range(args.requests))
+
+    local = threading.local()
+    samples = defaultdict(list)
+    statuses = defaultdict(Counter)
+    lock = threading.Lock()
+
+    def send(job):
+        method, path, body = job
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        started = time.perf_counter()
+        try:
+            response = session.request(method, args.url + path, json=body, timeout=args.timeout)
+            status = str(response.status_code)
+            if response.headers.get("X-Data-Stale"):
+                status += " stale"
+        except requests.RequestException as e:
+            status = type(e).__name__
+        elapsed = (time.perf_counter() - started) * 1000
+        key = path.split("?")[0]
+        with lock:
+            samples[key].append(elapsed)
+            statuses[key][status] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(send, jobs))
+    total = time.perf_counter() - started
+
+    print(f"요청 {len(jobs)}개, {total:.2f}초, {len(jobs) / total:.1f} req/s")
+    for key in sorted(samples):
+        values = sorted(samples[key])
+        p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+        print(f"{key:>14}: p50 {statistics.median(values):8.2f}ms  p95 {p95:8.2f}ms  "
+              f"max {values[-1]:8.2f}ms  {dict(statuses[key])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+NEIS Open API 대신 쓰는 로컬 스텁 서버.
+
+`NICEAPI.Mode = "record"`로 저장해 둔 픽스처(`fixtures/neis`)를 그대로 돌려주며,
+지연 시간과 오류를 일부러 넣어 캐시/타임아웃/서킷 브레이커 동작을 실제 NEIS 없이 시험할 수 있음.
+난수 시드를 고정하므로 같은 옵션이면 같은 순서로 오류가 발생함.
+
+사용법:
+    python benchmarks/neis_stub.py --port 8090 --latency-ms 150 --jitter-ms 50 --error-rate 0.1
+
+그리고 config.json의 NICEAPI 항목을 스텁 주소로 바꿈:
+    "MEAL":      "http://127.0.0.1:8090/hub/mealServiceDietInfo",
+    "SCHEDULE":  "http://127.0.0.1:8090/hub/SchoolSchedule",
+    "TIMETABLE": "http://127.0.0.1:8090/hub/hisTimetable"
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.neis_fixture_util import FixtureStore  # noqa: E402
+
+# NEIS 경로 마지막 부분 -> NeisClient 엔드포인트 이름
+ENDPOINTS = {
+    "mealServiceDietInfo": "MEAL",
+    "SchoolSchedule":      "SCHEDULE",
+    "hisTimetable":        "TIMETABLE",
+}
+NO_DATA = {"RESULT": {"CODE": "INFO-200", "MESSAGE": "해당하는 데이터가 없습니다."}}
+
+
+class StubState:
+    def __init__(self, args):
+        self.fixtures = FixtureStore(args.fixtures)
+        self.latency_ms = args.latency_ms
+        self.jitter_ms = args.jitter_ms
+        self.error_rate = args.error_rate
+        self.error_status = args.error_status
+        self.hang_rate = args.hang_rate
+        self.hang_seconds = args.hang_seconds
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "hits": 0, "misses": 0, "errors": 0, "hangs": 0}
+
+    def draw(self):
+        """
+        요청 하나에 대해 (지연 시간(초), 오류 여부, 응답 지연 여부)를 정함.
+        """
+        with self.lock:
+            self.counts["requests"] += 1
+            delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            roll = self.rng.random()
+        fail = roll < self.error_rate
+        hang = not fail and roll < self.error_rate + self.hang_rate
+        return delay, fail, hang
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.counts[name] += 1
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path == "/_stats":
+                with state.lock:
+                    self._send(200, dict(state.counts))
+                return
+
+            name = parsed.path.rstrip("/").rsplit("/", 1)[-1]
+            endpoint = ENDPOINTS.get(name, name.upper())
+            params = dict(parse_qsl(parsed.query))
+
+            delay, fail, hang = state.draw()
+            if hang:
+                state.count("hangs")
+                time.sleep(state.hang_seconds)
+            else:
+                time.sleep(delay)
+            if fail:
+                state.count("errors")
+                self._send(state.error_status, {"RESULT": {"CODE": "ERROR-500", "MESSAGE": "stub error"}})
+                return
+
+            data = state.fixtures.load(endpoint, params)
+            state.count("hits" if data is not None else "misses")
+            self._send(200, data if data is not None else NO_DATA)
+
+        def _send(self, status, body):
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            except (BrokenPipeError, ConnectionResetError):
+                # 클라이언트가 타임아웃으로 먼저 끊은 경우
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NEIS API 로컬 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--fixtures", default=str(Path(__file__).resolve().parent.parent / "fixtures" / "neis"),
+                        help="픽스처 디렉터리 (NICEAPI.FixtureDir)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="응답마다 넣을 기본 지연 시간")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="지연 시간의 ± 변동 폭")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    parser.add_argument("--error-status", type=int, default=503, help="오류 응답의 HTTP 상태 코드")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="응답을 오래 붙잡는 요청 비율 (0~1)")
+    parser.add_argument("--hang-seconds", type=float, default=30.0, help="붙잡는 시간(초)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(StubState(args)))
+    server.daemon_threads = True
+    print(f"NEIS 스텁 서버: http://{args.host}:{args.port} (픽스처: {args.fixtures}, 통계: /_stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+게시물 검색(`GET /api/posts/search/`) 쿼리 지연 시간 측정 스크립트.
+
+별도의 벤치마크용 DB에 게시물 N개(기본 10만 개)를 채운 뒤, 검색 쿼리를 여러 번 실행해
+p50/p95/max 지연 시간을 출력함. 운영 DB에는 절대 실행하지 말 것.
+첫 페이지뿐 아니라 커서(`with_cursor=True`)로 넘긴 뒤 페이지(`--pages`)도 따로 잼.
+검색 쿼리는 페이지마다 일치하는 게시물 전체를 다시 찾아 합산한 뒤 HAVING으로 거르므로,
+자주 나오는 검색어일수록 뒤 페이지도 첫 페이지만큼 느림.
+
+사용법:
+    python benchmarks/search_bench.py --host 127.0.0.1 --user root --password pw \
+        --database eta_bench --seed 100000 --record benchmarks/results/search.md
+
+`--record`를 주면 측정 결과를 마크다운 표로 파일 끝에 덧붙임 (서버 버전, 데이터 크기, 측정 시각 포함).
+ngram 파서가 필요하므로 MySQL 5.7.6 이상에서만 동작함 (MariaDB는 지원하지 않음).
+"""
+import argparse
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pymysql
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from routes.post.search_routes import (  # noqa: E402
+    COMMENT_MATCH_WEIGHT,
+    POST_MATCH_WEIGHT,
+    build_search_sql,
+)
+
+WORDS = [
+    "급식", "시험", "수행평가", "동아리", "체육대회", "축제", "기숙사", "도서관", "수학", "영어",
+    "국어", "과학", "물리", "화학", "생명", "지구과학", "한국사", "야자", "방과후", "학생회",
+    "선생님", "교복", "매점", "운동장", "봉사활동", "진로", "대학", "모의고사", "중간고사", "기말고사",
+    "오늘", "내일", "너무", "진짜", "맛있다", "어렵다", "재밌다", "피곤하다", "궁금하다", "추천",
+]
+QUERIES = ["급식", "수행평가", "체육대회", "모의고사", "기숙사 매점", "지구과학 시험", "동아리 추천"]
+
+def random_text(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def create_schema(cursor) -> None:
+    cursor.execute("DROP TABLE IF EXISTS Comments")
+    cursor.execute("DROP TABLE IF EXISTS Posts")
+    cursor.execute(
+        """
+        CREATE TABLE Posts (
+            post_id INT AUTO_INCREMENT PRIMARY KEY,
+            student_id INT NOT NULL,
+            title VARCHAR(200) NOT NULL,
+            content TEXT NOT NULL,
+            FULLTEXT INDEX ft_posts_title_content (title, content) WITH PARSER ngram
+        ) DEFAULT CHARSET = utf8mb4
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE Comments (
+            comment_id INT AUTO_INCREMENT PRIMARY KEY,
+            post_id INT NOT NULL,
+            content TEXT NOT NULL,
+            INDEX idx_comments_post (post_id),
+            FULLTEXT INDEX ft_comments_content (content) WITH PARSER ngram
+        ) DEFAULT CHARSET = utf8mb4
+        """
+    )
+
+
+def seed(conn, n_posts: int, comments_per_post: int) -> None:
+    rng = random.Random(42)
+    batch = 1000
+    with conn.cursor() as cursor:
+        create_schema(cursor)
+        for start in range(0, n_posts, batch):
+            rows = [
+                (2400000 + rng.randint(0, 999), random_text(rng, 4), random_text(rng, 30))
+                for _ in range(min(batch, n_posts - start))
+            ]
+            cursor.executemany("INSERT INTO Posts (student_id, title, content) VALUES (%s, %s, %s)", rows)
+            first_id = cursor.lastrowid
+            comments = [
+                (first_id + i, random_text(rng, 8))
+                for i in range(len(rows))
+                for _ in range(comments_per_post)
+            ]
+            if comments:
+                cursor.executemany("INSERT INTO Comments (post_id, content) VALUES (%s, %s)", comments)
+            conn.commit()
+            print(f"\r게시물 {start + len(rows)}/{n_posts} 생성", end="", flush=True)
+    print()
+
+
+# (검색어, 일치 게시물 수, 페이지 번호, p50, p95, max) 밀리초
+Sample = Tuple[str, int, int, float, float, float]
+
+
+def count_matches(cursor, q: str) -> int:
+    cursor.execute(
+        """
+        SELECT COUNT(*) FROM (
+            SELECT post_id FROM Posts WHERE MATCH(title, content) AGAINST (%(q)s IN NATURAL LANGUAGE MODE)
+            UNION
+            SELECT post_id FROM Comments WHERE MATCH(content) AGAINST (%(q)s IN NATURAL LANGUAGE MODE)
+        ) m
+        """,
+        {"q": q}
+    )
+    return cursor.fetchone()[0]
+
+
+def page_params(cursor, q: str, size: int, pages: int) -> List[Dict[str, Any]]:
+    """
+    API와 같은 방식으로 커서를 따라가며 페이지마다 쓸 쿼리 인자를 만듦.
+    :return: 페이지 순서대로 인자 (결과가 `pages`보다 적으면 있는 페이지까지만)
+    """
+    base = {"q": q, "post_weight": POST_MATCH_WEIGHT, "comment_weight": COMMENT_MATCH_WEIGHT, "limit": size + 1}
+    params: List[Dict[str, Any]] = []
+    last: Optional[Tuple[int, Any]] = None
+    for _ in range(pages):
+        current = dict(base)
+        if last is not None:
+            current["cursor_id"], current["cursor_score"] = last
+        cursor.execute(build_search_sql(with_cursor=last is not None), current)
+        rows = cursor.fetchall()
+        params.append(current)
+        if len(rows) <= size:
+            break
+        last = rows[size - 1]
+    return params
+
+
+def run(conn, repeat: int, size: int, pages: int) -> Tuple[dict, List[Sample]]:
+    """
+    :return: (서버/데이터 정보, 검색어/페이지별 지연 시간)
+    """
+    results: List[Sample] = []
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT VERSION()")
+        version = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM Posts")
+        total = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM Comments")
+        comments = cursor.fetchone()[0]
+        print(f"MySQL {version}, 게시물 수: {total}, 댓글 수: {comments}")
+        for q in QUERIES:
+            matched = count_matches(cursor, q)
+            for page, params in enumerate(page_params(cursor, q, size, pages), start=1):
+                sql = build_search_sql(with_cursor="cursor_id" in params)
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    cursor.execute(sql, params)
+                    cursor.fetchall()
+                    samples.append((time.perf_counter() - started) * 1000)
+                samples.sort()
+                p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+                p50 = statistics.median(samples)
+                results.append((q, matched, page, p50, p95, samples[-1]))
+                print(f"{q!r:>16} ({matched}건) {page}쪽: p50 {p50:7.2f}ms  "
+                      f"p95 {p95:7.2f}ms  max {samples[-1]:7.2f}ms")
+    info = {"version": version, "posts": total, "comments": comments, "repeat": repeat, "size": size,
+            "pages": pages}
+    return info, results
+
+
+def record(path: Path, info: dict, results: List[Sample]) -> None:
+    """
+    측정 결과를 마크다운 표로 `path` 끝에 덧붙임.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [
+        f"### {datetime.now():%Y-%m-%d %H:%M} — MySQL {info['version']}, "
+        f"게시물 {info['posts']:,} / 댓글 {info['comments']:,} ({platform.node()})",
+        "",
+        f"반복 {info['repeat']}회, size {info['size']}, 최대 {info['pages']}쪽",
+        "",
+        "| 검색어 | 일치 게시물 | 페이지 | p50 (ms) | p95 (ms) | max (ms) |",
+        "|---|---:|---:|---:|---:|---:|",
+        *(f"| {q} | {matched:,} | {page} | {p50:.2f} | {p95:.2f} | {worst:.2f} |"
+          for q, matched, page, p50, p95, worst in results),
+        "",
+    ]
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"결과를 {path}에 기록했습니다.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="게시물 검색 지연 시간 측정")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--user", required=True)
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", required=True, help="벤치마크 전용 DB 이름")
+    parser.add_argument("--seed", type=int, default=0, help="생성할 게시물 수 (0이면 기존 데이터 사용)")
+    parser.add_argument("--comments-per-post", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=3, help="페이지마다 따로 잴 페이지 수 (2쪽부터는 커서 사용)")
+    parser.add_argument("--record", type=Path, help="결과 표를 덧붙일 마크다운 파일")
+    args = parser.parse_args()
+
+    conn = pymysql.connect(host=args.host, user=args.user, passwd=args.password,
+                           db=args.database, charset="utf8mb4")
+    try:
+        if args.seed:
+            seed(conn, args.seed, args.comments_per_post)
+        info, results = run(conn, args.repeat, args.size, args.pages)
+        if args.record:
+            record(args.record, info, results)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+앱 시작 시간 측정 스크립트.
+
+매번 새 파이썬 프로세스를 띄워 다음 구간의 시간을 재고 중앙값/최댓값을 출력함.
+    import   : `import app` (모듈만 불러옴)
+    create   : `create_app()` (설정 읽기, 블루프린트 등록)
+    first    : 첫 요청 (`GET /main`, 워커별 백그라운드 스레드 시작 포함)
+DB나 NEIS에는 연결하지 않음. `config.json`이 있는 디렉터리에서 실행할 것.
+
+사용법:
+    python benchmarks/startup_bench.py --repeat 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, %r)
+t0 = time.perf_counter()
+import app as app_module
+t1 = time.perf_counter()
+app = app_module.create_app(%r)
+t2 = time.perf_counter()
+app.test_client().get("/main")
+t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "create": t2 - t1, "first": t3 - t2}))
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="앱 시작 시간 측정")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--config", default="config.json")
+    args = parser.parse_args()
+
+    samples = {"import": [], "create": [], "first": []}
+    for _ in range(args.repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE % (str(ROOT), args.config)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        for name, value in result.items():
+            samples[name].append(value * 1000)
+
+    for name, values in samples.items():
+        print(f"{name:>7}: p50 {statistics.median(values):8.2f}ms  max {max(values):8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+게시물 이미지 업로드 처리의 최대 메모리/시간 측정 스크립트.
+
+같은 multipart 요청(기본 20MB, 5MB 미만 JPEG 4개 + 제목/내용)을 두 방식으로 처리해 비교함.
+    werkzeug : `request.files`로 본문 전체를 받아둔 뒤 `FileStorage.save()`로 다시 복사 (예전 방식)
+    stream   : `MultipartImageReceiver`로 본문을 읽으면서 임시 파일에 바로 기록 (해시/형식 검사 포함)
+최대 메모리는 tracemalloc으로 잰 파이썬 할당량이며, 요청 본문은 디스크 파일에서 읽음.
+DB나 NEIS에는 연결하지 않음.
+
+사용법:
+    python benchmarks/upload_memory.py --size-mb 20 --files 4 --repeat 3
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from flask import Flask, request
+from werkzeug.datastructures import FileStorage, MultiDict
+from werkzeug.test import encode_multipart
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from utils.upload_util import MultipartImageReceiver, discard_streamed_files, multipart_boundary  # noqa: E402
+
+
+def build_body(path: Path, size_mb: float, files: int) -> str:
+    """
+    JPEG 헤더로 시작하는 임의 데이터 파일들로 multipart 본문을 만들어 `path`에 저장함.
+    :return: multipart boundary
+    """
+    per_file = int(size_mb * 1024 * 1024 / files) - 1024
+    data = MultiDict({"title": "부하 테스트", "content": "이미지 업로드 메모리 측정"})
+    for idx in range(files):
+        payload = b"\xff\xd8\xff\xe0" + os.urandom(per_file - 4)
+        data.add("images", FileStorage(io.BytesIO(payload), filename=f"image{idx}.jpg", content_type="image/jpeg"))
+    boundary, body = encode_multipart(data)
+    path.write_bytes(body)
+    return boundary
+
+
+def run_werkzeug(app: Flask, environ: dict, out_dir: Path) -> None:
+    with app.request_context(environ):
+        for storage in request.files.getlist("images"):
+            storage.save(out_dir / f"{os.urandom(8).hex()}.jpg")
+        request.form.get("title")
+
+
+def run_stream(app: Flask, environ: dict, out_dir: Path) -> None:
+    with app.request_context(environ):
+        receiver = MultipartImageReceiver(out_dir, max_file_bytes=6 * 1024 * 1024, allowed_exts=("jpg",))
+        fields, files = receiver.receive(request.stream, multipart_boundary(request.mimetype_params))
+        fields.get("title")
+        for streamed in files:
+            os.replace(streamed.temp_path, out_dir / f"{streamed.sha256}.{streamed.ext}")
+        discard_streamed_files(files)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="이미지 업로드 최대 메모리 측정")
+    parser.add_argument("--size-mb", type=float, default=20)
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config["MAX_CONTENT_LENGTH"] = None
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        body_path = tmp_dir / "body.bin"
+        boundary = build_body(body_path, args.size_mb, args.files)
+        length = body_path.stat().st_size
+        print(f"요청 본문 {length / 1024 / 1024:.1f}MB, 파일 {args.files}개")
+
+        for name, runner in (("werkzeug", run_werkzeug), ("stream", run_stream)):
+            peaks, times = [], []
+            for _ in range(args.repeat):
+                out_dir = tmp_dir / name
+                out_dir.mkdir(exist_ok=True)
+                with open(body_path, "rb") as body:
+                    environ = {
+                        "REQUEST_METHOD": "POST",
+                        "PATH_INFO": "/api/posts/",
+                        "SERVER_NAME": "localhost",
+                        "SERVER_PORT": "80",
+                        "wsgi.url_scheme": "http",
+                        "wsgi.input": body,
+                        "CONTENT_TYPE": f"multipart/form-data; boundary={boundary}",
+                        "CONTENT_LENGTH": str(length),
+                    }
+                    tracemalloc.start()
+                    started = time.perf_counter()
+                    runner(app, environ, out_dir)
+                    times.append((time.perf_counter() - started) * 1000)
+                    peaks.append(tracemalloc.get_traced_memory()[1] / 1024 / 1024)
+                    tracemalloc.stop()
+                for path in out_dir.iterdir():
+                    path.unlink()
+            print(f"{name:>9}: 최대 메모리 {max(peaks):7.2f}MB  시간 p50 {statistics.median(times):8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
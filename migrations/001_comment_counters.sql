@@ -0,0 +1,19 @@
+-- 게시물 목록에서 댓글 수를 서브쿼리로 세지 않도록 집계 컬럼을 추가
+ALTER TABLE Posts
+    ADD COLUMN comment_count INT UNSIGNED NOT NULL DEFAULT 0;
+
+ALTER TABLE Comments
+    ADD COLUMN reply_count INT UNSIGNED NOT NULL DEFAULT 0;
+
+-- 기존 데이터 채우기 (이후에는 `flask post recount-counters`로 재계산 가능)
+UPDATE Posts p
+LEFT JOIN (
+    SELECT post_id, COUNT(*) AS cnt FROM Comments GROUP BY post_id
+) c ON c.post_id = p.post_id
+SET p.comment_count = COALESCE(c.cnt, 0);
+
+UPDATE Comments cm
+LEFT JOIN (
+    SELECT comment_id, COUNT(*) AS cnt FROM Sub_comments GROUP BY comment_id
+) sc ON sc.comment_id = cm.comment_id
+SET cm.reply_count = COALESCE(sc.cnt, 0);
@@ -0,0 +1,16 @@
+-- 좋아요 토글을 INSERT IGNORE / DELETE 한 번으로 처리하기 위한 유니크 키
+-- 적용 전 중복 행이 없는지 확인 (결과가 있으면 먼저 정리해야 함)
+SELECT post_id, student_id, COUNT(*) AS cnt
+FROM PostLikes
+GROUP BY post_id, student_id
+HAVING cnt > 1;
+
+ALTER TABLE PostLikes
+    ADD UNIQUE KEY uq_post_likes_post_student (post_id, student_id);
+
+-- like_count를 실제 좋아요 행 수로 맞춤 (`flask post recount-counters`와 같음)
+UPDATE Posts p
+LEFT JOIN (
+    SELECT post_id, COUNT(*) AS cnt FROM PostLikes GROUP BY post_id
+) l ON l.post_id = p.post_id
+SET p.like_count = COALESCE(l.cnt, 0);
@@ -0,0 +1,8 @@
+-- 게시물/댓글 검색용 FULLTEXT 인덱스 (한국어 띄어쓰기와 무관하게 찾도록 ngram 파서 사용)
+-- ngram_token_size는 MySQL 기본값(2)을 가정함
+-- InnoDB가 INSERT/UPDATE 커밋 시 인덱스를 자동으로 갱신하므로 별도 색인 작업은 필요 없음
+ALTER TABLE Posts
+    ADD FULLTEXT INDEX ft_posts_title_content (title, content) WITH PARSER ngram;
+
+ALTER TABLE Comments
+    ADD FULLTEXT INDEX ft_comments_content (content) WITH PARSER ngram;
@@ -0,0 +1,5 @@
+-- 학생 명부(StudentDirectory)가 바뀐 학생만 다시 읽을 수 있도록 수정 시각 컬럼을 추가
+-- 컬럼이 없어도 동작하지만, 그 경우 갱신할 때마다 Students 전체를 읽음
+ALTER TABLE Students
+    ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    ADD INDEX idx_students_updated_at (updated_at);
@@ -0,0 +1,18 @@
+-- 게시물 이미지 변환본(목록용 썸네일, 상세용 크기, WebP)과 원본 크기 기록
+-- rendition_status: 0 변환 대기, 1 완료, 2 실패 (대기/실패 건은 `flask post render-images [--retry-failed]`로 처리)
+ALTER TABLE PostImages
+    ADD COLUMN width INT UNSIGNED NULL,
+    ADD COLUMN height INT UNSIGNED NULL,
+    ADD COLUMN rendition_status TINYINT NOT NULL DEFAULT 0,
+    ADD INDEX idx_post_images_rendition_status (rendition_status);
+
+CREATE TABLE PostImageRenditions (
+    image_id     INT          NOT NULL,
+    variant      VARCHAR(16)  NOT NULL,  -- thumb, thumb_webp, detail, detail_webp
+    stored_name  VARCHAR(255) NOT NULL,
+    content_type VARCHAR(64)  NOT NULL,
+    width        INT UNSIGNED NOT NULL,
+    height       INT UNSIGNED NOT NULL,
+    file_size    INT UNSIGNED NOT NULL,
+    PRIMARY KEY (image_id, variant)
+);
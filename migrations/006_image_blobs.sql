@@ -0,0 +1,15 @@
+-- 게시물 이미지를 내용(SHA-256) 기준으로 한 번만 저장하고 참조 수를 셈
+-- 파일 이름은 `<해시>.<확장자>`이며 PostImages.stored_name이 이 행을 가리킴
+-- 이전에 올린(uuid 이름) 이미지는 이 표에 없고, 각각 PostImages 한 행만 가리키는 것으로 취급함
+CREATE TABLE ImageBlobs (
+    stored_name  VARCHAR(255) NOT NULL PRIMARY KEY,
+    content_hash CHAR(64)     NOT NULL,
+    file_size    INT UNSIGNED NOT NULL,
+    ref_count    INT UNSIGNED NOT NULL DEFAULT 0,
+    created_at   TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_image_blobs_content_hash (content_hash)
+);
+
+-- 같은 파일을 쓰는 이미지(변환본 재사용, 참조 확인)를 찾기 위한 인덱스
+ALTER TABLE PostImages
+    ADD INDEX idx_post_images_stored_name (stored_name);
@@ -1,7 +1,10 @@
 import json
 
-from flask import Blueprint, request, session, jsonify
+from flask import Blueprint, current_app, request, session, jsonify
 from utils.database_util import DatabaseManager
+from utils.rate_limit_util import RateLimiter, too_many_requests
+from utils.session_util import CLAIMS_KEY, issue_claims, regenerate_session
+from utils.student_directory_util import StudentDirectory
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -45,6 +48,13 @@ def login():
             "message": "ID와 비밀번호를 모두 입력해주세요.",
             "status": "error"
         }), 400
+
+    # 비밀번호 확인(SHA2 쿼리) 전에 IP/학번별 시도 횟수를 제한
+    retry_after = RateLimiter().hit('login', ip=request.remote_addr, student=input_student_id,
+                                    authenticated=False)
+    if retry_after > 0:
+        return too_many_requests(retry_after)
+
     db = DatabaseManager()
 
     # 학생 로그인 처리
@@ -62,6 +72,10 @@ def login():
     if student:
         student = student[0]
         student_id, student_name, is_admin = student
+        # 로그인할 때마다 새 세션 ID로 시작하고, 요청마다 DB를 확인하지 않도록 서명된 로그인 정보를 넣어 둠
+        regenerate_session(current_app, session)
+        session[CLAIMS_KEY] = issue_claims(current_app, student_id, student_name, is_admin)
+        StudentDirectory().put(student_id, student_name, is_admin)
         if is_admin:
             session['session_admin_id'] = student[0]
             session['session_admin_name'] = student[1]
@@ -1,7 +1,23 @@
-from flask import Blueprint, jsonify
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime
+
+from flask import Blueprint, current_app, jsonify, session
+
+from routes.meal import fetch_meal_with_state
+from routes.post.image_renditions import rendition_queue
+from routes.schedule import fetch_schedule_with_state, schedule_cache
+from routes.timetable import get_day_timetable_with_state
+from utils.neis_util import NeisClient
+from utils.rate_limit_util import RateLimiter
+from utils.student_directory_util import StudentDirectory
+from utils.student_util import get_class, get_grade
 
 mainpage_bp = Blueprint('main', __name__)
 
+# 오늘 화면의 각 항목(급식, 시간표, 학사일정)을 동시에 불러올 때 쓰는 스레드 풀
+today_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="main-today")
+
 @mainpage_bp.route("/main")
 def main_page():
     return jsonify({
@@ -15,4 +31,69 @@ def main_page():
         "sections": [
             {"name": "게시물", "route": "/posts"}
         ]
-    }), 200
\ No newline at end of file
+    }), 200
+
+
+@mainpage_bp.route("/main/today")
+def main_today():
+    now = datetime.now()
+    today = now.strftime('%Y%m%d')
+    default_timeout = current_app.config.get('MAIN_TODAY_TIMEOUT', 3)
+    section_timeouts = current_app.config.get('MAIN_TODAY_SECTION_TIMEOUTS') or {}
+
+    tasks = {
+        "lunch": (fetch_meal_with_state, ("중식", today)),
+        "dinner": (fetch_meal_with_state, ("석식", today)),
+        "schedule": (fetch_schedule_with_state, (now.strftime('%Y'), now.strftime('%m'))),
+    }
+
+    sections = {}
+    student_id = session.get('session_student_id') or session.get('session_admin_id')
+    try:
+        grade, class_nm = str(get_grade(student_id)), str(get_class(student_id))
+        tasks["timetable"] = (get_day_timetable_with_state, (today, grade, class_nm))
+    except (TypeError, ValueError, IndexError):
+        sections["timetable"] = {"status": "error", "data": None, "message": "로그인이 필요합니다."}
+
+    started = time.perf_counter()
+    futures = {name: today_executor.submit(func, *args) for name, (func, args) in tasks.items()}
+
+    # 항목마다 시작 시각 기준으로 자기 제한 시간까지만 기다림 (느린 항목이 다른 항목의 시간을 쓰지 않음)
+    # 제한 시간을 넘긴 항목은 빼고 먼저 응답함
+    for name, future in futures.items():
+        deadline = started + float(section_timeouts.get(name, default_timeout))
+        try:
+            data, stale = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+            sections[name] = {"status": "success", "data": data, "stale": stale}
+        except FutureTimeoutError:
+            future.cancel()
+            sections[name] = {"status": "timeout", "data": None, "message": "응답 시간이 초과되었습니다."}
+        except Exception as e:
+            sections[name] = {"status": "error", "data": None, "message": str(e)}
+
+    return jsonify({
+        "message": "오늘 정보 불러오기 성공",
+        "date": today,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "sections": sections
+    }), 200
+
+
+@mainpage_bp.route("/main/status")
+def main_status():
+    # NEIS 엔드포인트별 지연 시간/오류율과 서킷 브레이커 상태 (모니터링용)
+    # 내부 상태가 드러나므로 관리자 세션이나 `Main.PublicStatus` 설정이 있을 때만 보여줌
+    if not (session.get('session_admin_id') or current_app.config.get('MAIN_PUBLIC_STATUS')):
+        return jsonify({
+            "status": "error",
+            "message": "관리자만 볼 수 있습니다."
+        }), 403
+    return jsonify({
+        "neis": NeisClient().stats(),
+        "rate_limits": RateLimiter().stats(),
+        "image_renditions": rendition_queue.stats(),
+        "caches": {
+            "schedule": schedule_cache.stats(),
+            "students": StudentDirectory().stats()
+        }
+    }), 200
@@ -1,54 +1,46 @@
 from flask import Blueprint, jsonify, request
-import requests
 from datetime import datetime
-from utils.config_util     import ConfigManager as Config
+from utils.config_util import register_config_listener
+from utils.meal_cache_util import MealStore
+from utils.neis_util import STALE_HEADERS
 
 meal_bp  = Blueprint('meal', __name__)
-Config().read_file("config.json")
+meal_store = MealStore()
 
-API_KEY = Config().get()["NICEAPI"]["KEY"]
-BASE_URL = Config().get()["NICEAPI"]["MEAL"]
+
+@meal_bp.record_once
+def register_meal_config(state) -> None:
+    register_config_listener(state.app, configure_meal_store)
+
+
+def configure_meal_store(config) -> None:
+    meal_store.configure(
+        path=config.get('MEAL_CACHE_PATH'),
+        refresh_hours=config.get('MEAL_REFRESH_HOURS'),
+        empty_retry_minutes=config.get('MEAL_EMPTY_RETRY_MINUTES'),
+        refresh_past_months=config.get('MEAL_REFRESH_PAST_MONTHS'),
+    )
 
 
 def fetch_meal(meal_type, date):
-    params = {
-        'KEY': API_KEY,
-        'Type': 'json',
-        'ATPT_OFCDC_SC_CODE': Config().get()["NICEAPI"]["SCHULSC"],
-        'SD_SCHUL_CODE': Config().get()["NICEAPI"]["SCHULC"],
-        'MLSV_YMD': date
-    }
-    response = requests.get(BASE_URL, params=params)
-    if response.status_code == 200:
-        data = response.json()
-        try:
-            meals = data['mealServiceDietInfo'][1]['row']
-            filtered = [
-                {
-                    '학교명': meal['SCHUL_NM'],
-                    '급식일자': meal['MLSV_YMD'],
-                    '메뉴': meal['DDISH_NM'].replace('<br/>', '\n'),
-                    '칼로리': meal['CAL_INFO'],
-                    '영양정보': meal['NTR_INFO']
-                }
-                for meal in meals if meal['MMEAL_SC_NM'] == meal_type
-            ]
-            return filtered
-        except KeyError:
-            return []
-    else:
-        return []
+    # 한 달치를 한 번에 받아 저장해 둔 급식표에서 찾음 (중식/석식 모두 같은 캐시 사용)
+    return meal_store.get_meals(date, meal_type)
+
+
+def fetch_meal_with_state(meal_type, date):
+    # (급식 리스트, 갱신하지 못한 오래된 데이터인지 여부)
+    return meal_store.get_meals_with_state(date, meal_type)
 
 @meal_bp.route("/meal_lunch")
 def meal_lunch():
     today = datetime.now().strftime('%Y%m%d')  # 오늘 날짜
     date = request.args.get('date', today)
-    result = fetch_meal("중식", date)
-    return jsonify(result)
+    result, stale = fetch_meal_with_state("중식", date)
+    return jsonify(result), 200, STALE_HEADERS if stale else {}
 
 @meal_bp.route("/meal_dinner")
 def meal_dinner():
     today = datetime.now().strftime('%Y%m%d')  # 오늘 날짜
     date = request.args.get('date', today)
-    result = fetch_meal("석식", date)
-    return jsonify(result)
+    result, stale = fetch_meal_with_state("석식", date)
+    return jsonify(result), 200, STALE_HEADERS if stale else {}
@@ -4,6 +4,12 @@ post_bp = Blueprint('post', __name__)
 
 # Import route modules to register endpoints with the blueprint
 from . import comment_routes  # noqa: E402,F401
+from . import counter_service  # noqa: E402,F401
+from . import feed_cache  # noqa: E402,F401
+from . import image_renditions  # noqa: E402,F401
 from . import image_routes  # noqa: E402,F401
+from . import image_storage  # noqa: E402,F401
+from . import like_service  # noqa: E402,F401
 from . import post_routes  # noqa: E402,F401
+from . import search_routes  # noqa: E402,F401
 from . import sub_comment_routes  # noqa: E402,F401
@@ -1,13 +1,17 @@
 from flask import jsonify
 
 from utils.database_util import DatabaseManager
+from utils.rate_limit_util import rate_limited
 
 from . import post_bp
+from .feed_cache import on_post_changed
 from .utils import parse_request_payload, require_login, to_bool
 
 
 @post_bp.route('/api/posts/<int:post_id>/comments/', methods=['POST'])
+@rate_limited('create_comment')
 def create_comment(post_id: int):
+    db = None
     try:
         sid, err = require_login()
         if err:
@@ -25,11 +29,13 @@ def create_comment(post_id: int):
 
         db = DatabaseManager()
 
-        exists = db.query(
-            "SELECT 1 FROM Posts WHERE post_id = %(post_id)s",
+        # 게시물 존재 확인과 댓글 수 증가를 한 번에 처리 (같은 트랜잭션)
+        updated = db.query(
+            "UPDATE Posts SET comment_count = comment_count + 1 WHERE post_id = %(post_id)s",
             post_id=post_id
-        ).result
-        if not exists:
+        ).affected_rows
+        if not updated:
+            db.rollback()
             return jsonify({
                 "status": "error",
                 "message": "게시물을 찾을 수 없습니다."
@@ -47,6 +53,7 @@ def create_comment(post_id: int):
         )
         cid_row = db.query("SELECT LAST_INSERT_ID()")
         db.commit()
+        on_post_changed(post_id)
 
         comment_id = None
         if cid_row.result and len(cid_row.result[0]) > 0:
@@ -58,6 +65,11 @@ def create_comment(post_id: int):
             "comment_id": comment_id
         }), 201
     except Exception as e:
+        if db:
+            try:
+                db.rollback()
+            except Exception:
+                pass
         return jsonify({
             "status": "error",
             "message": "서버 오류가 발생했습니다.",
@@ -0,0 +1,87 @@
+from typing import Iterable, Optional
+
+import click
+
+from utils.database_util import DatabaseManager
+
+from . import post_bp
+
+
+def _id_filter(column: str, ids: Optional[Iterable[int]]):
+    if ids is None:
+        return "", {}
+    unique_ids = list(dict.fromkeys(ids))
+    if not unique_ids:
+        return None, {}
+    params = {f"id_{idx}": value for idx, value in enumerate(unique_ids)}
+    placeholders = ", ".join([f"%({key})s" for key in params])
+    return f"WHERE {column} IN ({placeholders})", params
+
+
+def recount_comment_counts(db: DatabaseManager, post_ids: Optional[Iterable[int]] = None) -> int:
+    where, params = _id_filter("p.post_id", post_ids)
+    if where is None:
+        return 0
+    return db.query(
+        f"""
+        UPDATE Posts p
+        LEFT JOIN (
+            SELECT post_id, COUNT(*) AS cnt FROM Comments GROUP BY post_id
+        ) c ON c.post_id = p.post_id
+        SET p.comment_count = COALESCE(c.cnt, 0)
+        {where}
+        """,
+        **params
+    ).affected_rows or 0
+
+
+def recount_reply_counts(db: DatabaseManager, comment_ids: Optional[Iterable[int]] = None) -> int:
+    where, params = _id_filter("cm.comment_id", comment_ids)
+    if where is None:
+        return 0
+    return db.query(
+        f"""
+        UPDATE Comments cm
+        LEFT JOIN (
+            SELECT comment_id, COUNT(*) AS cnt FROM Sub_comments GROUP BY comment_id
+        ) sc ON sc.comment_id = cm.comment_id
+        SET cm.reply_count = COALESCE(sc.cnt, 0)
+        {where}
+        """,
+        **params
+    ).affected_rows or 0
+
+
+def recount_like_counts(db: DatabaseManager, post_ids: Optional[Iterable[int]] = None) -> int:
+    where, params = _id_filter("p.post_id", post_ids)
+    if where is None:
+        return 0
+    return db.query(
+        f"""
+        UPDATE Posts p
+        LEFT JOIN (
+            SELECT post_id, COUNT(*) AS cnt FROM PostLikes GROUP BY post_id
+        ) l ON l.post_id = p.post_id
+        SET p.like_count = COALESCE(l.cnt, 0)
+        {where}
+        """,
+        **params
+    ).affected_rows or 0
+
+
+@post_bp.cli.command('recount-counters')
+def recount_counters_command():
+    """Posts.comment_count / like_count, Comments.reply_count를 실제 행 수로 다시 맞춤."""
+    db = DatabaseManager()
+    try:
+        fixed_posts = recount_comment_counts(db)
+        fixed_comments = recount_reply_counts(db)
+        fixed_likes = recount_like_counts(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.release()
+    click.echo(f"comment_count 수정: {fixed_posts}건, reply_count 수정: {fixed_comments}건, "
+               f"like_count 수정: {fixed_likes}건")
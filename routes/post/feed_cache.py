@@ -0,0 +1,84 @@
+from typing import Any, Dict, Optional, Tuple
+
+from utils.cache_util import LRUCache, VersionRegistry
+from utils.config_util import register_config_listener
+
+from . import post_bp
+
+# 태그 규칙
+# - "list:head": 새 글이 생기면 내용이 바뀌는 목록 (page 모드, after 커서, total 포함 응답)
+# - "post:<id>": 해당 게시물이 들어있는 목록/상세
+LIST_HEAD_TAG = "list:head"
+
+post_list_cache = LRUCache(max_size=256, ttl=30.0)
+post_detail_cache = LRUCache(max_size=512, ttl=30.0)
+
+# ETag/Last-Modified용 버전. 키 규칙: "feed", "post:<id>", "comment:<id>"
+FEED_VERSION_KEY = "feed"
+resource_versions = VersionRegistry(max_age=30.0)
+
+
+@post_bp.record_once
+def register_feed_cache_config(state) -> None:
+    register_config_listener(state.app, configure_feed_cache)
+
+
+def configure_feed_cache(config) -> None:
+    post_list_cache.configure(
+        max_size=config.get('POST_LIST_CACHE_MAX_ENTRIES'),
+        ttl=config.get('POST_LIST_CACHE_TTL'),
+    )
+    post_detail_cache.configure(
+        max_size=config.get('POST_DETAIL_CACHE_MAX_ENTRIES'),
+        ttl=config.get('POST_DETAIL_CACHE_TTL'),
+    )
+    # 다른 워커의 변경이 캐시보다 오래 숨지 않도록 캐시 TTL 중 짧은 쪽을 따름
+    resource_versions.max_age = min(post_list_cache.ttl, post_detail_cache.ttl)
+
+
+def post_tag(post_id: int) -> str:
+    return f"post:{post_id}"
+
+
+def comment_tag(comment_id: int) -> str:
+    return f"comment:{comment_id}"
+
+
+def feed_version() -> Tuple[str, float]:
+    return resource_versions.tag(FEED_VERSION_KEY)
+
+
+def post_version(post_id: int) -> Tuple[str, float]:
+    return resource_versions.tag(post_tag(post_id))
+
+
+def comment_version(comment_id: int) -> Tuple[str, float]:
+    return resource_versions.tag(comment_tag(comment_id))
+
+
+def on_post_created() -> None:
+    post_list_cache.invalidate_tag(LIST_HEAD_TAG)
+    resource_versions.bump(FEED_VERSION_KEY)
+
+
+def on_post_changed(post_id: int) -> None:
+    """좋아요/댓글처럼 목록과 상세 모두에 보이는 값이 바뀐 경우."""
+    post_list_cache.invalidate_tag(post_tag(post_id))
+    post_detail_cache.invalidate_tag(post_tag(post_id))
+    resource_versions.bump(FEED_VERSION_KEY, post_tag(post_id))
+
+
+def on_comment_changed(post_id: int, comment_id: Optional[int] = None) -> None:
+    """대댓글처럼 상세 화면에만 보이는 값이 바뀐 경우."""
+    post_detail_cache.invalidate_tag(post_tag(post_id))
+    keys = [post_tag(post_id)]
+    if comment_id is not None:
+        keys.append(comment_tag(comment_id))
+    resource_versions.bump(*keys)
+
+
+def feed_cache_stats() -> Dict[str, Any]:
+    return {
+        "list": post_list_cache.stats(),
+        "detail": post_detail_cache.stats(),
+    }
@@ -0,0 +1,298 @@
+import io
+import logging
+import queue
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import click
+from flask import current_app
+
+from utils.config_util import register_config_listener
+from utils.database_util import DatabaseManager
+from utils.image_util import pillow_available, render_image
+
+from . import post_bp
+from .feed_cache import on_post_changed
+from .image_storage import image_storage
+
+logger = logging.getLogger(__name__)
+
+# PostImages.rendition_status
+RENDITION_PENDING = 0
+RENDITION_READY = 1
+RENDITION_FAILED = 2
+
+# 변환본 이름 (WebP는 뒤에 "_webp"가 붙음)
+THUMB = "thumb"    # 목록용 썸네일
+DETAIL = "detail"  # 상세 화면용
+
+# (image_id, post_id, stored_name)
+RenditionJob = Tuple[int, int, str]
+
+
+class ImageRenditionQueue:
+    """
+    업로드된 게시물 이미지를 백그라운드 스레드들에서 크기별로 변환하는 작업 큐.
+    변환이 끝나기 전이나 실패한 경우 응답은 원본 URL을 그대로 씀.
+    큐는 메모리에만 있으므로 재시작으로 사라진 작업은 `flask post render-images`로 다시 처리함.
+    """
+    def __init__(self, workers: int = 2):
+        self.workers = max(1, int(workers))
+        self.enabled = True
+        self.thumb_size = 320
+        self.detail_size = 1280
+        self.quality = 82
+        self.webp = True
+        self.max_pixels = 40_000_000
+        self.upload_dir: Optional[Path] = None
+
+        self._queue: "queue.Queue[Optional[RenditionJob]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._warned = False
+
+        self.done = 0
+        self.failed = 0
+
+    def configure(self, config) -> None:
+        self.enabled = bool(config.get('POST_IMAGE_RENDITIONS', True))
+        self.workers = max(1, int(config.get('POST_IMAGE_RENDITION_WORKERS', self.workers)))
+        self.thumb_size = int(config.get('POST_IMAGE_THUMB_SIZE', self.thumb_size))
+        self.detail_size = int(config.get('POST_IMAGE_DETAIL_SIZE', self.detail_size))
+        self.quality = int(config.get('POST_IMAGE_RENDITION_QUALITY', self.quality))
+        self.webp = bool(config.get('POST_IMAGE_WEBP', self.webp))
+        self.max_pixels = int(config.get('POST_IMAGE_MAX_PIXELS', self.max_pixels))
+        self.upload_dir = Path(config['POST_IMAGE_UPLOAD_FOLDER'])
+        if not self.enabled:
+            self.stop()
+        elif self.running:
+            # 늘어난 작업 스레드 수를 바로 반영
+            self.start()
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        """
+        작업 스레드를 `workers`개까지 띄움. Pillow가 없으면 띄우지 않고 원본만 쓰게 함.
+        """
+        if not self.enabled:
+            return
+        if not pillow_available():
+            if not self._warned:
+                self._warned = True
+                logger.warning("Pillow가 없어 이미지 변환을 건너뜁니다 (`pip install Pillow`).")
+            return
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            for idx in range(len(self._threads), self.workers):
+                thread = threading.Thread(target=self._run, name=f"image-rendition-{idx}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self) -> None:
+        with self._lock:
+            for _ in self._threads:
+                self._queue.put(None)
+            self._threads = []
+
+    def submit(self, jobs: Iterable[RenditionJob]) -> int:
+        """
+        :return: 큐에 넣은 작업 수 (작업 스레드가 없으면 0, 작업은 DB에 대기 상태로 남음)
+        """
+        if not self.running:
+            return 0
+        count = 0
+        for job in jobs:
+            self._queue.put(job)
+            count += 1
+        return count
+
+    @property
+    def sizes(self) -> List[Tuple[str, int]]:
+        return [(THUMB, self.thumb_size), (DETAIL, self.detail_size)]
+
+    def process(self, db: DatabaseManager, image_id: int, stored_name: str) -> bool:
+        """
+        이미지 하나를 변환하고 결과를 `PostImageRenditions`/`PostImages`에 기록함.
+        :return: 변환에 성공했으면 `True`
+        """
+        reused = self._reuse_renditions(db, image_id, stored_name)
+        try:
+            if reused is not None:
+                (width, height), renditions = reused
+            else:
+                (width, height), renditions = self._render(stored_name)
+        except Exception as e:
+            logger.warning("이미지 변환 실패 (image_id=%s): %s", image_id, e)
+            db.query(
+                "UPDATE PostImages SET rendition_status = %(status)s WHERE image_id = %(image_id)s",
+                status=RENDITION_FAILED,
+                image_id=image_id
+            )
+            db.commit()
+            return False
+
+        if renditions:
+            db.query_many(
+                """
+                INSERT INTO PostImageRenditions
+                    (image_id, variant, stored_name, content_type, width, height, file_size)
+                VALUES
+                    (%(image_id)s, %(variant)s, %(stored_name)s, %(content_type)s,
+                     %(width)s, %(height)s, %(file_size)s)
+                ON DUPLICATE KEY UPDATE
+                    stored_name = VALUES(stored_name), content_type = VALUES(content_type),
+                    width = VALUES(width), height = VALUES(height), file_size = VALUES(file_size)
+                """,
+                [{"image_id": image_id, "variant": variant, **info} for variant, info in renditions.items()]
+            )
+        db.query(
+            """
+            UPDATE PostImages SET width = %(width)s, height = %(height)s, rendition_status = %(status)s
+            WHERE image_id = %(image_id)s
+            """,
+            width=width,
+            height=height,
+            status=RENDITION_READY,
+            image_id=image_id
+        )
+        db.commit()
+        return True
+
+    def _render(self, stored_name: str):
+        """
+        원본을 저장소에서 읽어 업로드 폴더 안의 작업 폴더에서 변환한 뒤 변환본을 저장소에 올림.
+        """
+        storage = image_storage.backend
+        source = storage.local_path(stored_name)
+        if source is None:
+            source = io.BytesIO(storage.get(stored_name))
+        with tempfile.TemporaryDirectory(prefix=".render-", dir=self.upload_dir) as work:
+            work_dir = Path(work)
+            size, renditions = render_image(
+                source, work_dir, stored_name.rsplit('.', 1)[0], self.sizes, quality=self.quality, webp=self.webp,
+                max_pixels=self.max_pixels
+            )
+            storage.put_many([
+                (info["stored_name"], work_dir / info["stored_name"], info["content_type"])
+                for info in renditions.values()
+            ])
+        return size, renditions
+
+    @staticmethod
+    def _reuse_renditions(db: DatabaseManager, image_id: int, stored_name: str):
+        """
+        같은 파일(같은 내용)을 쓰는 다른 이미지가 이미 변환되어 있으면 그 결과를 그대로 씀.
+        :return: ((가로, 세로), 변환 결과), 없으면 `None`
+        """
+        rows = db.query(
+            """
+            SELECT pi.image_id, pi.width, pi.height,
+                   r.variant, r.stored_name, r.content_type, r.width, r.height, r.file_size
+            FROM PostImages pi
+            JOIN PostImageRenditions r ON r.image_id = pi.image_id
+            WHERE pi.stored_name = %(stored_name)s AND pi.image_id <> %(image_id)s
+              AND pi.rendition_status = %(status)s
+            """,
+            stored_name=stored_name,
+            image_id=image_id,
+            status=RENDITION_READY
+        ).result
+        if not rows:
+            return None
+        source_id, width, height = rows[0][:3]
+        renditions = {
+            variant: {"stored_name": name, "content_type": content_type,
+                      "width": r_width, "height": r_height, "file_size": file_size}
+            for src, _, _, variant, name, content_type, r_width, r_height, file_size in rows
+            if src == source_id
+        }
+        return (width, height), renditions
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "workers": len(self._threads),
+                "queued": self._queue.qsize(),
+                "done": self.done,
+                "failed": self.failed,
+            }
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            image_id, post_id, stored_name = job
+            db = DatabaseManager()
+            try:
+                ok = self.process(db, image_id, stored_name)
+            except Exception:
+                ok = False
+                db.rollback()
+                logger.exception("이미지 변환 결과 저장 실패 (image_id=%s)", image_id)
+            finally:
+                db.release()
+            with self._lock:
+                if ok:
+                    self.done += 1
+                else:
+                    self.failed += 1
+            if ok:
+                # 캐시된 목록/상세가 원본 대신 변환본을 가리키도록 무효화
+                on_post_changed(post_id)
+
+
+rendition_queue = ImageRenditionQueue()
+
+
+@post_bp.record_once
+def register_rendition_config(state) -> None:
+    register_config_listener(state.app, rendition_queue.configure)
+
+
+@post_bp.before_app_request
+def start_rendition_workers() -> None:
+    # 워커 프로세스마다 첫 요청 때 시작함 (fork 전에 만든 스레드는 자식 프로세스로 넘어가지 않음)
+    if rendition_queue.enabled and not rendition_queue.running:
+        rendition_queue.start()
+
+
+def enqueue_post_renditions(db: DatabaseManager, post_id: int) -> int:
+    """
+    게시물의 변환 대기 중인 이미지를 작업 큐에 넣음.
+    :return: 큐에 넣은 작업 수
+    """
+    if not rendition_queue.running:
+        return 0
+    rows = db.query(
+        """
+        SELECT image_id, stored_name FROM PostImages
+        WHERE post_id = %(post_id)s AND rendition_status = %(status)s
+        """,
+        post_id=post_id,
+        status=RENDITION_PENDING
+    ).result
+    return rendition_queue.submit((image_id, post_id, stored_name) for image_id, stored_name in rows)
+
+
+@post_bp.cli.command('render-images')
+@click.option('--retry-failed', is_flag=True, help="변환에 실패했던 이미지도 다시 시도")
+def render_images_command(retry_failed: bool):
+    """
+    변환 대기 중인 게시물 이미지를 지금 프로세스에서 변환함.
+    """
+    statuses = [RENDITION_PENDING, RENDITION_FAILED] if retry_failed else [RENDITION_PENDING]
+    db = DatabaseManager()
+    rows = db.query(
+        "SELECT image_id, post_id, stored_name FROM PostImages WHERE rendition_status IN %(statuses)s",
+        statuses=statuses
+    ).result
+    done = sum(1 for image_id, _, stored_name in rows if rendition_queue.process(db, image_id, stored_name))
+    click.echo(f"변환 완료: {done}건, 실패: {len(rows) - done}건 "
+               f"(업로드 폴더: {current_app.config['POST_IMAGE_UPLOAD_FOLDER']})")
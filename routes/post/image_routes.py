@@ -1,9 +1,55 @@
-from flask import current_app, send_from_directory
+import mimetypes
+import os
+from urllib.parse import quote
+
+from flask import Response, current_app, jsonify, redirect, request, send_file
 
 from . import post_bp
+from .image_storage import image_storage
+
+# 저장 파일명은 내용 해시(또는 업로드 때 만든 uuid)라 같은 이름의 내용이 바뀌지 않으므로 1년 동안 캐시함
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Uploads.ServeMode
+SERVE_FLASK = "flask"                        # 파이썬이 파일을 직접 전송 (Range 지원)
+SERVE_X_ACCEL_REDIRECT = "x-accel-redirect"  # nginx가 내부 경로로 전송
+SERVE_X_SENDFILE = "x-sendfile"              # Apache/lighttpd가 `X-Sendfile` 헤더로 전송
+
+
+def immutable(response: Response, etag: str) -> Response:
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = IMMUTABLE_MAX_AGE
+    response.cache_control.immutable = True
+    return response
 
 
 @post_bp.route('/api/posts/images/<path:filename>', methods=['GET'])
 def get_post_image(filename: str):
-    upload_dir = current_app.config['POST_IMAGE_UPLOAD_FOLDER']
-    return send_from_directory(upload_dir, filename)
+    """
+    파일 존재 여부와 경로만 확인하고, 설정에 따라 전송은 앞단 프록시에 맡김.
+    객체 저장소를 쓰면 버킷 URL로 보냄 (응답의 이미지 URL은 처음부터 버킷을 가리키므로 예전 링크용).
+    """
+    storage = image_storage.backend
+    path = storage.local_path(filename)
+    if path is None:
+        url = storage.url(filename)
+        if url is not None:
+            return redirect(url, code=302)
+    if path is None or not path.is_file():
+        return jsonify({"status": "error", "message": "이미지를 찾을 수 없습니다."}), 404
+
+    etag = os.path.basename(filename)
+    if request.if_none_match.contains(etag):
+        return immutable(Response(status=304), etag)
+
+    mode = current_app.config.get('POST_IMAGE_SERVE_MODE', SERVE_FLASK)
+    if mode == SERVE_X_ACCEL_REDIRECT:
+        response = Response(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        prefix = current_app.config.get('POST_IMAGE_ACCEL_PREFIX', '/protected/posts/')
+        response.headers['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(filename)
+        return immutable(response, etag)
+
+    # x-sendfile 모드는 `USE_X_SENDFILE`이 켜져 있어 send_file이 본문 대신 헤더만 보냄
+    response = send_file(path, etag=etag, conditional=True, max_age=IMMUTABLE_MAX_AGE)
+    return immutable(response, etag)
@@ -1,88 +1,232 @@
-import os
+import time
 from pathlib import Path
-from typing import Dict, Iterable, List
-from uuid import uuid4
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
+import click
 from flask import current_app, request, url_for
-from werkzeug.datastructures import FileStorage
-from werkzeug.utils import secure_filename
+from werkzeug.datastructures import MultiDict
 
 from utils.database_util import DatabaseManager
+from utils.storage_util import remove_stale_temp_files
+from utils.upload_util import (
+    MultipartImageReceiver,
+    StreamedFile,
+    UploadRejected,
+    discard_streamed_files,
+    multipart_boundary,
+)
 
-SavedImage = Dict[str, str]
+from . import post_bp
+from .image_renditions import DETAIL, THUMB
+from .image_storage import image_storage
 
+SavedImage = Dict[str, object]
+
+# gc-images가 참조를 다시 확인하고 지우는 묶음 크기
+GC_BATCH_SIZE = 500
+
+
+def receive_post_upload() -> Tuple[MultiDict, List[StreamedFile]]:
+    """
+    multipart 요청 본문을 직접 읽어 일반 필드와 이미지 파일을 반환함.
+    이미지는 업로드 폴더의 임시 파일에 바로 기록되며, `save_post_images`로 옮기거나
+    `discard_streamed_files`로 지워야 함. `request.form`/`request.files`보다 먼저 호출해야 함.
+    :raise UploadRejected: 크기 제한을 넘었거나 이미지가 아닌 파일인 경우
+    """
+    boundary = multipart_boundary(request.mimetype_params)
+    if boundary is None:
+        raise UploadRejected("multipart 요청에 boundary가 없습니다.")
+    receiver = MultipartImageReceiver(
+        Path(current_app.config['POST_IMAGE_UPLOAD_FOLDER']),
+        max_file_bytes=current_app.config.get('POST_IMAGE_MAX_BYTES'),
+        allowed_exts=current_app.config.get('POST_IMAGE_ALLOWED_EXTENSIONS', ()),
+        max_field_bytes=current_app.config.get('MAX_FORM_MEMORY_SIZE') or 500 * 1024,
+    )
+    fields, files = receiver.receive(request.stream, boundary)
+    # `images` 필드의 파일을 먼저, 나머지 필드의 파일은 그 뒤에 둠
+    files.sort(key=lambda streamed: streamed.field_name != 'images')
+    return fields, files
+
+
+def shard_name(file_name: str) -> str:
+    """
+    한 디렉터리에 파일이 몰리지 않도록 해시 앞 4글자로 하위 디렉터리를 나눔. 예: `ab/cd/abcd....jpg`
+    """
+    return f"{file_name[0:2]}/{file_name[2:4]}/{file_name}"
+
+
+def save_post_images(uploads: Iterable[StreamedFile]) -> List[SavedImage]:
+    """
+    받은 임시 파일을 이미지 저장소에 내용 해시 이름(`<해시 앞 2자>/<다음 2자>/<해시>.<확장자>`)으로 저장함.
+    같은 내용의 파일이 이미 있으면 임시 파일을 버리고 기존 파일을 씀. 여러 장은 저장소에 따라 동시에 올림.
+    파일 이름이 내용으로 정해져 다른 요청이 같은 파일을 쓰고 있을 수 있으므로, 이후 게시물 저장에 실패해도
+    파일은 지우지 않고 `gc-images`에 맡김.
+    확장자와 MIME 타입은 파일 이름이 아니라 실제 내용(매직 바이트)으로 정함.
+    """
+    uploads = list(uploads)
+    names = [shard_name(f"{upload.sha256}.{upload.ext}") for upload in uploads]
+
+    # 한 요청 안에서 같은 이미지를 여러 번 올린 경우 한 번만 저장함
+    first: Dict[str, StreamedFile] = {}
+    for name, upload in zip(names, uploads):
+        first.setdefault(name, upload)
+    try:
+        discard_streamed_files(upload for name, upload in zip(names, uploads) if first[name] is not upload)
+        image_storage.backend.put_many(
+            [(name, upload.temp_path, upload.content_type) for name, upload in first.items()]
+        )
+    except Exception:
+        discard_streamed_files(uploads)
+        raise
+    return [
+        {
+            'original_name': upload.filename,
+            'stored_name': name,
+            'content_type': upload.content_type,
+            'file_size': upload.size,
+            'content_hash': upload.sha256
+        }
+        for name, upload in zip(names, uploads)
+    ]
 
-def cleanup_saved_images(saved_images: Iterable[SavedImage]) -> None:
-    upload_dir = Path(current_app.config['POST_IMAGE_UPLOAD_FOLDER'])
-    for img in saved_images:
-        try:
-            (upload_dir / img['stored_name']).unlink()
-        except (FileNotFoundError, OSError):
-            continue
 
+def register_image_blobs(db: DatabaseManager, saved_images: Iterable[SavedImage]) -> None:
+    """
+    저장한 이미지마다 `ImageBlobs.ref_count`를 1씩 올림 (처음 보는 내용이면 행을 만듦).
+    게시물 INSERT와 같은 트랜잭션에서 호출해야 함.
+    """
+    rows = [
+        {'stored_name': img['stored_name'], 'content_hash': img['content_hash'], 'file_size': img['file_size']}
+        for img in saved_images
+    ]
+    if not rows:
+        return
+    db.query_many(
+        """
+        INSERT INTO ImageBlobs (stored_name, content_hash, file_size, ref_count)
+        VALUES (%(stored_name)s, %(content_hash)s, %(file_size)s, 1)
+        ON DUPLICATE KEY UPDATE ref_count = ref_count + 1
+        """,
+        rows
+    )
+
+
+def referenced_names(db: DatabaseManager, stored_names: Iterable[str]) -> Set[str]:
+    """
+    :return: 원본(`ImageBlobs`, `PostImages`)이나 변환본(`PostImageRenditions`)으로 아직 쓰이는 이름
+    """
+    unique_names = list(dict.fromkeys(stored_names))
+    if not unique_names:
+        return set()
+    params = {f"name_{idx}": name for idx, name in enumerate(unique_names)}
+    placeholders = ", ".join([f"%({key})s" for key in params])
+    rows = db.query(
+        f"""
+        SELECT stored_name FROM ImageBlobs WHERE stored_name IN ({placeholders}) AND ref_count > 0
+        UNION SELECT stored_name FROM PostImages WHERE stored_name IN ({placeholders})
+        UNION SELECT stored_name FROM PostImageRenditions WHERE stored_name IN ({placeholders})
+        """,
+        **params
+    ).result
+    return {row[0] for row in rows}
 
-def collect_image_files() -> List[FileStorage]:
-    if not request.files:
+
+def referenced_blobs(db: DatabaseManager, stored_names: Iterable[str]) -> List[str]:
+    unique_names = list(dict.fromkeys(stored_names))
+    if not unique_names:
         return []
+    params = {f"name_{idx}": name for idx, name in enumerate(unique_names)}
+    placeholders = ", ".join([f"%({key})s" for key in params])
+    rows = db.query(
+        f"SELECT stored_name FROM ImageBlobs WHERE stored_name IN ({placeholders}) AND ref_count > 0",
+        **params
+    ).result
+    return [row[0] for row in rows]
+
 
-    files: List[FileStorage] = []
-    if 'images' in request.files:
-        files.extend(request.files.getlist('images'))
+def detach_post_images(db: DatabaseManager, post_id: int) -> List[str]:
+    """
+    게시물의 이미지 행과 변환본 행을 지우고 참조 수를 내림.
+    파일은 지우지 않으므로, 커밋한 뒤 반환된 이름을 `image_storage.backend.delete`로 지울 것.
+    :return: 더 이상 참조하는 곳이 없어 지워도 되는 파일 이름 (원본과 변환본)
+    """
+    rows = db.query(
+        """
+        SELECT pi.image_id, pi.stored_name, b.stored_name IS NOT NULL
+        FROM PostImages pi
+        LEFT JOIN ImageBlobs b ON b.stored_name = pi.stored_name
+        WHERE pi.post_id = %(post_id)s
+        FOR UPDATE
+        """,
+        post_id=post_id
+    ).result
+    if not rows:
+        return []
 
-    for key in request.files:
-        if key == 'images':
-            continue
-        files.extend(request.files.getlist(key))
+    image_ids = [row[0] for row in rows]
+    renditions = fetch_image_renditions(db, image_ids)
+    params = {f"id_{idx}": image_id for idx, image_id in enumerate(image_ids)}
+    placeholders = ", ".join([f"%({key})s" for key in params])
+    db.query(f"DELETE FROM PostImageRenditions WHERE image_id IN ({placeholders})", **params)
+    db.query(f"DELETE FROM PostImages WHERE image_id IN ({placeholders})", **params)
 
-    return files
+    blob_names = [stored_name for _, stored_name, is_blob in rows if is_blob]
+    if blob_names:
+        # 같은 게시물에 같은 이미지가 두 번 있으면 두 번 내림
+        db.query_many(
+            "UPDATE ImageBlobs SET ref_count = ref_count - 1 WHERE stored_name = %(name)s AND ref_count > 0",
+            [{"name": name} for name in blob_names]
+        )
+    still_used = set(referenced_blobs(db, blob_names))
+    if blob_names:
+        params = {f"name_{idx}": name for idx, name in enumerate(dict.fromkeys(blob_names))}
+        placeholders = ", ".join([f"%({key})s" for key in params])
+        db.query(f"DELETE FROM ImageBlobs WHERE stored_name IN ({placeholders}) AND ref_count = 0", **params)
 
+    # 예전 방식(uuid 이름) 파일은 행 하나만 가리키므로 바로 지움
+    removable: List[str] = []
+    for image_id, stored_name, _ in rows:
+        if stored_name not in still_used:
+            removable.append(stored_name)
+            removable.extend(renditions.get(image_id, {}).values())
+    return list(dict.fromkeys(removable))
 
-def save_post_images(files: Iterable[FileStorage]) -> List[SavedImage]:
-    upload_dir = Path(current_app.config['POST_IMAGE_UPLOAD_FOLDER'])
-    allowed_exts = current_app.config.get('POST_IMAGE_ALLOWED_EXTENSIONS', set())
-    max_bytes = current_app.config.get('POST_IMAGE_MAX_BYTES')
 
-    saved: List[SavedImage] = []
+@post_bp.cli.command('gc-images')
+@click.option('--grace-hours', default=24.0, show_default=True, help="이 시간보다 오래된 파일만 지움")
+def gc_images_command(grace_hours: float):
+    """참조가 없는 게시물 이미지 파일(원본/변환본/업로드 임시 파일)을 지움."""
+    db = DatabaseManager()
     try:
-        for storage in files:
-            if not storage or not storage.filename:
-                continue
-
-            original_name = storage.filename
-            safe_name = secure_filename(original_name)
-            if not safe_name:
-                raise ValueError("유효한 파일 이름이 아닙니다.")
-
-            ext = safe_name.rsplit('.', 1)[1].lower() if '.' in safe_name else ''
-            if allowed_exts and ext not in allowed_exts:
-                raise ValueError(f"지원하지 않는 이미지 형식입니다: {original_name}")
-
-            stream = storage.stream
-            try:
-                stream.seek(0, os.SEEK_END)
-                size = stream.tell()
-                stream.seek(0)
-            except Exception as exc:  # pragma: no cover - defensive
-                raise ValueError("이미지 크기를 확인할 수 없습니다.") from exc
-
-            if max_bytes and size > max_bytes:
-                limit_mb = max_bytes / (1024 * 1024)
-                raise ValueError(f"이미지 크기는 {limit_mb:.0f}MB 이하만 가능합니다: {original_name}")
-
-            stored_name = f"{uuid4().hex}{f'.{ext}' if ext else ''}"
-            storage.save(upload_dir / stored_name)
-
-            saved.append({
-                'original_name': original_name,
-                'stored_name': stored_name,
-                'content_type': storage.mimetype,
-                'file_size': size
-            })
+        db.query("DELETE FROM ImageBlobs WHERE ref_count = 0")
+        referenced = {row[0] for row in db.query("SELECT stored_name FROM PostImages").result}
+        referenced.update(row[0] for row in db.query("SELECT stored_name FROM PostImageRenditions").result)
+        db.commit()
     except Exception:
-        cleanup_saved_images(saved)
+        db.rollback()
         raise
+    finally:
+        db.release()
 
-    return saved
+    cutoff = time.time() - grace_hours * 3600
+    storage = image_storage.backend
+    candidates = [name for name, modified in storage.iter_files() if name not in referenced and modified < cutoff]
+    removed = []
+    for start in range(0, len(candidates), GC_BATCH_SIZE):
+        batch = candidates[start:start + GC_BATCH_SIZE]
+        # 목록을 만든 뒤 새 게시물이 같은 내용을 다시 썼을 수 있으므로, 지우기 직전에 참조와 수정 시각을 다시 확인함
+        # (기존 파일을 다시 쓰면 `put`이 수정 시각을 갱신함)
+        try:
+            still_used = referenced_names(db, batch)
+            db.commit()
+        finally:
+            db.release()
+        batch = [name for name in batch
+                 if name not in still_used and (storage.modified(name) or 0.0) < cutoff]
+        storage.delete(batch)
+        removed.extend(batch)
+    temp_removed = remove_stale_temp_files(Path(current_app.config['POST_IMAGE_UPLOAD_FOLDER']), cutoff)
+    click.echo(f"지운 파일: {len(removed)}개, 임시 파일: {temp_removed}개")
 
 
 def fetch_post_images(db: DatabaseManager, post_ids: Iterable[int]) -> Dict[int, List[Dict[str, object]]]:
@@ -101,7 +245,9 @@ def fetch_post_images(db: DatabaseManager, post_ids: Iterable[int]) -> Dict[int,
             original_name,
             stored_name,
             content_type,
-            file_size
+            file_size,
+            width,
+            height
         FROM PostImages
         WHERE post_id IN ({placeholders})
         ORDER BY image_id ASC
@@ -109,19 +255,66 @@ def fetch_post_images(db: DatabaseManager, post_ids: Iterable[int]) -> Dict[int,
         **params
     ).result
 
+    renditions = fetch_image_renditions(db, [row[1] for row in rows])
+
     images: Dict[int, List[Dict[str, object]]] = {pid: [] for pid in unique_ids}
     for row in rows:
-        (pid, image_id, original_name, stored_name, content_type, file_size) = row
+        (pid, image_id, original_name, stored_name, content_type, file_size, width, height) = row
         size = int(file_size) if file_size is not None else None
+        url = image_url(stored_name)
+        variants = renditions.get(image_id, {})
+        # 변환이 끝나기 전에는 썸네일/상세 URL 모두 원본을 가리킴
         images.setdefault(pid, []).append({
             "image_id": image_id,
             "original_name": original_name,
-            "url": url_for('post.get_post_image', filename=stored_name, _external=False),
+            "url": url,
             "content_type": content_type,
-            "file_size": size
+            "file_size": size,
+            "width": width,
+            "height": height,
+            "thumbnail_url": image_url(variants.get(THUMB)) or url,
+            "thumbnail_webp_url": image_url(variants.get(f"{THUMB}_webp")),
+            "detail_url": image_url(variants.get(DETAIL)) or url,
+            "detail_webp_url": image_url(variants.get(f"{DETAIL}_webp")),
+            "renditions_ready": bool(variants)
         })
 
     for pid in unique_ids:
         images.setdefault(pid, [])
 
     return images
+
+
+def image_url(stored_name: Optional[str]) -> Optional[str]:
+    """
+    객체 저장소면 버킷 URL(공개 주소 또는 서명된 URL)을, 로컬 저장소면 이미지 경로를 반환함.
+    """
+    if not stored_name:
+        return None
+    return (image_storage.backend.url(stored_name)
+            or url_for('post.get_post_image', filename=stored_name, _external=False))
+
+
+def fetch_image_renditions(db: DatabaseManager, image_ids: Iterable[int]) -> Dict[int, Dict[str, str]]:
+    """
+    :return: image_id -> {변환본 이름: 저장 파일명}
+    """
+    unique_ids = list(dict.fromkeys(image_ids))
+    if not unique_ids:
+        return {}
+
+    params = {f"id_{idx}": image_id for idx, image_id in enumerate(unique_ids)}
+    placeholders = ", ".join([f"%({key})s" for key in params])
+    rows = db.query(
+        f"""
+        SELECT image_id, variant, stored_name
+        FROM PostImageRenditions
+        WHERE image_id IN ({placeholders})
+        """,
+        **params
+    ).result
+
+    renditions: Dict[int, Dict[str, str]] = {}
+    for image_id, variant, stored_name in rows:
+        renditions.setdefault(image_id, {})[variant] = stored_name
+    return renditions
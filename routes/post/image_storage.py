@@ -0,0 +1,46 @@
+import json
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+from utils.config_util import register_config_listener
+from utils.storage_util import ImageStorage, build_image_storage
+
+from . import post_bp
+
+
+class ImageStorageProvider:
+    """
+    설정(`Uploads.Storage`)에 맞는 이미지 저장소를 만들어 두고, 설정이 바뀐 경우에만 새로 만듦.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._storage: Optional[ImageStorage] = None
+        self._key: Optional[Tuple[str, str]] = None
+        self.upload_dir: Optional[Path] = None
+
+    def configure(self, config) -> None:
+        upload_dir = Path(config['POST_IMAGE_UPLOAD_FOLDER'])
+        section = dict(config.get('POST_IMAGE_STORAGE') or {})
+        key = (str(upload_dir), json.dumps(section, sort_keys=True, default=dict))
+        with self._lock:
+            if key == self._key:
+                return
+            self._storage = build_image_storage(upload_dir, section)
+            self._key = key
+            self.upload_dir = upload_dir
+
+    @property
+    def backend(self) -> ImageStorage:
+        storage = self._storage
+        if storage is None:
+            raise RuntimeError("이미지 저장소가 설정되지 않았습니다.")
+        return storage
+
+
+image_storage = ImageStorageProvider()
+
+
+@post_bp.record_once
+def register_image_storage_config(state) -> None:
+    register_config_listener(state.app, image_storage.configure)
@@ -0,0 +1,260 @@
+import atexit
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import pymysql
+from flask import current_app
+
+from utils.config_util import register_config_listener
+from utils.database_util import DatabaseManager
+
+from . import post_bp
+from .feed_cache import on_post_changed
+
+logger = logging.getLogger(__name__)
+
+# MySQL 오류 번호
+ER_DUP_ENTRY = 1062          # 유니크 키 중복
+ER_NO_REFERENCED_ROW = 1452  # 외래 키가 가리키는 행이 없음
+
+
+def toggle_like_row(db: DatabaseManager, post_id: int, sid: int) -> Optional[bool]:
+    """
+    (post_id, student_id) 유니크 키를 이용해 좋아요를 원자적으로 토글함.
+    :return: 좋아요가 추가되면 `True`, 취소되면 `False`, 게시물이 없으면 `None`
+    """
+    # 게시물 확인을 INSERT ... SELECT에 합쳐 왕복을 한 번 줄임 (게시물이 없으면 0행 삽입)
+    # 이미 눌렀으면 유니크 키 때문에 중복 오류(1062)가 남 (동시에 두 번 눌러도 한쪽만 성공)
+    # INSERT IGNORE는 외래 키 등 다른 오류까지 삼키므로 중복 오류만 골라서 처리함
+    try:
+        result = db.query(
+            """
+            INSERT INTO PostLikes (post_id, student_id)
+            SELECT post_id, %(sid)s FROM Posts WHERE post_id = %(post_id)s
+            """,
+            post_id=post_id,
+            sid=sid
+        )
+        return True if result.affected_rows else None
+    except pymysql.err.IntegrityError as e:
+        if e.args[0] == ER_NO_REFERENCED_ROW:
+            return None  # 확인한 뒤 게시물이 지워진 경우
+        if e.args[0] != ER_DUP_ENTRY:
+            raise
+
+    db.query(
+        "DELETE FROM PostLikes WHERE post_id = %(post_id)s AND student_id = %(sid)s",
+        post_id=post_id,
+        sid=sid
+    )
+    return False
+
+
+def apply_like_delta(db: DatabaseManager, post_id: int, delta: int) -> int:
+    """
+    like_count를 바로 갱신하고 갱신된 값을 반환함.
+    LAST_INSERT_ID(expr)로 값을 돌려받아 SELECT를 한 번 줄임.
+    """
+    result = db.query(
+        """
+        UPDATE Posts SET like_count = LAST_INSERT_ID(GREATEST(CAST(like_count AS SIGNED) + %(delta)s, 0))
+        WHERE post_id = %(post_id)s
+        """,
+        post_id=post_id,
+        delta=delta
+    )
+    return int(result.last_insert_id or 0)
+
+
+class LikeCounterBuffer:
+    """
+    like_count 증감을 게시물별로 모아두었다가 주기적으로 한꺼번에 반영하는 버퍼.
+    인기 게시물의 Posts 행에 잠금이 몰리지 않도록 함.
+    응답에 쓸 DB 값(`base`)도 다음 flush까지 캐시해서 좋아요마다 like_count를 다시 읽지 않음.
+    """
+    def __init__(self, flush_interval: float = 2.0):
+        self.flush_interval = flush_interval
+        self.enabled = False
+
+        self._lock = threading.Lock()
+        self._pending: Dict[int, int] = {}
+        self._inflight: Dict[int, int] = {}  # flush 중이라 아직 커밋되지 않은 증감
+        self._bases: Dict[int, int] = {}
+        self._flush_lock = threading.Lock()
+        self.generation = 0  # flush가 커밋될 때마다 늘어남
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.coalesced = 0
+        self.failures = 0
+
+    def start(self, flush_interval: Optional[float] = None) -> None:
+        if flush_interval is not None:
+            self.flush_interval = float(flush_interval)
+        self.enabled = True
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="like-counter-flush", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 1)
+            self._thread = None
+        self.flush()
+
+    def add(self, post_id: int, delta: int) -> None:
+        with self._lock:
+            if post_id in self._pending:
+                self.coalesced += 1
+            self._pending[post_id] = self._pending.get(post_id, 0) + delta
+
+    def pending(self, post_id: int) -> int:
+        """DB에 아직 커밋되지 않은 증감 (flush 중인 것 포함)."""
+        with self._lock:
+            return self._pending.get(post_id, 0) + self._inflight.get(post_id, 0)
+
+    def base(self, post_id: int) -> Optional[int]:
+        with self._lock:
+            return self._bases.get(post_id)
+
+    def remember_base(self, post_id: int, like_count: int, generation: int) -> None:
+        """
+        :param generation: like_count를 읽기 전의 `generation`. 그 사이 flush가 커밋됐으면 읽은 값이 낡았으므로 버림
+        """
+        with self._lock:
+            if generation == self.generation:
+                self._bases[post_id] = like_count
+
+    def flush(self) -> int:
+        """
+        모아둔 증감을 DB에 반영함.
+        :return: 갱신한 게시물 수
+        """
+        with self._flush_lock:
+            # 커밋될 때까지는 `pending()`에 계속 보이도록 flush 중인 증감을 따로 둠
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            # 교착 상태를 피하려고 항상 post_id 순서로 갱신
+            rows = [{"post_id": pid, "delta": delta} for pid, delta in sorted(batch.items()) if delta]
+            if not rows:
+                with self._lock:
+                    self._inflight = {}
+                    for pid in batch:
+                        self._bases.pop(pid, None)
+                return 0
+
+            db = DatabaseManager()
+            try:
+                db.query_many(
+                    """
+                    UPDATE Posts SET like_count = GREATEST(CAST(like_count AS SIGNED) + %(delta)s, 0)
+                    WHERE post_id = %(post_id)s
+                    """,
+                    rows
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                with self._lock:
+                    for pid, delta in batch.items():
+                        self._pending[pid] = self._pending.get(pid, 0) + delta
+                    self._inflight = {}
+                    self.failures += 1
+                raise
+            finally:
+                db.release()
+
+            with self._lock:
+                self._inflight = {}
+                # 반영한 게시물은 다른 워커의 증감도 섞였을 수 있으므로 다음 요청 때 DB 값을 다시 읽음
+                for pid in batch:
+                    self._bases.pop(pid, None)
+                self.generation += 1
+                self.flushes += 1
+                self.flushed_rows += len(rows)
+        for row in rows:
+            on_post_changed(row["post_id"])
+        return len(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "pending_posts": len(self._pending),
+                "inflight_posts": len(self._inflight),
+                "cached_bases": len(self._bases),
+                "flushes": self.flushes,
+                "flushed_rows": self.flushed_rows,
+                "coalesced": self.coalesced,
+                "failures": self.failures,
+            }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("좋아요 수 flush 실패")
+
+
+like_counter_buffer = LikeCounterBuffer()
+
+
+@post_bp.record_once
+def register_like_counter_config(state) -> None:
+    register_config_listener(state.app, configure_like_counter)
+
+
+def configure_like_counter(config) -> None:
+    like_counter_buffer.flush_interval = float(config.get('POST_LIKE_FLUSH_INTERVAL', 2.0))
+    if not config.get('POST_LIKE_WRITE_BEHIND') and like_counter_buffer.running:
+        # 설정에서 꺼지면 바로 직접 반영으로 돌아가고, 모아둔 증감은 비움
+        like_counter_buffer.enabled = False
+        like_counter_buffer.stop()
+
+
+@post_bp.before_app_request
+def start_like_counter() -> None:
+    # 워커 프로세스마다 첫 요청 때 시작함 (fork 전에 만든 스레드는 자식 프로세스로 넘어가지 않음)
+    config = current_app.config
+    if config.get('POST_LIKE_WRITE_BEHIND') and not like_counter_buffer.running:
+        like_counter_buffer.start(config.get('POST_LIKE_FLUSH_INTERVAL', 2.0))
+
+
+def record_like(db: DatabaseManager, post_id: int, liked: bool) -> int:
+    """
+    토글 결과를 like_count에 반영하고 커밋함.
+    쓰기 지연 모드에서는 증감을 버퍼에 쌓고, DB 값에 아직 반영되지 않은 증감을 더해 반환함.
+    DB 값은 게시물의 증감이 flush될 때까지 캐시하므로 대부분의 요청은 like_count를 읽지 않음.
+    :return: 현재 like_count
+    """
+    delta = 1 if liked else -1
+    if not like_counter_buffer.enabled:
+        like_count = apply_like_delta(db, post_id, delta)
+        db.commit()
+        return like_count
+
+    base = like_counter_buffer.base(post_id)
+    if base is None:
+        generation = like_counter_buffer.generation
+        row = db.query(
+            "SELECT like_count FROM Posts WHERE post_id = %(post_id)s",
+            post_id=post_id
+        ).result
+        base = row[0][0] if row else 0
+        like_counter_buffer.remember_base(post_id, base, generation)
+    db.commit()
+    like_counter_buffer.add(post_id, delta)
+    return max(base + like_counter_buffer.pending(post_id), 0)
@@ -1,18 +1,53 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, List
+
 from flask import jsonify, request
 
 from utils.database_util import DatabaseManager
+from utils.rate_limit_util import rate_limited
+from utils.student_directory_util import StudentDirectory
+from utils.upload_util import discard_streamed_files
 
 from . import post_bp
+from .feed_cache import (
+    LIST_HEAD_TAG,
+    feed_version,
+    on_post_changed,
+    on_post_created,
+    post_detail_cache,
+    post_list_cache,
+    post_tag,
+    post_version,
+)
+from .image_renditions import enqueue_post_renditions
 from .image_service import (
-    cleanup_saved_images,
-    collect_image_files,
+    detach_post_images,
     fetch_post_images,
+    receive_post_upload,
+    register_image_blobs,
     save_post_images,
 )
-from .utils import parse_request_payload, require_login, to_bool
+from .image_storage import image_storage
+from .like_service import record_like, toggle_like_row
+from .sub_comment_routes import fetch_post_replies
+from .utils import (
+    decode_cursor,
+    encode_cursor,
+    make_etag,
+    not_modified,
+    parse_request_payload,
+    require_login,
+    to_bool,
+    with_validators,
+)
+
+logger = logging.getLogger(__name__)
 
 
 @post_bp.route('/api/posts/', methods=['POST'])
+@rate_limited('create_post')
 def create_post():
     db = None
     saved_images = []
@@ -22,19 +57,25 @@ def create_post():
             return err
 
         is_multipart = request.content_type and 'multipart/form-data' in request.content_type
-        payload = parse_request_payload()
+        if is_multipart:
+            # 본문을 한 번만 읽으면서 이미지는 업로드 폴더의 임시 파일에 바로 씀
+            form, uploads = receive_post_upload()
+            payload = parse_request_payload(form)
+        else:
+            uploads = []
+            payload = parse_request_payload()
         title = (payload.get('title') or '').strip()
         content = (payload.get('content') or '').strip()
         is_anonymous = 1 if to_bool(payload.get('is_anonymous'), False) else 0
 
         if not title or not content:
+            discard_streamed_files(uploads)
             return jsonify({
                 "status": "error",
                 "message": "제목과 내용을 모두 입력하세요."
             }), 400
 
-        image_files = collect_image_files() if is_multipart else []
-        saved_images = save_post_images(image_files)
+        saved_images = save_post_images(uploads)
 
         db = DatabaseManager()
         db.query(
@@ -71,9 +112,14 @@ def create_post():
                     for img in saved_images
                 ]
             )
+            register_image_blobs(db, saved_images)
 
         db.commit()
+        invalidate_post_total()
+        on_post_created()
 
+        if saved_images:
+            enqueue_post_renditions(db, post_id)
         images = fetch_post_images(db, [post_id]).get(post_id, [])
 
         return jsonify({
@@ -83,10 +129,9 @@ def create_post():
             "images": images
         }), 201
     except ValueError as ve:
-        cleanup_saved_images(saved_images)
-        if db and getattr(db, 'db_conn', None):
+        if db:
             try:
-                db.db_conn.rollback()
+                db.rollback()
             except Exception:
                 pass
         return jsonify({
@@ -94,10 +139,9 @@ def create_post():
             "message": str(ve)
         }), 400
     except Exception as e:
-        cleanup_saved_images(saved_images)
-        if db and getattr(db, 'db_conn', None):
+        if db:
             try:
-                db.db_conn.rollback()
+                db.rollback()
             except Exception:
                 pass
         return jsonify({
@@ -107,12 +151,157 @@ def create_post():
         }), 500
 
 
+POST_LIST_COLUMNS = """
+    p.post_id,
+    p.student_id,
+    p.title,
+    p.content,
+    p.is_anonymous,
+    p.like_count,
+    DATE_FORMAT(p.created_at, '%%Y-%%m-%%d %%H:%%i:%%s') as created_at,
+    p.comment_count
+"""
+
+# 전체 게시물 수는 매 요청마다 COUNT(*) 하지 않고 잠시 캐시해 둠
+TOTAL_CACHE_TTL = 10.0
+_total_cache = {"value": None, "expires_at": 0.0}
+_total_lock = threading.Lock()
+
+
+def get_post_total(db: DatabaseManager) -> int:
+    now = time.monotonic()
+    with _total_lock:
+        if _total_cache["value"] is not None and now < _total_cache["expires_at"]:
+            return _total_cache["value"]
+
+    total = db.query("SELECT COUNT(*) FROM Posts").result[0][0]
+    with _total_lock:
+        _total_cache["value"] = total
+        _total_cache["expires_at"] = now + TOTAL_CACHE_TTL
+    return total
+
+
+def invalidate_post_total() -> None:
+    with _total_lock:
+        _total_cache["value"] = None
+
+
+def serialize_post_rows(db: DatabaseManager, rows) -> List[Dict[str, Any]]:
+    items = []
+    post_ids = []
+    # 작성자 이름은 JOIN 대신 메모리의 학생 명부에서 채움
+    names = StudentDirectory().names(r[1] for r in rows if not r[4])
+    for r in rows:
+        (post_id, student_id, title, content, is_anonymous,
+         like_count, created_at, comment_count) = r
+        anon = bool(is_anonymous)
+        post_ids.append(post_id)
+        items.append({
+            "post_id": post_id,
+            "student_id": None if anon else student_id,
+            "student_name": "익명" if anon else names.get(student_id),
+            "title": title,
+            "content": content,
+            "is_anonymous": anon,
+            "like_count": like_count,
+            "comment_count": comment_count,
+            "created_at": created_at
+        })
+
+    images_map = fetch_post_images(db, post_ids)
+    for item in items:
+        item["images"] = images_map.get(item["post_id"], [])
+    return items
+
+
+def list_posts_by_cursor(db: DatabaseManager, size: int, direction: str, anchor_id: int,
+                         include_total: bool) -> Dict[str, Any]:
+    # 기본키로 바로 찾아가므로 OFFSET처럼 깊은 페이지에서 느려지지 않음
+    if direction == 'before':
+        where, order = "p.post_id < %(anchor)s", "DESC"
+    else:
+        where, order = "p.post_id > %(anchor)s", "ASC"
+
+    rows = db.query(
+        f"""
+        SELECT {POST_LIST_COLUMNS}
+        FROM Posts p
+        WHERE {where}
+        ORDER BY p.post_id {order}
+        LIMIT %(limit)s
+        """,
+        anchor=anchor_id,
+        limit=size + 1
+    ).result
+
+    has_more = len(rows) > size
+    rows = list(rows[:size])
+    if direction == 'after':
+        rows.reverse()
+
+    items = serialize_post_rows(db, rows)
+
+    next_cursor = None
+    prev_cursor = None
+    if items:
+        oldest_id = items[-1]["post_id"]
+        newest_id = items[0]["post_id"]
+        if direction == 'after' or has_more:
+            next_cursor = encode_cursor('before', oldest_id)
+        prev_cursor = encode_cursor('after', newest_id)
+    elif direction == 'after':
+        prev_cursor = encode_cursor('after', anchor_id)
+
+    body = {
+        "status": "success",
+        "size": size,
+        "has_more": has_more,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "items": items
+    }
+    if include_total:
+        body["total"] = get_post_total(db)
+    return body
+
+
+def list_posts_by_page(db: DatabaseManager, page: int, size: int) -> Dict[str, Any]:
+    offset = (page - 1) * size
+    total = get_post_total(db)
+
+    rows = db.query(
+        f"""
+        SELECT {POST_LIST_COLUMNS}
+        FROM Posts p
+        ORDER BY p.post_id DESC
+        LIMIT %(limit)s OFFSET %(offset)s
+        """,
+        limit=size,
+        offset=offset
+    ).result
+
+    items = serialize_post_rows(db, rows)
+    next_cursor = encode_cursor('before', items[-1]["post_id"]) if len(items) == size else None
+
+    return {
+        "status": "success",
+        "page": page,
+        "size": size,
+        "total": total,
+        "next_cursor": next_cursor,
+        "items": items
+    }
+
+
 @post_bp.route('/api/posts/', methods=['GET'])
 def list_posts():
     try:
         try:
             page = int(request.args.get('page', 1))
             size = int(request.args.get('size', 10))
+            # `type=int`는 숫자가 아니면 조용히 None을 돌려주므로 직접 변환함
+            before_id = int(request.args['before_id']) if 'before_id' in request.args else None
+            after_id = int(request.args['after_id']) if 'after_id' in request.args else None
         except ValueError:
             return jsonify({
                 "status": "error",
@@ -125,62 +314,51 @@ def list_posts():
                 "message": "페이지는 1 이상, 크기는 1~100 사이여야 합니다."
             }), 400
 
-        offset = (page - 1) * size
-
-        db = DatabaseManager()
-        total = db.query("SELECT COUNT(*) FROM Posts").result[0][0]
-
-        rows = db.query(
-            """
-            SELECT 
-                p.post_id,
-                p.student_id,
-                s.student_name,
-                p.title,
-                p.content,
-                p.is_anonymous,
-                p.like_count,
-                DATE_FORMAT(p.created_at, '%%Y-%%m-%%d %%H:%%i:%%s') as created_at,
-                (SELECT COUNT(*) FROM Comments c WHERE c.post_id = p.post_id) as comment_count
-            FROM Posts p
-            LEFT JOIN Students s ON p.student_id = s.student_id
-            ORDER BY p.post_id DESC
-            LIMIT %(limit)s OFFSET %(offset)s
-            """,
-            limit=size,
-            offset=offset
-        ).result
+        cursor = request.args.get('cursor')
+        if cursor:
+            decoded = decode_cursor(cursor)
+            if decoded is None:
+                return jsonify({
+                    "status": "error",
+                    "message": "유효하지 않은 커서입니다."
+                }), 400
+            direction, anchor_id = decoded
+        elif before_id is not None:
+            direction, anchor_id = 'before', before_id
+        elif after_id is not None:
+            direction, anchor_id = 'after', after_id
+        else:
+            direction, anchor_id = None, None
 
-        items = []
-        post_ids = []
-        for r in rows:
-            (post_id, student_id, student_name, title, content, is_anonymous,
-             like_count, created_at, comment_count) = r
-            anon = bool(is_anonymous)
-            post_ids.append(post_id)
-            items.append({
-                "post_id": post_id,
-                "student_id": None if anon else student_id,
-                "student_name": "익명" if anon else student_name,
-                "title": title,
-                "content": content,
-                "is_anonymous": anon,
-                "like_count": like_count,
-                "comment_count": comment_count,
-                "created_at": created_at
-            })
+        include_total = to_bool(request.args.get('include_total'), False)
 
-        images_map = fetch_post_images(db, post_ids)
-        for item in items:
-            item["images"] = images_map.get(item["post_id"], [])
+        version, modified_at = feed_version()
+        etag = make_etag(version, 'list', sorted(request.args.items(multi=True)))
+        cached_response = not_modified(etag, modified_at)
+        if cached_response is not None:
+            return cached_response
 
-        return jsonify({
-            "status": "success",
-            "page": page,
-            "size": size,
-            "total": total,
-            "items": items
-        })
+        if direction is not None:
+            cache_key = (direction, anchor_id, size, include_total)
+        else:
+            cache_key = ('page', page, size)
+
+        body = post_list_cache.get(cache_key)
+        if body is None:
+            generation = post_list_cache.generation
+            db = DatabaseManager()
+            if direction is not None:
+                body = list_posts_by_cursor(db, size, direction, anchor_id, include_total)
+            else:
+                body = list_posts_by_page(db, page, size)
+
+            # before 커서 페이지는 새 글이 올라와도 내용이 그대로이므로 list:head 태그를 붙이지 않음
+            tags = [post_tag(item["post_id"]) for item in body["items"]]
+            if direction != 'before' or include_total:
+                tags.append(LIST_HEAD_TAG)
+            post_list_cache.set(cache_key, body, tags, generation)
+
+        return with_validators(jsonify(body), etag, modified_at)
     except Exception as e:
         return jsonify({
             "status": "error",
@@ -192,20 +370,44 @@ def list_posts():
 @post_bp.route('/api/posts/<int:post_id>/', methods=['GET'])
 def get_post_detail(post_id: int):
     try:
+        include = {part.strip() for part in request.args.get('include', '').split(',') if part.strip()}
+        include_replies = 'replies' in include
+        reply_limit = None
+        if include_replies and 'reply_limit' in request.args:
+            try:
+                reply_limit = int(request.args['reply_limit'])
+            except ValueError:
+                reply_limit = -1
+            if reply_limit < 0:
+                return jsonify({
+                    "status": "error",
+                    "message": "reply_limit은 0 이상의 정수여야 합니다."
+                }), 400
+
+        version, modified_at = post_version(post_id)
+        etag = make_etag(version, 'detail', include_replies, reply_limit)
+        cached_response = not_modified(etag, modified_at)
+        if cached_response is not None:
+            return cached_response
+
+        cache_key = (post_id, include_replies, reply_limit)
+        body = post_detail_cache.get(cache_key)
+        if body is not None:
+            return with_validators(jsonify(body), etag, modified_at)
+
+        generation = post_detail_cache.generation
         db = DatabaseManager()
         post_row = db.query(
             """
             SELECT 
                 p.post_id,
                 p.student_id,
-                s.student_name,
                 p.title,
                 p.content,
                 p.is_anonymous,
                 p.like_count,
                 DATE_FORMAT(p.created_at, '%%Y-%%m-%%d %%H:%%i:%%s') as created_at
             FROM Posts p
-            LEFT JOIN Students s ON p.student_id = s.student_id
             WHERE p.post_id = %(post_id)s
             """,
             post_id=post_id
@@ -217,13 +419,13 @@ def get_post_detail(post_id: int):
                 "message": "게시물을 찾을 수 없습니다."
             }), 404
 
-        (pid, student_id, student_name, title, content, is_anonymous,
+        (pid, student_id, title, content, is_anonymous,
          like_count, created_at) = post_row[0]
         anon = bool(is_anonymous)
         post_obj = {
             "post_id": pid,
             "student_id": None if anon else student_id,
-            "student_name": "익명" if anon else student_name,
+            "student_name": "익명" if anon else StudentDirectory().names([student_id]).get(student_id),
             "title": title,
             "content": content,
             "is_anonymous": anon,
@@ -238,36 +440,44 @@ def get_post_detail(post_id: int):
             SELECT 
                 c.comment_id,
                 c.student_id,
-                s.student_name,
                 c.content,
                 c.is_anonymous,
-                DATE_FORMAT(c.created_at, '%%Y-%%m-%%d %%H:%%i:%%s') as created_at
+                DATE_FORMAT(c.created_at, '%%Y-%%m-%%d %%H:%%i:%%s') as created_at,
+                c.reply_count
             FROM Comments c
-            LEFT JOIN Students s ON c.student_id = s.student_id
             WHERE c.post_id = %(post_id)s
             ORDER BY c.created_at ASC
             """,
             post_id=post_id
         ).result
 
+        replies_map = fetch_post_replies(db, post_id, reply_limit) if include_replies and comments else {}
+
         comment_items = []
+        names = StudentDirectory().names(r[1] for r in comments if not r[3])
         for r in comments:
-            (cid, c_student_id, c_student_name, c_content, c_is_anonymous, c_created_at) = r
+            (cid, c_student_id, c_content, c_is_anonymous, c_created_at,
+             c_reply_count) = r
             c_anon = bool(c_is_anonymous)
             comment_items.append({
                 "comment_id": cid,
                 "student_id": None if c_anon else c_student_id,
-                "student_name": "익명" if c_anon else c_student_name,
+                "student_name": "익명" if c_anon else names.get(c_student_id),
                 "content": c_content,
                 "is_anonymous": c_anon,
+                "reply_count": c_reply_count,
                 "created_at": c_created_at
             })
+            if include_replies:
+                comment_items[-1]["replies"] = replies_map.get(cid, [])
 
-        return jsonify({
+        body = {
             "status": "success",
             "post": post_obj,
             "comments": comment_items
-        })
+        }
+        post_detail_cache.set(cache_key, body, [post_tag(post_id)], generation)
+        return with_validators(jsonify(body), etag, modified_at)
     except Exception as e:
         return jsonify({
             "status": "error",
@@ -276,63 +486,92 @@ def get_post_detail(post_id: int):
         }), 500
 
 
-@post_bp.route('/api/posts/<int:post_id>/like/', methods=['POST'])
-def toggle_like(post_id: int):
+@post_bp.route('/api/posts/<int:post_id>/', methods=['DELETE'])
+def delete_post(post_id: int):
+    db = None
     try:
         sid, err = require_login()
         if err:
             return err
 
         db = DatabaseManager()
-        post_exists = db.query(
-            "SELECT 1 FROM Posts WHERE post_id = %(post_id)s",
+        owner = db.query(
+            "SELECT student_id FROM Posts WHERE post_id = %(post_id)s FOR UPDATE",
             post_id=post_id
         ).result
-        if not post_exists:
+        if not owner:
+            db.rollback()
             return jsonify({
                 "status": "error",
                 "message": "게시물을 찾을 수 없습니다."
             }), 404
+        if owner[0][0] != sid:
+            db.rollback()
+            return jsonify({
+                "status": "error",
+                "message": "본인이 작성한 게시물만 삭제할 수 있습니다."
+            }), 403
 
-        liked_row = db.query(
+        removable = detach_post_images(db, post_id)
+        db.query(
             """
-            SELECT 1 FROM PostLikes 
-            WHERE post_id = %(post_id)s AND student_id = %(sid)s
+            DELETE s FROM Sub_comments s
+            JOIN Comments c ON s.comment_id = c.comment_id
+            WHERE c.post_id = %(post_id)s
             """,
-            post_id=post_id,
-            sid=sid
-        ).result
-
-        if liked_row:
-            db.query(
-                "DELETE FROM PostLikes WHERE post_id = %(post_id)s AND student_id = %(sid)s",
-                post_id=post_id,
-                sid=sid
-            )
-            db.query(
-                "UPDATE Posts SET like_count = GREATEST(like_count - 1, 0) WHERE post_id = %(post_id)s",
-                post_id=post_id
-            )
-            liked = False
-        else:
-            db.query(
-                "INSERT INTO PostLikes (post_id, student_id) VALUES (%(post_id)s, %(sid)s)",
-                post_id=post_id,
-                sid=sid
-            )
-            db.query(
-                "UPDATE Posts SET like_count = like_count + 1 WHERE post_id = %(post_id)s",
-                post_id=post_id
-            )
-            liked = True
-
-        count_row = db.query(
-            "SELECT like_count FROM Posts WHERE post_id = %(post_id)s",
             post_id=post_id
-        ).result
+        )
+        db.query("DELETE FROM Comments WHERE post_id = %(post_id)s", post_id=post_id)
+        db.query("DELETE FROM PostLikes WHERE post_id = %(post_id)s", post_id=post_id)
+        db.query("DELETE FROM Posts WHERE post_id = %(post_id)s", post_id=post_id)
         db.commit()
+        invalidate_post_total()
+        on_post_created()
+        on_post_changed(post_id)
+
+        # 파일은 커밋한 뒤에 지움. 실패해도 참조가 없으므로 `gc-images`가 나중에 지움
+        try:
+            image_storage.backend.delete(removable)
+        except Exception:
+            logger.exception("게시물 %s의 이미지 파일 삭제 실패", post_id)
+
+        return jsonify({
+            "status": "success",
+            "message": "게시물 삭제 성공"
+        })
+    except Exception as e:
+        if db:
+            try:
+                db.rollback()
+            except Exception:
+                pass
+        return jsonify({
+            "status": "error",
+            "message": "서버 오류가 발생했습니다.",
+            "detail": str(e)
+        }), 500
 
-        like_count = count_row[0][0] if count_row else 0
+
+@post_bp.route('/api/posts/<int:post_id>/like/', methods=['POST'])
+@rate_limited('toggle_like')
+def toggle_like(post_id: int):
+    db = None
+    try:
+        sid, err = require_login()
+        if err:
+            return err
+
+        db = DatabaseManager()
+        liked = toggle_like_row(db, post_id, sid)
+        if liked is None:
+            db.rollback()
+            return jsonify({
+                "status": "error",
+                "message": "게시물을 찾을 수 없습니다."
+            }), 404
+
+        like_count = record_like(db, post_id, liked)
+        on_post_changed(post_id)
 
         return jsonify({
             "status": "success",
@@ -340,6 +579,11 @@ def toggle_like(post_id: int):
             "like_count": like_count
         })
     except Exception as e:
+        if db:
+            try:
+                db.rollback()
+            except Exception:
+                pass
         return jsonify({
             "status": "error",
             "message": "서버 오류가 발생했습니다.",
@@ -0,0 +1,142 @@
+from decimal import Decimal, InvalidOperation
+from typing import Optional, Tuple
+
+from flask import jsonify, request
+
+from utils.database_util import DatabaseManager
+
+from . import post_bp
+from .post_routes import POST_LIST_COLUMNS, serialize_post_rows
+from .utils import decode_token, encode_token
+
+# ngram 파서의 기본 토큰 길이(ngram_token_size=2)보다 짧으면 검색되지 않음
+MIN_QUERY_LENGTH = 2
+MAX_QUERY_LENGTH = 100
+
+# 제목/본문 일치를 댓글 일치보다 더 높게 침
+POST_MATCH_WEIGHT = 2.0
+COMMENT_MATCH_WEIGHT = 1.0
+
+
+def build_search_sql(with_cursor: bool = False) -> str:
+    # Posts(title, content)와 Comments(content)의 ngram FULLTEXT 인덱스에서 각각 찾은 뒤 게시물 단위로 합산.
+    # 점수를 DECIMAL로 고정해 커서 비교가 정확히 맞도록 함
+    having = """
+    HAVING score < %(cursor_score)s
+        OR (score = %(cursor_score)s AND post_id < %(cursor_id)s)
+    """ if with_cursor else ""
+    return f"""
+    SELECT post_id, CAST(SUM(score) AS DECIMAL(20, 6)) AS score
+    FROM (
+        SELECT post_id,
+               MATCH(title, content) AGAINST (%(q)s IN NATURAL LANGUAGE MODE) * %(post_weight)s AS score
+        FROM Posts
+        WHERE MATCH(title, content) AGAINST (%(q)s IN NATURAL LANGUAGE MODE)
+        UNION ALL
+        SELECT post_id,
+               MATCH(content) AGAINST (%(q)s IN NATURAL LANGUAGE MODE) * %(comment_weight)s AS score
+        FROM Comments
+        WHERE MATCH(content) AGAINST (%(q)s IN NATURAL LANGUAGE MODE)
+    ) m
+    GROUP BY post_id
+    {having}
+    ORDER BY score DESC, post_id DESC
+    LIMIT %(limit)s
+    """
+
+
+def encode_search_cursor(score: Decimal, post_id: int) -> str:
+    return encode_token({"s": str(score), "id": post_id})
+
+
+def decode_search_cursor(cursor: str) -> Optional[Tuple[Decimal, int]]:
+    data = decode_token(cursor)
+    try:
+        return Decimal(data['s']), int(data['id'])
+    except (ValueError, TypeError, KeyError, InvalidOperation):
+        return None
+
+
+@post_bp.route('/api/posts/search/', methods=['GET'])
+def search_posts():
+    try:
+        q = (request.args.get('q') or '').strip()
+        if len(q) < MIN_QUERY_LENGTH or len(q) > MAX_QUERY_LENGTH:
+            return jsonify({
+                "status": "error",
+                "message": f"검색어는 {MIN_QUERY_LENGTH}~{MAX_QUERY_LENGTH}자로 입력하세요."
+            }), 400
+
+        try:
+            size = int(request.args.get('size', 10))
+        except ValueError:
+            size = 0
+        if size < 1 or size > 50:
+            return jsonify({
+                "status": "error",
+                "message": "크기는 1~50 사이여야 합니다."
+            }), 400
+
+        params = {
+            "q": q,
+            "post_weight": POST_MATCH_WEIGHT,
+            "comment_weight": COMMENT_MATCH_WEIGHT,
+            "limit": size + 1,
+        }
+        cursor = request.args.get('cursor')
+        if cursor:
+            decoded = decode_search_cursor(cursor)
+            if decoded is None:
+                return jsonify({
+                    "status": "error",
+                    "message": "유효하지 않은 커서입니다."
+                }), 400
+            params["cursor_score"], params["cursor_id"] = decoded
+
+        db = DatabaseManager()
+
+        matches = db.query(build_search_sql(with_cursor=bool(cursor)), **params).result
+
+        has_more = len(matches) > size
+        matches = list(matches[:size])
+
+        items = []
+        if matches:
+            id_params = {f"id_{idx}": pid for idx, (pid, _) in enumerate(matches)}
+            placeholders = ", ".join([f"%({key})s" for key in id_params])
+            rows = db.query(
+                f"""
+                SELECT {POST_LIST_COLUMNS}
+                FROM Posts p
+                WHERE p.post_id IN ({placeholders})
+                """,
+                **id_params
+            ).result
+
+            by_id = {item["post_id"]: item for item in serialize_post_rows(db, rows)}
+            for pid, score in matches:
+                item = by_id.get(pid)
+                if item is None:
+                    continue
+                item["score"] = float(score)
+                items.append(item)
+
+        next_cursor = None
+        if has_more and matches:
+            last_id, last_score = matches[-1]
+            next_cursor = encode_search_cursor(last_score, last_id)
+
+        return jsonify({
+            "status": "success",
+            "q": q,
+            "size": size,
+            "has_more": has_more,
+            "next_cursor": next_cursor,
+            "items": items
+        })
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": "서버 오류가 발생했습니다.",
+            "detail": str(e)
+        }), 500
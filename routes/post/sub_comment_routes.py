@@ -1,13 +1,88 @@
+from typing import Any, Dict, List, Optional
+
 from flask import jsonify
 
 from utils.database_util import DatabaseManager
+from utils.rate_limit_util import rate_limited
+from utils.student_directory_util import StudentDirectory
 
 from . import post_bp
-from .utils import parse_request_payload, require_login, to_bool
+from .feed_cache import comment_version, on_comment_changed
+from .utils import make_etag, not_modified, parse_request_payload, require_login, to_bool, with_validators
+
+
+SUB_COMMENT_COLUMNS = """
+    sc.sub_comment_id,
+    sc.student_id,
+    sc.content,
+    sc.is_anonymous,
+    DATE_FORMAT(sc.created_at, '%%Y-%%m-%%d %%H:%%i:%%s') as created_at
+"""
+
+
+def serialize_sub_comment_row(row, names: Dict[int, str]) -> Dict[str, Any]:
+    (scid, s_student_id, s_content, s_is_anonymous, s_created_at) = row
+    s_anon = bool(s_is_anonymous)
+    return {
+        "sub_comment_id": scid,
+        "student_id": None if s_anon else s_student_id,
+        "student_name": "익명" if s_anon else names.get(s_student_id),
+        "content": s_content,
+        "is_anonymous": s_anon,
+        "created_at": s_created_at
+    }
+
+
+def fetch_post_replies(db: DatabaseManager, post_id: int,
+                       limit: Optional[int] = None) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    게시물의 대댓글을 한 번의 쿼리로 가져와 댓글별로 묶음.
+    :param limit: 댓글당 최대 대댓글 수 (오래된 순), `None`이면 전부.
+        DB에서 댓글별 순번(ROW_NUMBER, MySQL 8.0 이상)으로 잘라 필요한 행만 읽음
+    """
+    if limit is None:
+        rows = db.query(
+            f"""
+            SELECT sc.comment_id, {SUB_COMMENT_COLUMNS}
+            FROM Sub_comments sc
+            JOIN Comments c ON sc.comment_id = c.comment_id
+            WHERE c.post_id = %(post_id)s
+            ORDER BY sc.comment_id ASC, sc.created_at ASC
+            """,
+            post_id=post_id
+        ).result
+    elif limit <= 0:
+        rows = ()
+    else:
+        rows = db.query(
+            f"""
+            SELECT sc.comment_id, {SUB_COMMENT_COLUMNS}
+            FROM (
+                SELECT s.*, ROW_NUMBER() OVER (
+                    PARTITION BY s.comment_id ORDER BY s.created_at ASC, s.sub_comment_id ASC
+                ) AS rn
+                FROM Sub_comments s
+                JOIN Comments c ON s.comment_id = c.comment_id
+                WHERE c.post_id = %(post_id)s
+            ) sc
+            WHERE sc.rn <= %(limit)s
+            ORDER BY sc.comment_id ASC, sc.rn ASC
+            """,
+            post_id=post_id,
+            limit=limit
+        ).result
+
+    names = StudentDirectory().names(r[2] for r in rows if not r[4])
+    replies: Dict[int, List[Dict[str, Any]]] = {}
+    for r in rows:
+        replies.setdefault(r[0], []).append(serialize_sub_comment_row(r[1:], names))
+    return replies
 
 
 @post_bp.route('/api/posts/<int:post_id>/comments/<int:comment_id>/replies/', methods=['POST'])
+@rate_limited('create_sub_comment')
 def create_sub_comment(post_id: int, comment_id: int):
+    db = None
     try:
         sid, err = require_login()
         if err:
@@ -25,15 +100,17 @@ def create_sub_comment(post_id: int, comment_id: int):
 
         db = DatabaseManager()
 
-        comment_exists = db.query(
+        # 대상 댓글 확인과 대댓글 수 증가를 한 번에 처리 (같은 트랜잭션)
+        updated = db.query(
             """
-            SELECT 1 FROM Comments 
+            UPDATE Comments SET reply_count = reply_count + 1
             WHERE comment_id = %(comment_id)s AND post_id = %(post_id)s
             """,
             comment_id=comment_id,
             post_id=post_id
-        ).result
-        if not comment_exists:
+        ).affected_rows
+        if not updated:
+            db.rollback()
             return jsonify({
                 "status": "error",
                 "message": "대상 댓글을 찾을 수 없습니다."
@@ -51,6 +128,7 @@ def create_sub_comment(post_id: int, comment_id: int):
         )
         scid_row = db.query("SELECT LAST_INSERT_ID()")
         db.commit()
+        on_comment_changed(post_id, comment_id)
 
         sub_comment_id = None
         if scid_row.result and len(scid_row.result[0]) > 0:
@@ -62,6 +140,11 @@ def create_sub_comment(post_id: int, comment_id: int):
             "sub_comment_id": sub_comment_id
         }), 201
     except Exception as e:
+        if db:
+            try:
+                db.rollback()
+            except Exception:
+                pass
         return jsonify({
             "status": "error",
             "message": "서버 오류가 발생했습니다.",
@@ -72,6 +155,12 @@ def create_sub_comment(post_id: int, comment_id: int):
 @post_bp.route('/api/posts/<int:post_id>/comments/<int:comment_id>/replies/', methods=['GET'])
 def list_sub_comments(post_id: int, comment_id: int):
     try:
+        version, modified_at = comment_version(comment_id)
+        etag = make_etag(version, 'replies', post_id)
+        cached_response = not_modified(etag, modified_at)
+        if cached_response is not None:
+            return cached_response
+
         db = DatabaseManager()
 
         comment_exists = db.query(
@@ -89,39 +178,22 @@ def list_sub_comments(post_id: int, comment_id: int):
             }), 404
 
         rows = db.query(
-            """
-            SELECT 
-                sc.sub_comment_id,
-                sc.student_id,
-                s.student_name,
-                sc.content,
-                sc.is_anonymous,
-                DATE_FORMAT(sc.created_at, '%%Y-%%m-%%d %%H:%%i:%%s') as created_at
+            f"""
+            SELECT {SUB_COMMENT_COLUMNS}
             FROM Sub_comments sc
-            LEFT JOIN Students s ON sc.student_id = s.student_id
             WHERE sc.comment_id = %(comment_id)s
             ORDER BY sc.created_at ASC
             """,
             comment_id=comment_id
         ).result
 
-        sub_comments = []
-        for r in rows:
-            (scid, s_student_id, s_student_name, s_content, s_is_anonymous, s_created_at) = r
-            s_anon = bool(s_is_anonymous)
-            sub_comments.append({
-                "sub_comment_id": scid,
-                "student_id": None if s_anon else s_student_id,
-                "student_name": "익명" if s_anon else s_student_name,
-                "content": s_content,
-                "is_anonymous": s_anon,
-                "created_at": s_created_at
-            })
+        names = StudentDirectory().names(r[1] for r in rows if not r[3])
+        sub_comments = [serialize_sub_comment_row(r, names) for r in rows]
 
-        return jsonify({
+        return with_validators(jsonify({
             "status": "success",
             "sub_comments": sub_comments
-        })
+        }), etag, modified_at)
     except Exception as e:
         return jsonify({
             "status": "error",
@@ -1,9 +1,15 @@
+import base64
+import binascii
+import hashlib
 import json
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional, Tuple
 
-from flask import jsonify, request, session
+from flask import Response, current_app, jsonify, request, session
+from werkzeug.datastructures import MultiDict
 
-from utils.database_util import DatabaseManager
+from utils.session_util import CLAIMS_KEY, issue_claims, read_claims
+from utils.student_directory_util import StudentDirectory
 
 
 def require_login() -> Tuple[Optional[int], Optional[Tuple[Any, int]]]:
@@ -14,18 +20,21 @@ def require_login() -> Tuple[Optional[int], Optional[Tuple[Any, int]]]:
             "message": "로그인이 필요합니다."
         }), 401)
 
-    db = DatabaseManager()
-    exists = db.query(
-        """
-        SELECT 1 FROM Students WHERE student_id = %(sid)s
-        """,
-        sid=sid
-    ).result
-    if not exists:
+    # 최근에 확인한 로그인 정보가 있으면 DB 조회 없이 통과
+    max_age = current_app.config.get('SESSION_CLAIMS_MAX_AGE', 600)
+    claims = read_claims(current_app, session.get(CLAIMS_KEY), max_age)
+    if claims is not None and claims.get("sid") == sid:
+        return sid, None
+
+    # 로그인 정보를 다시 발급하기 전에 DB에서 확인함 (삭제된 학생은 명부 전체 다시 읽기를 기다리지 않고 막힘)
+    student = StudentDirectory().verify(sid)
+    if student is None:
         return None, (jsonify({
             "status": "error",
             "message": "유효하지 않은 세션입니다. 다시 로그인해 주세요."
         }), 401)
+    student_name, is_admin = student
+    session[CLAIMS_KEY] = issue_claims(current_app, sid, student_name, is_admin)
     return sid, None
 
 
@@ -42,21 +51,28 @@ def to_bool(value: Any, default: bool = False) -> bool:
     return default
 
 
-def parse_request_payload() -> Dict[str, Any]:
-    data = request.get_json(silent=True)
-    if isinstance(data, dict):
-        return data
+def parse_request_payload(form: Optional[MultiDict] = None) -> Dict[str, Any]:
+    """
+    :param form: 직접 읽은 multipart 필드 (`receive_post_upload`), 없으면 `request`에서 읽음
+    """
+    streamed = form is not None
+    if not streamed:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            return data
 
-    content_type = (request.content_type or '').lower()
+        content_type = (request.content_type or '').lower()
+        if 'multipart/form-data' in content_type or request.form:
+            form = request.form
 
-    if 'multipart/form-data' in content_type or request.form:
-        form_dict = request.form.to_dict(flat=True)
+    if form:
+        form_dict = form.to_dict(flat=True)
 
         payload_candidates = []
-        if 'payload' in request.form:
-            payload_candidates.extend(request.form.getlist('payload'))
-        if '' in request.form:
-            payload_candidates.extend([value for value in request.form.getlist('') if value])
+        if 'payload' in form:
+            payload_candidates.extend(form.getlist('payload'))
+        if '' in form:
+            payload_candidates.extend([value for value in form.getlist('') if value])
 
         for candidate in payload_candidates:
             try:
@@ -70,7 +86,7 @@ def parse_request_payload() -> Dict[str, Any]:
         if cleaned:
             return cleaned
 
-    if request.data:
+    if not streamed and request.data:
         try:
             parsed = json.loads(request.data.decode('utf-8'))
             if isinstance(parsed, dict):
@@ -79,3 +95,59 @@ def parse_request_payload() -> Dict[str, Any]:
             pass
 
     return {}
+
+
+def encode_token(data: Dict[str, Any]) -> str:
+    raw = json.dumps(data, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_token(token: str) -> Optional[Dict[str, Any]]:
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except (ValueError, binascii.Error, UnicodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def encode_cursor(direction: str, post_id: int) -> str:
+    return encode_token({"d": direction, "id": post_id})
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[str, int]]:
+    data = decode_token(cursor)
+    try:
+        direction = data['d']
+        post_id = int(data['id'])
+    except (ValueError, TypeError, KeyError):
+        return None
+    if direction not in ('before', 'after'):
+        return None
+    return direction, post_id
+
+
+def make_etag(version: str, *parts: Any) -> str:
+    raw = "|".join([version] + [str(part) for part in parts])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
+
+
+def not_modified(etag: str, modified_at: float) -> Optional[Response]:
+    """
+    클라이언트가 가진 응답이 최신이면 304 응답을, 아니면 `None`을 반환함.
+    DB를 조회하기 전에 호출해야 의미가 있음.
+    `If-Modified-Since`는 초 단위라 같은 초 안의 변경을 구분하지 못하므로 보지 않고 `If-None-Match`만 비교함.
+    """
+    if not request.if_none_match or not request.if_none_match.contains(etag):
+        return None
+
+    response = Response(status=304)
+    return with_validators(response, etag, modified_at)
+
+
+def with_validators(response: Response, etag: str, modified_at: float) -> Response:
+    response.set_etag(etag)
+    response.last_modified = datetime.fromtimestamp(int(modified_at), tz=timezone.utc)
+    # 매번 재검증하도록 해서 변경이 바로 보이게 함 (변경이 없으면 304로 끝남)
+    response.cache_control.no_cache = True
+    return response
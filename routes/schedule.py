@@ -1,51 +1,72 @@
 from flask import Blueprint, request, jsonify
-import requests
 from datetime import datetime
-from utils.config_util     import ConfigManager as Config
+from utils.cache_util      import StaleWhileRevalidateCache
+from utils.config_util     import register_config_listener
+from utils.neis_util       import NeisClient, NeisError, STALE_HEADERS
 
 schedule_bp = Blueprint('schedule', __name__)
-Config().read_file("config.json")
 
-API_KEY = Config().get()["NICEAPI"]["KEY"]
-BASE_URL = Config().get()["NICEAPI"]["SCHEDULE"]
+# 달별 학사일정 캐시. 동시에 들어온 같은 달 요청은 NEIS를 한 번만 호출하고,
+# 오래된 일정은 바로 돌려주면서 백그라운드에서 다시 받아옴
+schedule_cache = StaleWhileRevalidateCache(fresh_ttl=600, stale_ttl=7 * 86400, max_size=64)
 
-DEFAULT_PARAMS = {
-    'KEY': API_KEY,
-    'Type': 'json',
-    'ATPT_OFCDC_SC_CODE': Config().get()["NICEAPI"]["SCHULSC"],
-    'SD_SCHUL_CODE': Config().get()["NICEAPI"]["SCHULC"]
-}
 
-def fetch_schedule_by_month(year: str, month: str):
+@schedule_bp.record_once
+def register_schedule_config(state) -> None:
+    register_config_listener(state.app, configure_schedule_cache)
+
+
+def configure_schedule_cache(config) -> None:
+    schedule_cache.configure(
+        fresh_ttl=config.get('SCHEDULE_FRESH_SECONDS'),
+        stale_ttl=config.get('SCHEDULE_STALE_SECONDS'),
+    )
+
+
+def load_schedule_month(year: str, month: str):
+    """
+    NEIS에서 한 달치 학사일정을 받아옴.
+    :return: 일정 딕셔너리의 리스트
+    :raise NeisError: 호출이 실패했거나 응답 형식이 잘못된 경우
+    """
     from_date = f"{year}{month}01"
     to_date = f"{year}{month}31"
 
-    params = DEFAULT_PARAMS.copy()
-    params['AA_FROM_YMD'] = from_date
-    params['AA_TO_YMD'] = to_date
-
-    response = requests.get(BASE_URL, params=params)
-    if response.status_code == 200:
-        try:
-            data = response.json()
-            rows = data['SchoolSchedule'][1]['row']
-            result = [
-                {
-                    '날짜': row['AA_YMD'],
-                    '행사명': row.get('EVENT_NM', ''),
-                    '행사내용': row.get('EVENT_CNTNT', '')
-                }
-                for row in rows
-            ]
-            return result
-        except (KeyError, IndexError):
+    data = NeisClient().get('SCHEDULE', AA_FROM_YMD=from_date, AA_TO_YMD=to_date)
+    try:
+        rows = data['SchoolSchedule'][1]['row']
+    except (KeyError, IndexError, TypeError):
+        # 일정이 없는 달은 {"RESULT": {"CODE": "INFO-200"}} 형태로 옴
+        if isinstance(data, dict) and data.get('RESULT', {}).get('CODE') == 'INFO-200':
             return []
-    else:
-        return []
+        raise NeisError("학사일정 응답 형식이 잘못되었습니다.")
+    try:
+        return [
+            {
+                '날짜': row['AA_YMD'],
+                '행사명': row.get('EVENT_NM', ''),
+                '행사내용': row.get('EVENT_CNTNT', '')
+            }
+            for row in rows
+        ]
+    except (KeyError, AttributeError):
+        raise NeisError("학사일정 응답 형식이 잘못되었습니다.")
+
+
+def fetch_schedule_by_month(year: str, month: str):
+    return fetch_schedule_with_state(year, month)[0]
+
+
+def fetch_schedule_with_state(year: str, month: str):
+    # NEIS가 실패하거나 서킷이 열려 있으면 마지막으로 받아둔 일정을 오래된 데이터로 표시해 돌려줌
+    try:
+        return schedule_cache.get_with_state((year, month), lambda: load_schedule_month(year, month))
+    except NeisError:
+        return [], False
 
 @schedule_bp.route("/schedule", methods = ['GET'])
 def get_schedule():
     year = request.args.get('year', datetime.now().strftime('%Y'))
     month = request.args.get('month', datetime.now().strftime('%m'))
-    result = fetch_schedule_by_month(year, month)
-    return jsonify(result)
+    result, stale = fetch_schedule_with_state(year, month)
+    return jsonify(result), 200, STALE_HEADERS if stale else {}
@@ -1,35 +1,37 @@
-from flask import Blueprint, request, jsonify
-import requests
+from flask import Blueprint, current_app, request, jsonify
 from datetime import datetime
-from utils.config_util     import ConfigManager as Config
+from utils.config_util     import register_config_listener
+from utils.neis_util       import NeisClient, NeisError, STALE_HEADERS
+from utils.timetable_cache_util import TimetableStore
 
 timetable_bp = Blueprint('timetable', __name__)
-config = Config()
-config.read_file("config.json")
+timetable_store = TimetableStore()
 
-API_KEY = config.get()["NICEAPI"]["KEY"]
-BASE_URL = config.get()["NICEAPI"]["TIMETABLE"]
 
-DEFAULT_PARAMS = {
-    'KEY': API_KEY,
-    'Type': 'json',
-    'ATPT_OFCDC_SC_CODE': config.get()["NICEAPI"]["SCHULSC"],
-    'SD_SCHUL_CODE': config.get()["NICEAPI"]["SCHULC"]
-}
+@timetable_bp.record_once
+def register_timetable_config(state) -> None:
+    register_config_listener(state.app, configure_timetable_store)
+
+
+def configure_timetable_store(config) -> None:
+    timetable_store.configure(refresh_minutes=config.get('TIMETABLE_REFRESH_MINUTES'))
+
+
+@timetable_bp.before_app_request
+def start_timetable_refresh() -> None:
+    # 워커 프로세스마다 첫 요청 때 시작함 (fork 전에 만든 스레드는 자식 프로세스로 넘어가지 않음)
+    if current_app.config.get('TIMETABLE_BACKGROUND_REFRESH') and not timetable_store.running:
+        timetable_store.start()
+
 
 def fetch_timetable(date: str, grade: str, class_nm: str):
-    params = DEFAULT_PARAMS.copy()
-    params['GRADE'] = grade
-    params['CLASS_NM'] = class_nm
-    params['TI_FROM_YMD'] = date
-    params['TI_TO_YMD'] = date
-
-    response = requests.get(BASE_URL, params=params)
-    if response.status_code != 200:
+    try:
+        data = NeisClient().get('TIMETABLE', GRADE=grade, CLASS_NM=class_nm,
+                                TI_FROM_YMD=date, TI_TO_YMD=date)
+    except NeisError:
         return {"data": [], "message": "시간표 API 요청 실패"}
 
     try:
-        data = response.json()
         print(data)
 
         # 정상 데이터
@@ -58,14 +60,32 @@ def fetch_timetable(date: str, grade: str, class_nm: str):
 
 
 
+def get_day_timetable(date: str, grade, class_nm):
+    return get_day_timetable_with_state(date, grade, class_nm)[0]
+
+
+def get_day_timetable_with_state(date: str, grade, class_nm):
+    # 전 학년/전 반 주간 시간표를 메모리에서 먼저 찾고, 불러오지 못했을 때만 NEIS에 직접 물어봄
+    result = timetable_store.get_day(date, grade, class_nm)
+    if result is None:
+        return fetch_timetable(date, grade, class_nm), False
+    return result, timetable_store.is_stale(date)
+
+
 @timetable_bp.route('/timetable', methods=['POST'])
 def get_timetable():
     payload = request.get_json(silent=True) or {}
     input_grade = payload.get('grade')
     input_class = payload.get('class')
-    date = datetime.now().strftime('%Y%m%d')
+    date = payload.get('date') or datetime.now().strftime('%Y%m%d')
+
+    if payload.get('view') == 'week':
+        result = timetable_store.get_week(date, input_grade, input_class)
+        if result is None:
+            return jsonify({"data": {}, "message": "시간표 API 요청 실패"}), 200
+        return jsonify(result), 200, STALE_HEADERS if timetable_store.is_stale(date) else {}
 
-    result = fetch_timetable(date, input_grade, input_class)
-    return jsonify(result), 200
+    result, stale = get_day_timetable_with_state(date, input_grade, input_class)
+    return jsonify(result), 200, STALE_HEADERS if stale else {}
 
-## date에서 CODE를 추출하고 그 값에 따라 뱉어내는 메시지가 달라야함
\ No newline at end of file
+## date에서 CODE를 추출하고 그 값에 따라 뱉어내는 메시지가 달라야함
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# `pytest`를 어디서 실행해도 `utils`, `routes`를 불러올 수 있도록 저장소 루트를 경로에 넣음
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,95 @@
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from urllib.parse import quote
+
+
+class FakeS3Error(Exception):
+    """
+    botocore `ClientError`처럼 `response["Error"]["Code"]`에 오류 코드를 담은 예외.
+    """
+    def __init__(self, code: str):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+class FakeS3Client:
+    """
+    `S3ImageStorage`가 쓰는 boto3 S3 클라이언트 메서드만 흉내 낸 메모리 저장소.
+    `now`를 바꿔 LastModified를 조절할 수 있음.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        self.now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.calls: Dict[str, int] = {}
+        self.fail_uploads: set = set()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def _object(self, key: str) -> Dict[str, Any]:
+        obj = self.objects.get(key)
+        if obj is None:
+            raise FakeS3Error("NoSuchKey")
+        return obj
+
+    def upload_file(self, filename: str, bucket: str, key: str, ExtraArgs: Optional[dict] = None,
+                    Config: Any = None) -> None:
+        self._count("upload_file")
+        if key in self.fail_uploads:
+            raise FakeS3Error("InternalError")
+        with open(filename, "rb") as f:
+            body = f.read()
+        with self._lock:
+            self.objects[key] = {"Body": body, "LastModified": self.now, **(ExtraArgs or {})}
+
+    def copy_object(self, Bucket: str, Key: str, CopySource: dict, MetadataDirective: str = "COPY", **extra) -> None:
+        self._count("copy_object")
+        with self._lock:
+            source = self._object(CopySource["Key"])
+            self.objects[Key] = {**source, **(extra if MetadataDirective == "REPLACE" else {}),
+                                 "LastModified": self.now}
+
+    def head_object(self, Bucket: str, Key: str) -> dict:
+        self._count("head_object")
+        return {k: v for k, v in self._object(Key).items() if k != "Body"}
+
+    def get_object(self, Bucket: str, Key: str) -> dict:
+        self._count("get_object")
+        return {"Body": _Body(self._object(Key)["Body"])}
+
+    def delete_objects(self, Bucket: str, Delete: dict) -> None:
+        self._count("delete_objects")
+        assert len(Delete["Objects"]) <= 1000
+        with self._lock:
+            for item in Delete["Objects"]:
+                self.objects.pop(item["Key"], None)
+
+    def generate_presigned_url(self, operation: str, Params: dict, ExpiresIn: int) -> str:
+        self._count("generate_presigned_url")
+        return f"https://s3.test/{Params['Bucket']}/{quote(Params['Key'])}?X-Amz-Expires={ExpiresIn}" \
+               f"&sig={self.calls['generate_presigned_url']}"
+
+    def get_paginator(self, operation: str) -> "_Paginator":
+        return _Paginator(self)
+
+
+class _Body:
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def read(self) -> bytes:
+        return self._data
+
+
+class _Paginator:
+    def __init__(self, client: FakeS3Client):
+        self.client = client
+
+    def paginate(self, Bucket: str, Prefix: str = ""):
+        keys = sorted(key for key in self.client.objects if key.startswith(Prefix))
+        for start in range(0, len(keys), 2):
+            yield {"Contents": [{"Key": key, "LastModified": self.client.objects[key]["LastModified"]}
+                                for key in keys[start:start + 2]]}
@@ -0,0 +1,82 @@
+from utils.cache_util import LRUCache, VersionRegistry
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("utils.cache_util.time.monotonic", lambda: now[0])
+    cache = LRUCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    now[0] += 10
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_cache_invalidate_tag():
+    cache = LRUCache(max_size=10, ttl=60)
+    cache.set("list:1", [1], tags=("posts",))
+    cache.set("post:1", {"id": 1}, tags=("posts", "post:1"))
+    cache.set("post:2", {"id": 2}, tags=("post:2",))
+    cache.invalidate_tag("posts")
+    assert cache.get("list:1") is None and cache.get("post:1") is None
+    assert cache.get("post:2") == {"id": 2}
+    assert "posts" not in cache._tags
+
+
+def test_lru_cache_skips_set_after_invalidation():
+    cache = LRUCache(max_size=10, ttl=60)
+    generation = cache.generation
+    cache.delete("post:1")  # 조회하는 사이 게시물이 바뀜
+    cache.set("post:1", "stale", generation=generation)
+    assert cache.get("post:1") is None
+    cache.set("post:1", "fresh", generation=cache.generation)
+    assert cache.get("post:1") == "fresh"
+
+
+def test_lru_cache_shrinks_on_configure():
+    cache = LRUCache(max_size=3, ttl=60)
+    for key in "abc":
+        cache.set(key, key)
+    cache.configure(max_size=1)
+    assert cache.stats()["size"] == 1
+    assert cache.get("c") == "c"
+
+
+def test_version_registry_tag_changes_on_bump(monkeypatch):
+    monkeypatch.setattr("utils.cache_util.time.time", lambda: 1000.0)
+    registry = VersionRegistry(max_age=30)
+    tag, _ = registry.tag("posts")
+    assert registry.tag("posts")[0] == tag
+    registry.bump("posts")
+    bumped, modified_at = registry.tag("posts")
+    assert bumped != tag
+    assert modified_at == 1000.0
+    # 다른 리소스의 변경은 영향을 주지 않음
+    other, _ = registry.tag("comments")
+    registry.bump("posts")
+    assert registry.tag("comments")[0] == other
+
+
+def test_version_registry_epoch_rolls_over(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("utils.cache_util.time.time", lambda: now[0])
+    registry = VersionRegistry(max_age=30)
+    tag, _ = registry.tag("posts")
+    now[0] += 30
+    rolled, modified_at = registry.tag("posts")
+    assert rolled != tag
+    assert modified_at == 1020.0
+
+
+def test_version_registries_differ_between_processes():
+    assert VersionRegistry().tag("posts")[0] != VersionRegistry().tag("posts")[0]
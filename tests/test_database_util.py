@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+from utils.database_util import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self, idx):
+        self.idx = idx
+        self.closed = False
+        self.rollbacks = 0
+        self.alive = True
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+    def ping(self, reconnect=False):
+        if not self.alive and not reconnect:
+            raise ConnectionError("gone")
+        self.alive = True
+
+
+class Factory:
+    def __init__(self):
+        self.created = []
+
+    def __call__(self):
+        conn = FakeConnection(len(self.created))
+        self.created.append(conn)
+        return conn
+
+
+def test_reuses_released_connection():
+    factory = Factory()
+    pool = ConnectionPool(factory, max_size=2, timeout=0.1)
+    conn = pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
+    assert len(factory.created) == 1
+    assert conn.rollbacks == 1
+
+
+def test_times_out_when_exhausted():
+    pool = ConnectionPool(Factory(), max_size=1, timeout=0.05)
+    pool.acquire()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_waiter_gets_released_connection():
+    pool = ConnectionPool(Factory(), max_size=1, timeout=2.0)
+    conn = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    pool.release(conn)
+    waiter.join(2.0)
+    assert got == [conn]
+
+
+def test_discard_closes_and_frees_slot():
+    factory = Factory()
+    pool = ConnectionPool(factory, max_size=1, timeout=0.05)
+    conn = pool.acquire()
+    pool.release(conn, discard=True)
+    assert conn.closed
+    assert pool.acquire() is not conn
+    assert pool.stats()["discarded"] == 1
+
+
+def test_factory_error_frees_slot():
+    def broken():
+        raise ConnectionError("db down")
+
+    pool = ConnectionPool(broken, max_size=1, timeout=0.05)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            pool.acquire()
+    assert pool.stats()["size"] == 0
+
+
+def test_stale_connection_is_pinged():
+    factory = Factory()
+    pool = ConnectionPool(factory, max_size=1, timeout=0.05, ping_interval=0)
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.alive = False
+    assert pool.acquire() is conn
+    assert pool.stats()["reconnects"] == 1
+
+
+def test_resize_closes_excess_idle_connections():
+    pool = ConnectionPool(Factory(), max_size=3, timeout=0.05)
+    conns = [pool.acquire() for _ in range(3)]
+    for conn in conns:
+        pool.release(conn)
+    pool.resize(1)
+    assert pool.stats()["size"] == 1
+    assert sum(conn.closed for conn in conns) == 2
+
+
+def test_closed_pool_closes_returned_connections():
+    pool = ConnectionPool(Factory(), max_size=2, timeout=0.05)
+    idle, busy = pool.acquire(), pool.acquire()
+    pool.release(idle)
+    pool.close()
+    assert idle.closed and not busy.closed
+    pool.release(busy)
+    assert busy.closed
+    assert pool.stats()["in_use"] == 0
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
@@ -0,0 +1,133 @@
+import hashlib
+from types import SimpleNamespace
+
+import pytest
+
+from routes.post.image_service import detach_post_images, save_post_images
+from routes.post.image_storage import image_storage
+from utils.upload_util import TEMP_PREFIX, StreamedFile
+
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 60
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 60
+
+
+@pytest.fixture
+def upload_dir(tmp_path):
+    image_storage.configure({'POST_IMAGE_UPLOAD_FOLDER': str(tmp_path), 'POST_IMAGE_STORAGE': {"Type": "local"}})
+    return tmp_path
+
+
+def streamed(upload_dir, idx, filename, content, ext, content_type):
+    path = upload_dir / f"{TEMP_PREFIX}{idx}.tmp"
+    path.write_bytes(content)
+    return StreamedFile("images", filename, path, ext=ext, content_type=content_type, size=len(content),
+                        sha256=hashlib.sha256(content).hexdigest())
+
+
+def test_duplicate_files_in_one_request_are_stored_once(upload_dir):
+    uploads = [
+        streamed(upload_dir, 0, "a.jpg", JPEG, "jpg", "image/jpeg"),
+        streamed(upload_dir, 1, "copy-of-a.jpg", JPEG, "jpg", "image/jpeg"),
+        streamed(upload_dir, 2, "b.png", PNG, "png", "image/png"),
+    ]
+
+    saved = save_post_images(uploads)
+
+    names = [img['stored_name'] for img in saved]
+    assert names[0] == names[1] != names[2]
+    assert [img['original_name'] for img in saved] == ["a.jpg", "copy-of-a.jpg", "b.png"]
+    digest = hashlib.sha256(JPEG).hexdigest()
+    assert names[0] == f"{digest[:2]}/{digest[2:4]}/{digest}.jpg"
+    assert sorted(path.relative_to(upload_dir).as_posix() for path in upload_dir.rglob('*') if path.is_file()) \
+        == sorted(set(names))
+
+
+def test_existing_blob_is_reused(upload_dir):
+    first = save_post_images([streamed(upload_dir, 0, "a.jpg", JPEG, "jpg", "image/jpeg")])
+    second = save_post_images([streamed(upload_dir, 1, "again.jpg", JPEG, "jpg", "image/jpeg")])
+
+    assert first[0]['stored_name'] == second[0]['stored_name']
+    assert not any(path.name.startswith(TEMP_PREFIX) for path in upload_dir.iterdir())
+
+
+class FakeImageDB:
+    """`detach_post_images`가 쓰는 쿼리만 흉내 내는 메모리 DB."""
+
+    def __init__(self, images, renditions, blobs):
+        self.images = list(images)          # (image_id, post_id, stored_name)
+        self.renditions = list(renditions)  # (image_id, variant, stored_name)
+        self.blobs = dict(blobs)            # stored_name -> ref_count
+
+    def query(self, sql, **kw):
+        values = set(kw.values())
+        if "FROM PostImages pi" in sql:
+            rows = [(image_id, name, name in self.blobs)
+                    for image_id, post_id, name in self.images if post_id == kw["post_id"]]
+        elif sql.lstrip().startswith("SELECT") and "FROM PostImageRenditions" in sql:
+            rows = [row for row in self.renditions if row[0] in values]
+        elif "DELETE FROM PostImageRenditions" in sql:
+            self.renditions = [row for row in self.renditions if row[0] not in values]
+            rows = []
+        elif "DELETE FROM PostImages" in sql:
+            self.images = [row for row in self.images if row[0] not in values]
+            rows = []
+        elif "SELECT stored_name FROM ImageBlobs" in sql:
+            rows = [(name,) for name in values if self.blobs.get(name, 0) > 0]
+        elif "DELETE FROM ImageBlobs" in sql:
+            self.blobs = {name: ref for name, ref in self.blobs.items() if name not in values or ref > 0}
+            rows = []
+        else:
+            raise AssertionError(f"예상하지 못한 쿼리: {sql}")
+        return SimpleNamespace(result=rows)
+
+    def query_many(self, sql, params):
+        assert "UPDATE ImageBlobs SET ref_count = ref_count - 1" in sql
+        for param in params:
+            if self.blobs.get(param["name"], 0) > 0:
+                self.blobs[param["name"]] -= 1
+
+
+SHARED = "aa/bb/shared.jpg"
+ONLY = "cc/dd/only.png"
+LEGACY = "0f8fad5b-d9cb-469f-a165-70867728950e.jpg"
+
+
+@pytest.fixture
+def image_db():
+    return FakeImageDB(
+        images=[(1, 10, SHARED), (2, 10, ONLY), (3, 10, LEGACY), (4, 20, SHARED)],
+        renditions=[(1, "thumb", "aa/bb/shared_thumb.webp"), (2, "thumb", "cc/dd/only_thumb.webp"),
+                    (3, "thumb", "legacy_thumb.webp"), (4, "thumb", "aa/bb/shared_thumb.webp")],
+        blobs={SHARED: 2, ONLY: 1},
+    )
+
+
+def test_detach_decrements_and_returns_last_references(image_db):
+    removable = detach_post_images(image_db, 10)
+
+    # 다른 게시물이 아직 쓰는 블롭은 참조 수만 내리고 반환하지 않음
+    assert image_db.blobs == {SHARED: 1}
+    assert sorted(removable) == sorted([ONLY, "cc/dd/only_thumb.webp", LEGACY, "legacy_thumb.webp"])
+    assert [row[0] for row in image_db.images] == [4]
+    assert [row[0] for row in image_db.renditions] == [4]
+
+
+def test_detach_returns_shared_blob_after_last_post(image_db):
+    detach_post_images(image_db, 10)
+    removable = detach_post_images(image_db, 20)
+
+    assert removable == [SHARED, "aa/bb/shared_thumb.webp"]
+    assert image_db.blobs == {}
+    assert image_db.images == []
+
+
+def test_same_blob_twice_in_one_post_is_released_twice():
+    db = FakeImageDB(images=[(1, 10, SHARED), (2, 10, SHARED)], renditions=[], blobs={SHARED: 2})
+
+    assert detach_post_images(db, 10) == [SHARED]
+    assert db.blobs == {}
+
+
+def test_detach_post_without_images(image_db):
+    assert detach_post_images(image_db, 99) == []
+    assert image_db.blobs == {SHARED: 2, ONLY: 1}
@@ -0,0 +1,124 @@
+from types import SimpleNamespace
+
+import pymysql
+import pytest
+
+from routes.post import like_service
+from routes.post.like_service import (
+    ER_DUP_ENTRY,
+    LikeCounterBuffer,
+    record_like,
+    toggle_like_row,
+)
+
+
+class FakeLikeDB:
+    """좋아요 쿼리만 흉내 내는 메모리 DB. 실행한 쿼리를 순서대로 기록함."""
+
+    def __init__(self, like_counts, likes=()):
+        self.like_counts = dict(like_counts)  # post_id -> like_count
+        self.likes = set(likes)               # (post_id, student_id)
+        self.queries = []
+        self.on_update = None
+        self.fail_update = False
+
+    def query(self, sql, **kw):
+        sql = " ".join(sql.split())
+        self.queries.append(sql.split(" ")[0])
+        key = (kw.get("post_id"), kw.get("sid"))
+        if sql.startswith("INSERT INTO PostLikes"):
+            if kw["post_id"] not in self.like_counts:
+                return SimpleNamespace(affected_rows=0, result=())
+            if key in self.likes:
+                raise pymysql.err.IntegrityError(ER_DUP_ENTRY, "Duplicate entry")
+            self.likes.add(key)
+            return SimpleNamespace(affected_rows=1, result=())
+        if sql.startswith("DELETE FROM PostLikes"):
+            self.likes.discard(key)
+            return SimpleNamespace(affected_rows=1, result=())
+        if sql.startswith("SELECT like_count FROM Posts"):
+            return SimpleNamespace(affected_rows=1, result=((self.like_counts[kw["post_id"]],),))
+        raise AssertionError(f"예상하지 못한 쿼리: {sql}")
+
+    def query_many(self, sql, rows):
+        if self.on_update:
+            self.on_update()
+        if self.fail_update:
+            raise RuntimeError("update failed")
+        for row in rows:
+            self.like_counts[row["post_id"]] = max(self.like_counts[row["post_id"]] + row["delta"], 0)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def release(self):
+        pass
+
+
+@pytest.fixture
+def db():
+    return FakeLikeDB({1: 10})
+
+
+@pytest.fixture
+def buffer(monkeypatch, db):
+    buf = LikeCounterBuffer()
+    buf.enabled = True
+    monkeypatch.setattr(like_service, "like_counter_buffer", buf)
+    monkeypatch.setattr(like_service, "DatabaseManager", lambda: db)
+    monkeypatch.setattr(like_service, "on_post_changed", lambda post_id: None)
+    return buf
+
+
+def test_toggle_checks_post_in_the_insert(db):
+    assert toggle_like_row(db, 1, 100) is True
+    assert db.queries == ["INSERT"]
+
+    assert toggle_like_row(db, 1, 100) is False
+    assert db.queries == ["INSERT", "INSERT", "DELETE"]
+    assert db.likes == set()
+
+
+def test_toggle_missing_post(db):
+    assert toggle_like_row(db, 2, 100) is None
+    assert db.likes == set()
+
+
+def test_write_behind_reads_like_count_once_per_flush(buffer, db):
+    counts = [record_like(db, 1, True), record_like(db, 1, True), record_like(db, 1, False)]
+
+    assert counts == [11, 12, 11]
+    assert db.queries.count("SELECT") == 1
+
+    buffer.flush()
+    assert db.like_counts[1] == 11
+    assert record_like(db, 1, True) == 12
+    assert db.queries.count("SELECT") == 2
+
+
+def test_pending_includes_batch_until_commit(buffer, db):
+    record_like(db, 1, True)
+    record_like(db, 1, True)
+    seen = []
+    db.on_update = lambda: seen.append(buffer.pending(1))
+
+    buffer.flush()
+
+    assert seen == [2]
+    assert buffer.pending(1) == 0
+    assert db.like_counts[1] == 12
+
+
+def test_failed_flush_keeps_batch_pending(buffer, db):
+    record_like(db, 1, True)
+    db.fail_update = True
+
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+
+    assert buffer.pending(1) == 1
+    assert record_like(db, 1, True) == 12
+    assert buffer.stats()["failures"] == 1
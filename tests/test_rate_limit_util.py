@@ -0,0 +1,89 @@
+import math
+
+import pytest
+
+from utils.rate_limit_util import RateLimiter, TokenBucket
+
+
+def test_token_bucket_burst_then_refill():
+    bucket = TokenBucket(per_minute=60, burst=3)
+    for _ in range(3):
+        assert bucket.wait_time("k", 0.0) == 0
+        bucket.take("k", 0.0)
+    assert bucket.wait_time("k", 0.0) == pytest.approx(1.0)
+    assert bucket.wait_time("k", 1.0) == 0
+    # 가득 찬 뒤에는 burst 이상 쌓이지 않음
+    assert bucket._tokens("k", 1000.0) == 3
+
+
+def test_token_bucket_zero_rate_never_refills():
+    bucket = TokenBucket(per_minute=0, burst=1)
+    bucket.take("k", 0.0)
+    assert math.isinf(bucket.wait_time("k", 1e9))
+
+
+def test_token_bucket_evicts_least_recently_used():
+    bucket = TokenBucket(per_minute=1, burst=2, max_keys=2)
+    bucket.take("a", 0.0)
+    bucket.take("b", 0.0)
+    bucket.take("a", 0.0)
+    bucket.take("c", 0.0)
+    assert list(bucket._buckets) == ["a", "c"]
+
+
+def test_token_bucket_drops_refilled_keys_first():
+    bucket = TokenBucket(per_minute=60, burst=1, max_keys=2)
+    bucket.take("old", 0.0)
+    bucket.take("busy", 9.5)
+    # "old"는 다시 가득 찼으므로 버려도 결과가 같음
+    assert bucket.take("new", 10.0, evict=False)
+    assert list(bucket._buckets) == ["busy", "new"]
+
+
+def test_token_bucket_without_evict_keeps_existing_keys():
+    bucket = TokenBucket(per_minute=1, burst=2, max_keys=1)
+    bucket.take("victim", 0.0)
+    assert not bucket.take("other", 1.0, evict=False)
+    assert list(bucket._buckets) == ["victim"]
+
+
+@pytest.fixture
+def limiter():
+    limiter = RateLimiter()
+    yield limiter
+    limiter.configure({})
+
+
+def test_rate_limiter_rejects_after_burst(limiter):
+    limiter.configure({"Endpoints": {"login": {"IP": {"PerMinute": 60, "Burst": 2}, "Student": None}}})
+    assert limiter.hit("login", ip="1.1.1.1") == 0
+    assert limiter.hit("login", ip="1.1.1.1") == 0
+    assert limiter.hit("login", ip="1.1.1.1") > 0
+    assert limiter.hit("login", ip="2.2.2.2") == 0
+    assert limiter.stats()["endpoints"]["login"]["rejected_ip"] == 1
+
+
+def test_rate_limiter_rejected_request_takes_no_tokens(limiter):
+    limiter.configure({"Endpoints": {"create_post": {"IP": {"PerMinute": 1, "Burst": 1},
+                                                     "Student": {"PerMinute": 1, "Burst": 5}}}})
+    assert limiter.hit("create_post", ip="ip", student=1) == 0
+    assert limiter.hit("create_post", ip="ip", student=1) > 0
+    # IP에서 거절된 요청은 학번 토큰을 쓰지 않음
+    assert limiter.hit("create_post", ip="other", student=1) == 0
+
+
+def test_unauthenticated_student_keys_do_not_evict_buckets(limiter):
+    limiter.configure({"MaxKeys": 2, "Endpoints": {"login": {"IP": {"PerMinute": 6000, "Burst": 1000},
+                                                             "Student": {"PerMinute": 1, "Burst": 2}}}})
+    assert limiter.hit("login", ip="a", student="victim", authenticated=False) == 0
+    for idx in range(10):
+        assert limiter.hit("login", ip="a", student=f"random-{idx}", authenticated=False) == 0
+    assert limiter.hit("login", ip="a", student="victim", authenticated=False) == 0
+    assert limiter.hit("login", ip="a", student="victim", authenticated=False) > 0
+    assert limiter.stats()["endpoints"]["login"]["untracked_student"] > 0
+
+
+def test_rate_limiter_disabled(limiter):
+    limiter.configure({"Enabled": False, "Endpoints": {"login": {"IP": {"PerMinute": 0, "Burst": 1}}}})
+    for _ in range(5):
+        assert limiter.hit("login", ip="1.1.1.1") == 0
@@ -0,0 +1,127 @@
+import os
+from datetime import timedelta
+
+import pytest
+
+from utils.storage_util import (
+    IMMUTABLE_CACHE_CONTROL,
+    ImageStorage,
+    LocalImageStorage,
+    S3ImageStorage,
+    build_image_storage,
+)
+
+from .fake_s3 import FakeS3Client
+
+
+@pytest.fixture
+def client():
+    return FakeS3Client()
+
+
+@pytest.fixture
+def storage(client):
+    return S3ImageStorage("bucket", prefix="posts", client=client, workers=4)
+
+
+def source(tmp_path, name, content=b"data"):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+def test_image_storage_is_abstract():
+    with pytest.raises(TypeError):
+        ImageStorage()
+
+
+def test_build_image_storage(tmp_path, client):
+    assert isinstance(build_image_storage(tmp_path, {}), LocalImageStorage)
+    storage = build_image_storage(tmp_path, {"Type": "s3", "Bucket": "b", "Prefix": "p/"}, client=client)
+    assert isinstance(storage, S3ImageStorage) and storage.client is client and storage.prefix == "p/"
+    with pytest.raises(ValueError):
+        build_image_storage(tmp_path, {"Type": "ftp"})
+
+
+def test_s3_put_get_and_reuse(tmp_path, client, storage):
+    assert storage.put("ab/x.jpg", source(tmp_path, "a"), "image/jpeg")
+    obj = client.objects["posts/ab/x.jpg"]
+    assert (obj["ContentType"], obj["CacheControl"]) == ("image/jpeg", IMMUTABLE_CACHE_CONTROL)
+    assert storage.get("ab/x.jpg") == b"data"
+
+    # 같은 이름이면 올리지 않고 수정 시각만 갱신함 (gc-images가 지우지 않도록)
+    client.now += timedelta(days=2)
+    second = source(tmp_path, "b")
+    assert not storage.put("ab/x.jpg", second, "image/jpeg")
+    assert not second.exists()
+    assert client.calls["upload_file"] == 1
+    assert storage.modified("ab/x.jpg") == client.now.timestamp()
+    assert client.objects["posts/ab/x.jpg"]["Body"] == b"data"
+
+
+def test_s3_missing_names(storage):
+    with pytest.raises(FileNotFoundError):
+        storage.get("nope.jpg")
+    assert storage.modified("nope.jpg") is None
+    storage.delete(["nope.jpg"])
+
+
+def test_s3_put_many_keeps_uploaded_files_on_failure(tmp_path, client, storage):
+    client.fail_uploads.add("posts/c.jpg")
+    items = [(name, source(tmp_path, name, name.encode()), "image/jpeg") for name in ("a.jpg", "b.jpg", "c.jpg")]
+    with pytest.raises(Exception):
+        storage.put_many(items)
+    # 다른 요청이 같은 내용을 쓰고 있을 수 있으므로 지우지 않음
+    assert sorted(client.objects) == ["posts/a.jpg", "posts/b.jpg"]
+
+
+def test_s3_put_many(tmp_path, client, storage):
+    items = [(f"{idx}.jpg", source(tmp_path, str(idx)), "image/jpeg") for idx in range(6)]
+    assert storage.put_many(items) == [True] * 6
+    assert len(client.objects) == 6
+
+
+def test_s3_delete_in_batches(client, storage):
+    for idx in range(2500):
+        client.objects[f"posts/{idx}.jpg"] = {"Body": b"", "LastModified": client.now}
+    storage.delete([f"{idx}.jpg" for idx in range(2500)] + ["0.jpg"])
+    assert client.objects == {}
+    assert client.calls["delete_objects"] == 3
+
+
+def test_s3_iter_files_strips_prefix(tmp_path, client, storage):
+    for name in ("a.jpg", "b/c.jpg", "d.webp"):
+        storage.put(name, source(tmp_path, name.replace("/", "_")), "image/jpeg")
+    client.objects["other/e.jpg"] = {"Body": b"", "LastModified": client.now}
+    assert sorted(name for name, _ in storage.iter_files()) == ["a.jpg", "b/c.jpg", "d.webp"]
+
+
+def test_s3_presigned_url_is_stable_within_window(client, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("utils.storage_util.time.time", lambda: now[0])
+    storage = S3ImageStorage("bucket", client=client, presign_seconds=3600, presign_window=600)
+    first = storage.url("a.jpg")
+    assert "X-Amz-Expires=4200" in first
+    now[0] = 1199.0
+    assert storage.url("a.jpg") == first
+    assert storage.url("b.jpg") != first
+    now[0] = 1200.0
+    assert storage.url("a.jpg") != first
+
+
+def test_s3_public_base_url(client):
+    storage = S3ImageStorage("bucket", prefix="posts/", client=client, public_base_url="https://cdn.test/")
+    assert storage.url("ab/x.jpg") == "https://cdn.test/posts/ab/x.jpg"
+    assert "generate_presigned_url" not in client.calls
+
+
+def test_local_put_reuse_refreshes_mtime(tmp_path):
+    root = tmp_path / "store"
+    storage = LocalImageStorage(root)
+    assert storage.put("ab/x.jpg", source(tmp_path, "a"), "image/jpeg")
+    path = root / "ab/x.jpg"
+    os.utime(path, (0, 0))
+    assert not storage.put("ab/x.jpg", source(tmp_path, "b", b"other"), "image/jpeg")
+    assert storage.modified("ab/x.jpg") > 0
+    assert path.read_bytes() == b"data"
+    assert storage.local_path("../escape") is None
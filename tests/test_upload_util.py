@@ -0,0 +1,139 @@
+import io
+
+import pytest
+
+from utils.upload_util import (
+    TEMP_PREFIX,
+    MultipartImageReceiver,
+    UploadRejected,
+    sniff_image_type,
+)
+
+BOUNDARY = b"testboundary"
+
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 60
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 60
+GIF = b"GIF89a" + b"\x00" * 60
+WEBP = b"RIFF\x00\x00\x00\x00WEBPVP8 " + b"\x00" * 60
+
+
+def multipart(*parts) -> bytes:
+    """
+    :param parts: `(이름, 값)` 필드 또는 `(이름, 파일명, 내용)` 파일
+    """
+    body = b""
+    for part in parts:
+        body += b"--" + BOUNDARY + b"\r\n"
+        if len(part) == 2:
+            name, value = part
+            body += f'Content-Disposition: form-data; name="{name}"\r\n\r\n'.encode() + value.encode() + b"\r\n"
+        else:
+            name, filename, content = part
+            body += (f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f'Content-Type: application/octet-stream\r\n\r\n').encode() + content + b"\r\n"
+    return body + b"--" + BOUNDARY + b"--\r\n"
+
+
+def temp_files(upload_dir):
+    return [path for path in upload_dir.iterdir() if path.name.startswith(TEMP_PREFIX)]
+
+
+@pytest.mark.parametrize("head, expected", [
+    (JPEG, ("jpg", "image/jpeg")),
+    (PNG, ("png", "image/png")),
+    (GIF, ("gif", "image/gif")),
+    (WEBP, ("webp", "image/webp")),
+    (b"\x00\x00\x00\x00WEBPVP8 ", None),  # RIFF 없이 WEBP만 있음
+    (b"<svg xmlns=", None),
+    (b"", None),
+])
+def test_sniff_image_type(head, expected):
+    assert sniff_image_type(head[:12]) == expected
+
+
+def test_receive_fields_and_files(tmp_path):
+    receiver = MultipartImageReceiver(tmp_path, max_file_bytes=1024)
+    body = multipart(("title", "제목"), ("images", "a.jpg", JPEG), ("images", "b.png", PNG))
+
+    fields, files = receiver.receive(io.BytesIO(body), BOUNDARY)
+
+    assert fields["title"] == "제목"
+    assert [(f.filename, f.ext, f.content_type, f.size) for f in files] == [
+        ("a.jpg", "jpg", "image/jpeg", len(JPEG)),
+        ("b.png", "png", "image/png", len(PNG)),
+    ]
+    assert files[0].temp_path.read_bytes() == JPEG
+    assert len(files[0].sha256) == 64
+
+
+def test_spoofed_extension_uses_content(tmp_path):
+    receiver = MultipartImageReceiver(tmp_path, allowed_exts={"jpg", "png"})
+    _, files = receiver.receive(io.BytesIO(multipart(("images", "photo.jpg", PNG))), BOUNDARY)
+    assert (files[0].ext, files[0].content_type) == ("png", "image/png")
+
+
+def test_non_image_with_image_extension_is_rejected(tmp_path):
+    receiver = MultipartImageReceiver(tmp_path)
+    body = multipart(("images", "a.jpg", JPEG), ("images", "evil.png", b"<?php echo 1; ?>" * 4))
+    with pytest.raises(UploadRejected):
+        receiver.receive(io.BytesIO(body), BOUNDARY)
+    assert temp_files(tmp_path) == []
+
+
+def test_disallowed_type_is_rejected(tmp_path):
+    receiver = MultipartImageReceiver(tmp_path, allowed_exts={"jpg", "jpeg"})
+    with pytest.raises(UploadRejected):
+        receiver.receive(io.BytesIO(multipart(("images", "a.gif", GIF))), BOUNDARY)
+    assert temp_files(tmp_path) == []
+
+
+def test_oversize_file_is_rejected(tmp_path):
+    receiver = MultipartImageReceiver(tmp_path, max_file_bytes=len(JPEG) - 1)
+    with pytest.raises(UploadRejected):
+        receiver.receive(io.BytesIO(multipart(("images", "a.jpg", JPEG))), BOUNDARY)
+    assert temp_files(tmp_path) == []
+
+
+def test_file_at_size_limit_is_accepted(tmp_path):
+    receiver = MultipartImageReceiver(tmp_path, max_file_bytes=len(JPEG))
+    _, files = receiver.receive(io.BytesIO(multipart(("images", "a.jpg", JPEG))), BOUNDARY)
+    assert files[0].size == len(JPEG)
+
+
+def test_oversize_fields_are_rejected(tmp_path):
+    receiver = MultipartImageReceiver(tmp_path, max_field_bytes=16)
+    with pytest.raises(UploadRejected):
+        receiver.receive(io.BytesIO(multipart(("content", "x" * 64))), BOUNDARY)
+
+
+def test_truncated_body_is_rejected(tmp_path):
+    receiver = MultipartImageReceiver(tmp_path)
+    body = multipart(("images", "a.jpg", JPEG * 4))
+    with pytest.raises(UploadRejected):
+        receiver.receive(io.BytesIO(body[:len(body) // 2]), BOUNDARY)
+    assert temp_files(tmp_path) == []
+
+
+def test_part_shorter_than_sniff_bytes(tmp_path):
+    receiver = MultipartImageReceiver(tmp_path)
+    # 판별에 필요한 12바이트보다 짧아도 끝난 뒤 앞부분으로 판별함
+    _, files = receiver.receive(io.BytesIO(multipart(("images", "tiny.jpg", b"\xff\xd8\xff\xd9"))), BOUNDARY)
+    assert (files[0].ext, files[0].size) == ("jpg", 4)
+
+    with pytest.raises(UploadRejected):
+        receiver.receive(io.BytesIO(multipart(("images", "tiny.webp", b"RIFF\x00\x00"))), BOUNDARY)
+    assert temp_files(tmp_path) == [files[0].temp_path]
+
+
+def test_empty_file_input_is_skipped(tmp_path):
+    receiver = MultipartImageReceiver(tmp_path)
+    _, files = receiver.receive(io.BytesIO(multipart(("images", "", b""))), BOUNDARY)
+    assert files == []
+
+
+def test_small_reads_match_single_read(tmp_path, monkeypatch):
+    monkeypatch.setattr("utils.upload_util.CHUNK_SIZE", 5)
+    receiver = MultipartImageReceiver(tmp_path)
+    _, files = receiver.receive(io.BytesIO(multipart(("images", "a.webp", WEBP))), BOUNDARY)
+    assert files[0].ext == "webp"
+    assert files[0].temp_path.read_bytes() == WEBP
@@ -0,0 +1,386 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+
+class LRUCache:
+    """
+    크기 제한과 만료 시간(TTL)이 있는 스레드 안전 LRU 캐시.
+    항목마다 태그를 붙여 두고 태그 단위로 무효화할 수 있음.
+    """
+    def __init__(self, max_size: int = 256, ttl: float = 30.0):
+        """
+        :param max_size: 최대 항목 수 (넘으면 가장 오래 안 쓴 항목부터 제거)
+        :param ttl: 항목 유지 시간(초)
+        """
+        self.max_size = max(1, int(max_size))
+        self.ttl      = float(ttl)
+
+        self._lock  = threading.Lock()
+        self._data: "OrderedDict[Hashable, Tuple[Any, float, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._generation = 0
+
+        self.hits          = 0
+        self.misses        = 0
+        self.evictions     = 0
+        self.invalidations = 0
+
+    def configure(self, max_size: Optional[int] = None, ttl: Optional[float] = None) -> None:
+        """
+        크기와 TTL을 바꿈. 크기가 줄어들면 넘치는 항목은 바로 제거됨.
+        """
+        with self._lock:
+            if max_size is not None:
+                self.max_size = max(1, int(max_size))
+            if ttl is not None:
+                self.ttl = float(ttl)
+            self._shrink()
+
+    @property
+    def generation(self) -> int:
+        """
+        무효화가 일어날 때마다 증가하는 값.
+        조회 시작 전에 읽어 두었다가 `set`에 넘기면, 그 사이 무효화된 결과는 저장되지 않음.
+        """
+        with self._lock:
+            return self._generation
+
+    def get(self, key: Hashable) -> Any:
+        """
+        :return: 캐시된 값, 없거나 만료됐으면 `None`
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = (),
+            generation: Optional[int] = None) -> None:
+        """
+        :param key: 캐시 키
+        :param value: 저장할 값
+        :param tags: 무효화에 쓸 태그들
+        :param generation: `generation` 값. 그 뒤로 무효화가 있었다면 저장하지 않음
+        """
+        tags = tuple(tags)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, time.monotonic() + self.ttl, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            self._shrink()
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            if key in self._data:
+                self._remove(key)
+                self.invalidations += 1
+
+    def invalidate_tag(self, tag: str) -> None:
+        """
+        해당 태그가 붙은 항목을 모두 제거함.
+        """
+        with self._lock:
+            self._generation += 1
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._data)
+            self._data.clear()
+            self._tags.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        적중/실패 횟수 등 캐시 통계를 반환함.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size":          len(self._data),
+                "max_size":      self.max_size,
+                "ttl":           self.ttl,
+                "hits":          self.hits,
+                "misses":        self.misses,
+                "hit_rate":      (self.hits / lookups) if lookups else 0.0,
+                "evictions":     self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, tags = self._data.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def _shrink(self) -> None:
+        while len(self._data) > self.max_size:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+
+class VersionRegistry:
+    """
+    리소스별 버전 번호와 마지막 변경 시각을 기록하는 클래스. ETag/Last-Modified 생성에 사용.
+    버전은 프로세스마다 따로 관리되므로, 다른 워커에서 일어난 변경도 `max_age`초 안에는
+    반영되도록 주기(epoch)가 바뀔 때마다 모든 태그가 새 값이 됨.
+    """
+    def __init__(self, max_age: float = 30.0):
+        """
+        :param max_age: 버전 태그 하나가 유효한 최대 시간(초)
+        """
+        self.max_age = float(max_age)
+        self._token = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._versions: Dict[str, Tuple[int, float]] = {}
+        self._started_at = time.time()
+
+    def bump(self, *keys: str) -> None:
+        """
+        리소스가 바뀌었음을 기록함.
+        """
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                version, _ = self._versions.get(key, (0, now))
+                self._versions[key] = (version + 1, now)
+
+    def tag(self, *keys: str) -> Tuple[str, float]:
+        """
+        여러 리소스의 버전을 합친 태그와 마지막 변경 시각을 반환함.
+        :return: (태그 문자열, 마지막 변경 시각 UNIX timestamp)
+        """
+        now = time.time()
+        epoch = int(now // self.max_age) if self.max_age > 0 else 0
+        epoch_started_at = epoch * self.max_age
+        with self._lock:
+            parts = [self._token, str(epoch)]
+            modified_at = max(self._started_at, epoch_started_at)
+            for key in keys:
+                version, changed_at = self._versions.get(key, (0, self._started_at))
+                parts.append(f"{key}={version}")
+                modified_at = max(modified_at, changed_at)
+        return ":".join(parts), modified_at
+
+
+class _Call:
+    def __init__(self):
+        self.done   = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    같은 키에 대한 동시 호출을 하나로 합치는 클래스.
+    먼저 들어온 호출만 실제로 함수를 실행하고, 그동안 들어온 호출은 그 결과(또는 예외)를 함께 받음.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+        self.executions = 0
+        self.shared     = 0
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        :param key: 호출을 합칠 기준 키
+        :param func: 실행할 함수
+        :return: 함수의 반환값
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def do_background(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> bool:
+        """
+        같은 키의 호출이 진행 중이 아니면 백그라운드 스레드에서 함수를 실행함.
+        :return: 새로 시작했으면 `True`, 이미 진행 중이면 `False`
+        """
+        with self._lock:
+            if key in self._calls:
+                return False
+            call = _Call()
+            self._calls[key] = call
+            self.executions += 1
+
+        def run():
+            try:
+                call.result = func(*args, **kwargs)
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        threading.Thread(target=run, name="single-flight", daemon=True).start()
+        return True
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class StaleWhileRevalidateCache:
+    """
+    외부 API 응답용 캐시. `fresh_ttl` 동안은 그대로 돌려주고, 그 뒤 `stale_ttl` 동안은
+    마지막으로 받은 값을 바로 돌려주면서 백그라운드에서 한 번만 다시 받아옴.
+    캐시에 없는 키를 동시에 요청하면 원본 호출은 한 번만 일어남.
+    """
+    def __init__(self, fresh_ttl: float = 300.0, stale_ttl: float = 86400.0, max_size: int = 256):
+        """
+        :param fresh_ttl: 다시 받아오지 않고 그대로 쓰는 시간(초)
+        :param stale_ttl: `fresh_ttl`이 지난 뒤에도 오래된 값을 돌려줄 수 있는 시간(초)
+        :param max_size: 최대 항목 수
+        """
+        self.fresh_ttl = float(fresh_ttl)
+        self.stale_ttl = float(stale_ttl)
+        self.max_size  = max(1, int(max_size))
+
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._flight = SingleFlight()
+
+        self.hits           = 0
+        self.stale_hits     = 0
+        self.misses         = 0
+        self.refresh_errors = 0
+
+    def configure(self, fresh_ttl: Optional[float] = None, stale_ttl: Optional[float] = None,
+                  max_size: Optional[int] = None) -> None:
+        with self._lock:
+            if fresh_ttl is not None:
+                self.fresh_ttl = float(fresh_ttl)
+            if stale_ttl is not None:
+                self.stale_ttl = float(stale_ttl)
+            if max_size is not None:
+                self.max_size = max(1, int(max_size))
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        캐시된 값을 반환함. 없으면 `loader`를 (키마다 한 번만) 호출해 받아옴.
+        `loader`는 실패했을 때 예외를 던져야 하며, 그 경우 남아 있는 예전 값이 있으면 그 값을 반환함.
+        :param key: 캐시 키
+        :param loader: 원본 데이터를 받아오는 함수
+        :return: 캐시된 값 또는 새로 받아온 값
+        """
+        return self.get_with_state(key, loader)[0]
+
+    def get_with_state(self, key: Hashable, loader: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        `get`과 같지만 돌려준 값이 `fresh_ttl`이 지난 오래된 값인지도 함께 반환함.
+        :return: (값, 오래된 값인지 여부)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+                age = now - entry[1]
+                if age < self.fresh_ttl:
+                    self.hits += 1
+                    return entry[0], False
+                if age < self.fresh_ttl + self.stale_ttl:
+                    self.stale_hits += 1
+                    stale = True
+                else:
+                    self.misses += 1
+                    stale = False
+            else:
+                self.misses += 1
+                stale = False
+
+        if stale:
+            self._flight.do_background(key, self._load, key, loader)
+            return entry[0], True
+
+        try:
+            return self._flight.do(key, self._load, key, loader), False
+        except Exception:
+            # 원본이 실패하면 만료된 값이라도 돌려줌
+            if entry is not None:
+                return entry[0], True
+            raise
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size":           len(self._data),
+                "max_size":       self.max_size,
+                "fresh_ttl":      self.fresh_ttl,
+                "stale_ttl":      self.stale_ttl,
+                "hits":           self.hits,
+                "stale_hits":     self.stale_hits,
+                "misses":         self.misses,
+                "refresh_errors": self.refresh_errors,
+                "upstream_calls": self._flight.executions,
+                "coalesced":      self._flight.shared,
+                "in_flight":      self._flight.in_flight(),
+            }
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        try:
+            value = loader()
+        except Exception:
+            with self._lock:
+                self.refresh_errors += 1
+            raise
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+        return value
@@ -1,21 +1,207 @@
+import logging
+import os
+import signal
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, List, Mapping, Optional, Tuple
+
 from utils.json_util import read_json
 
+logger = logging.getLogger(__name__)
+
+# 설정 파일에 꼭 있어야 하는 항목 (섹션, 키)
+REQUIRED_KEYS: Tuple[Tuple[str, str], ...] = (
+    ("Session", "Key"),
+    ("Session", "Type"),
+    ("Database", "Host"),
+    ("Database", "Username"),
+    ("Database", "Password"),
+    ("NICEAPI", "KEY"),
+    ("NICEAPI", "SCHULSC"),
+    ("NICEAPI", "SCHULC"),
+)
+
+ConfigListener = Callable[[Mapping[str, Any], Optional[Mapping[str, Any]]], None]
+
+# 설정이 바뀌면 다시 호출할 함수 목록을 저장하는 `app.extensions` 키
+APP_CONFIG_LISTENERS = "config_listeners"
+
+
+class ConfigError(ValueError):
+    """
+    설정 파일을 읽을 수 없거나 형식이 잘못되었을 때 발생하는 예외.
+    """
+
+
+def freeze(value: Any) -> Any:
+    """
+    JSON 값을 바꿀 수 없는 형태로 변환함. (dict -> MappingProxyType, list -> tuple)
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def validate_config(config: Any) -> None:
+    """
+    :raise ConfigError: 필수 항목이 없거나 형식이 잘못된 경우
+    """
+    if not isinstance(config, dict):
+        raise ConfigError("설정 파일의 최상위는 객체여야 합니다.")
+    for section, key in REQUIRED_KEYS:
+        if not isinstance(config.get(section), dict) or key not in config[section]:
+            raise ConfigError(f"필수 설정이 없습니다: {section}.{key}")
+
 
 class __ConfigManager(type):
     __instances = {}
-    
+
     def __call__(cls, *args, **kwargs):
         if cls not in cls.__instances:
             instance = super().__call__(*args, **kwargs)
             cls.__instances[cls] = instance
         return cls.__instances[cls]
-    
-    
+
+
 class ConfigManager(metaclass=__ConfigManager):
+    """
+    설정 파일을 읽어 바꿀 수 없는 스냅샷으로 보관하는 클래스.
+    파일이 바뀌면 다시 읽어 검증한 뒤 스냅샷을 통째로 교체하고, 구독자에게 알림.
+    검증에 실패하면 기존 스냅샷을 그대로 유지함.
+    """
+    def __init__(self):
+        self.__config: Optional[Mapping[str, Any]] = None
+        self.__path: Optional[str] = None
+        self.__stamp: Optional[Tuple[int, int]] = None
+        self.__lock = threading.Lock()
+        self.__listeners: List[ConfigListener] = []
+        self.__thread: Optional[threading.Thread] = None
+        self.__stop = threading.Event()
+        self.version = 0
+
     def read_file(self, config_file_path: str):
-        self.__config = read_json(config_file_path)
-        
-    def get(self):
+        """
+        설정 파일을 읽음.
+        :raise ConfigError: 파일을 읽을 수 없거나 형식이 잘못된 경우
+        """
+        with self.__lock:
+            self.__path = config_file_path
+            snapshot, stamp = self.__load()
+            self.__config, self.__stamp = snapshot, stamp
+            self.version += 1
+
+    def get(self) -> Mapping[str, Any]:
         return self.__config
-    
-    
\ No newline at end of file
+
+    def subscribe(self, listener: ConfigListener) -> None:
+        """
+        설정이 다시 로드될 때마다 `listener(새 스냅샷, 이전 스냅샷)`을 호출하도록 등록함.
+        """
+        with self.__lock:
+            self.__listeners.append(listener)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        설정 파일이 바뀌었으면 다시 읽어 스냅샷을 교체하고 구독자에게 알림.
+        :param force: 파일 수정 시각이 같아도 다시 읽을지 여부
+        :return: 새 스냅샷으로 교체했으면 `True`
+        """
+        with self.__lock:
+            if self.__path is None:
+                return False
+            try:
+                stamp = self.__file_stamp()
+                if not force and stamp == self.__stamp:
+                    return False
+                # 잘못된 파일이어도 파일이 다시 바뀌기 전까지는 반복해서 읽지 않도록 먼저 기록
+                self.__stamp = stamp
+                snapshot, self.__stamp = self.__load()
+            except ConfigError as e:
+                logger.warning("설정 다시 읽기 실패, 기존 설정 유지: %s", e)
+                return False
+
+            if snapshot == self.__config:
+                return False
+            old, self.__config = self.__config, snapshot
+            self.version += 1
+            listeners = list(self.__listeners)
+
+        for listener in listeners:
+            try:
+                listener(snapshot, old)
+            except Exception:
+                logger.exception("설정 변경 반영 실패 (%s)", getattr(listener, '__name__', listener))
+        return True
+
+    @property
+    def watching(self) -> bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def start_watching(self, interval: float = 2.0) -> None:
+        """
+        설정 파일의 수정 시각을 `interval`초마다 확인하는 백그라운드 스레드를 시작함.
+        """
+        if self.watching:
+            return
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__watch, args=(max(0.2, float(interval)),),
+                                         name="config-watch", daemon=True)
+        self.__thread.start()
+
+    def stop_watching(self) -> None:
+        self.__stop.set()
+
+    def install_signal_handler(self, signal_name: str = "SIGHUP") -> bool:
+        """
+        시그널을 받으면 설정을 다시 읽도록 함. 메인 스레드에서만 설치할 수 있음.
+        :return: 설치했으면 `True`
+        """
+        signum = getattr(signal, signal_name, None)
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            return False
+        # 시그널 핸들러 안에서 잠금을 잡지 않도록 별도 스레드에서 다시 읽음
+        signal.signal(signum, lambda *_: threading.Thread(target=self.reload, kwargs={"force": True},
+                                                          daemon=True).start())
+        return True
+
+    def __watch(self, interval: float) -> None:
+        while not self.__stop.wait(interval):
+            try:
+                self.reload()
+            except Exception:
+                logger.exception("설정 파일 감시 중 오류")
+
+    def __file_stamp(self) -> Tuple[int, int]:
+        try:
+            stat = os.stat(self.__path)
+        except OSError as e:
+            raise ConfigError(f"설정 파일을 읽을 수 없습니다: {e}") from e
+        return stat.st_mtime_ns, stat.st_size
+
+    def __load(self) -> Tuple[Mapping[str, Any], Tuple[int, int]]:
+        stamp = self.__file_stamp()
+        try:
+            data = read_json(self.__path)
+        except (OSError, ValueError) as e:
+            raise ConfigError(f"설정 파일을 읽을 수 없습니다: {e}") from e
+        validate_config(data)
+        return freeze(data), stamp
+
+
+def register_config_listener(app, listener: Callable[[Mapping[str, Any]], None]) -> None:
+    """
+    `listener(app.config)`를 지금 한 번 호출하고, 설정이 다시 로드될 때마다 다시 호출하도록 등록함.
+    블루프린트의 `record_once`에서 캐시/저장소 설정을 반영할 때 사용.
+    """
+    app.extensions.setdefault(APP_CONFIG_LISTENERS, []).append(listener)
+    listener(app.config)
+
+
+def notify_config_listeners(app) -> None:
+    for listener in app.extensions.get(APP_CONFIG_LISTENERS, ()):
+        try:
+            listener(app.config)
+        except Exception:
+            logger.exception("설정 변경 반영 실패 (%s)", getattr(listener, '__name__', listener))
@@ -1,5 +1,8 @@
+import os
+import threading
+import time
 from dataclasses import dataclass
-from typing import Any, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import pymysql
 
@@ -8,10 +11,204 @@ import pymysql
 class QueryResult:
     affected_rows: Optional[int]
     result: Any
+    last_insert_id: Optional[int] = None
+
+
+class PoolTimeoutError(Exception):
+    """
+    풀에서 정해진 시간 안에 연결을 얻지 못했을 때 발생하는 예외.
+    """
+
+
+class ConnectionPool:
+    """
+    크기가 제한된 `pymysql` 연결 풀.
+    여러 스레드가 동시에 연결을 빌리고 반납할 수 있음.
+    """
+    def __init__(self, factory: Callable[[], pymysql.connections.Connection],
+                 max_size: int = 10, timeout: float = 10.0, ping_interval: float = 30.0):
+        """
+        :param factory: 새 연결을 만드는 함수
+        :param max_size: 동시에 열어둘 수 있는 최대 연결 수
+        :param timeout: 연결을 기다리는 최대 시간(초)
+        :param ping_interval: 이 시간(초) 이상 쉬었던 연결은 빌려주기 전에 ping으로 확인
+        """
+        self._factory       = factory
+        self._max_size      = max(1, int(max_size))
+        self._timeout       = timeout
+        self._ping_interval = ping_interval
+
+        self._cond    = threading.Condition()
+        self._idle: List[tuple] = []  # (연결, 반납 시각)
+        self._created = 0
+        self._in_use  = 0
+        self._closed  = False
+
+        self._checkouts     = 0
+        self._wait_total    = 0.0
+        self._wait_max      = 0.0
+        self._timeouts      = 0
+        self._reconnects    = 0
+        self._discarded     = 0
+
+    def acquire(self) -> pymysql.connections.Connection:
+        """
+        풀에서 연결을 하나 빌림. 여유가 없으면 `timeout`초까지 기다림.
+        :return: 사용 가능한 연결
+        """
+        started  = time.monotonic()
+        deadline = started + self._timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeoutError("연결 풀이 닫혀 있습니다.")
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                    break
+                if self._created < self._max_size:
+                    self._created += 1
+                    conn, released_at = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(f"{self._timeout:.1f}초 안에 DB 연결을 얻지 못했습니다.")
+                self._cond.wait(remaining)
+
+            self._in_use += 1
+
+        try:
+            if conn is None:
+                conn = self._factory()
+            elif time.monotonic() - released_at >= self._ping_interval:
+                conn = self._check(conn)
+        except Exception:
+            with self._cond:
+                self._in_use  -= 1
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+        waited = time.monotonic() - started
+        with self._cond:
+            self._checkouts  += 1
+            self._wait_total += waited
+            self._wait_max    = max(self._wait_max, waited)
+        return conn
+
+    def release(self, conn: pymysql.connections.Connection, discard: bool = False) -> None:
+        """
+        빌린 연결을 풀에 반납함.
+        :param conn: 반납할 연결
+        :param discard: `True`면 연결을 닫고 버림 (오류가 난 연결 등)
+        """
+        if not discard:
+            try:
+                # 다음 사용자가 이전 요청의 트랜잭션 스냅샷을 보지 않도록 정리
+                conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            # 풀 크기가 줄어든 뒤 반납된 연결도 닫음
+            close = discard or self._closed or self._created > self._max_size
+            if close:
+                self._created   -= 1
+                self._discarded += 1 if discard else 0
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+        if close:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def resize(self, max_size: int, timeout: Optional[float] = None,
+               ping_interval: Optional[float] = None) -> None:
+        """
+        풀 크기와 대기 시간을 바꿈. 크기가 줄면 넘치는 쉬는 연결은 바로 닫고,
+        사용 중인 연결은 반납될 때 정리됨.
+        """
+        with self._cond:
+            self._max_size = max(1, int(max_size))
+            if timeout is not None:
+                self._timeout = timeout
+            if ping_interval is not None:
+                self._ping_interval = ping_interval
+            excess = []
+            while self._idle and self._created > self._max_size:
+                excess.append(self._idle.pop(0))
+                self._created -= 1
+            self._cond.notify_all()
+        for conn, _ in excess:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        """
+        쉬고 있는 연결을 모두 닫음. 사용 중인 연결은 반납될 때 닫힘.
+        """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        풀 상태와 대기 시간 통계를 반환함.
+        """
+        with self._cond:
+            checkouts = self._checkouts
+            return {
+                "max_size":      self._max_size,
+                "size":          self._created,
+                "in_use":        self._in_use,
+                "idle":          len(self._idle),
+                "checkouts":     checkouts,
+                "wait_avg_ms":   (self._wait_total / checkouts * 1000) if checkouts else 0.0,
+                "wait_max_ms":   self._wait_max * 1000,
+                "timeouts":      self._timeouts,
+                "reconnects":    self._reconnects,
+                "discarded":     self._discarded,
+            }
+
+    def _check(self, conn: pymysql.connections.Connection) -> pymysql.connections.Connection:
+        """
+        오래 쉬었던 연결이 살아있는지 확인하고, `wait_timeout` 등으로 끊겼으면 다시 연결함.
+        """
+        try:
+            conn.ping(reconnect=False)
+            return conn
+        except Exception:
+            pass
+
+        try:
+            conn.ping(reconnect=True)
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+            conn = self._factory()
+        with self._cond:
+            self._reconnects += 1
+        return conn
+
 
 class __DatabaseManager(type):
     __instances = {}
-    
+
     def __call__(cls, *args, **kwargs):
         if cls not in cls.__instances:
             instance = super().__call__(*args, **kwargs)
@@ -23,22 +220,90 @@ class DatabaseManager(metaclass=__DatabaseManager):
     """
     데이터베이스와 상호작용을 관리하는 클래스.
     오직 하나의 인스턴스만 생성됨.
+    연결은 풀에서 스레드(요청)마다 따로 빌려 쓰고, `release`로 반납함.
     """
-    def connect(self, host: str, username: str, password: str) -> None:
+    def __init__(self):
+        self.pool: Optional[ConnectionPool] = None
+        self._local = threading.local()
+        self._pool_args: Optional[tuple] = None
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def connect(self, host: str, username: str, password: str,
+                pool_size: int = 10, pool_timeout: float = 10.0, ping_interval: float = 30.0) -> None:
         """
-        데이터베이스 연결을 시도함.
+        데이터베이스 연결 풀을 준비함. 실제 연결은 처음 사용할 때 열림.
         :param host: DB 주소
         :param username: DB ID
         :param password: DB 비밀번호
+        :param pool_size: 최대 동시 연결 수
+        :param pool_timeout: 연결을 기다리는 최대 시간(초)
+        :param ping_interval: 이 시간(초) 이상 쉬었던 연결은 사용 전 ping으로 확인
+        """
+        def factory() -> pymysql.connections.Connection:
+            return pymysql.connect(
+                host=host,
+                user=username,
+                passwd=password,
+                db="student24_db",
+                charset="utf8mb4"
+            )
+
+        if self.pool is not None:
+            self.pool.close()
+        self._pool_args = (factory, pool_size, pool_timeout, ping_interval)
+        self.pool = ConnectionPool(*self._pool_args)
+
+    def resize(self, pool_size: int, pool_timeout: Optional[float] = None,
+               ping_interval: Optional[float] = None) -> None:
         """
-        self.db_conn = pymysql.connect(
-            host=host,
-            user=username,
-            passwd=password,
-            db="student24_db",
-            charset="utf8mb4"
+        열려 있는 연결을 유지한 채 연결 풀 크기와 대기 시간을 바꿈.
+        """
+        if self.pool is None or self._pool_args is None:
+            return
+        factory, _, old_timeout, old_ping = self._pool_args
+        self._pool_args = (
+            factory,
+            pool_size,
+            old_timeout if pool_timeout is None else pool_timeout,
+            old_ping if ping_interval is None else ping_interval,
         )
-        self.cursor = self.db_conn.cursor()
+        self.pool.resize(pool_size, pool_timeout, ping_interval)
+
+    def _after_fork(self) -> None:
+        """
+        fork된 자식 프로세스(멀티 워커 서버)에서 호출됨.
+        부모에게서 물려받은 연결은 부모와 소켓을 공유하므로 닫지 않고(닫으면 부모 연결까지 끊김)
+        버린 뒤, 워커 전용 풀을 새로 만듦. 실제 연결은 처음 사용할 때 열림.
+        """
+        self._local = threading.local()
+        if self._pool_args is not None:
+            self.pool = ConnectionPool(*self._pool_args)
+
+    @property
+    def db_conn(self) -> pymysql.connections.Connection:
+        """
+        현재 스레드가 빌린 연결. 없으면 풀에서 새로 빌림.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            if self.pool is None:
+                raise RuntimeError("DatabaseManager.connect()가 호출되지 않았습니다.")
+            pool = self.pool
+            conn = pool.acquire()
+            # 설정을 다시 읽어 풀이 바뀌어도 빌려 온 풀에 반납하도록 함께 기억함
+            self._local.pool   = pool
+            self._local.conn   = conn
+            self._local.cursor = conn.cursor()
+        return conn
+
+    @property
+    def cursor(self) -> pymysql.cursors.Cursor:
+        """
+        현재 스레드 전용 커서.
+        """
+        self.db_conn
+        return self._local.cursor
 
     def query(self, sql: str, **kwargs) -> QueryResult:
         """
@@ -47,9 +312,10 @@ class DatabaseManager(metaclass=__DatabaseManager):
         :param kwargs: 인자로 들어갈 객체들의 딕셔너리
         :return: `QueryResult` 타입의 결과
         """
-        affected = self.cursor.execute(sql, kwargs)
-        result   = self.cursor.fetchall()
-        return QueryResult(affected, result)
+        cursor   = self.cursor
+        affected = cursor.execute(sql, kwargs)
+        result   = cursor.fetchall()
+        return QueryResult(affected, result, cursor.lastrowid)
 
     def query_many(self, sql: str, args: List[Any]) -> QueryResult:
         """
@@ -58,8 +324,9 @@ class DatabaseManager(metaclass=__DatabaseManager):
         :param args: 인자로 들어갈 객체들의 딕셔너리로 이루어진 리스트
         :return: `QueryResult` 타입의 결과
         """
-        affected = self.cursor.executemany(sql, args)
-        result   = self.cursor.fetchall()
+        cursor   = self.cursor
+        affected = cursor.executemany(sql, args)
+        result   = cursor.fetchall()
         return QueryResult(affected, result)
 
     def commit(self) -> None:
@@ -69,10 +336,49 @@ class DatabaseManager(metaclass=__DatabaseManager):
         """
         self.db_conn.commit()
 
+    def rollback(self) -> None:
+        """
+        확정되지 않은 쿼리 기록을 되돌림.
+        :return:
+        """
+        if getattr(self._local, 'conn', None) is not None:
+            self._local.conn.rollback()
+
+    def release(self, error: Optional[BaseException] = None) -> None:
+        """
+        현재 스레드가 빌린 연결을 풀에 반납함. 요청이 끝날 때 호출됨.
+        :param error: 요청 처리 중 발생한 예외 (연결 오류면 연결을 버림)
+        연결은 빌려 온 풀에 반납함 (그 사이 `connect`로 풀이 바뀌었으면 예전 풀이 연결을 닫음)
+        :return:
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        cursor = self._local.cursor
+        pool   = self._local.pool
+        self._local.conn   = None
+        self._local.cursor = None
+        self._local.pool   = None
+        try:
+            cursor.close()
+        except Exception:
+            pass
+        discard = isinstance(error, (pymysql.err.OperationalError, pymysql.err.InterfaceError))
+        # 빌린 뒤 풀이 교체되어 닫혔다면 그 풀이 연결을 닫음 (새 풀에 예전 접속 정보의 연결이 섞이지 않음)
+        pool.release(conn, discard=discard)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        연결 풀 통계를 반환함.
+        :return: 풀 크기, 사용 중인 연결 수, 대기 시간 등
+        """
+        return self.pool.stats() if self.pool is not None else {}
+
     def close(self) -> None:
         """
         데이터베이스와의 연결을 해제함.
         :return:
         """
-        self.db_conn.close()
-        
\ No newline at end of file
+        self.release()
+        if self.pool is not None:
+            self.pool.close()
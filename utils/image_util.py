@@ -0,0 +1,100 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple, Union
+
+# (이름, 긴 변의 최대 픽셀)
+RenditionSize = Tuple[str, int]
+
+# 변환 결과 한 건: 저장 파일명, MIME 타입, 가로, 세로, 파일 크기
+Rendition = Dict[str, object]
+
+
+@lru_cache(maxsize=None)
+def pillow_available() -> bool:
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ImageTooLargeError(ValueError):
+    pass
+
+
+def render_image(source: Union[Path, BinaryIO], dest_dir: Path, stem: str, sizes: Sequence[RenditionSize],
+                 quality: int = 82, webp: bool = True,
+                 max_pixels: Optional[int] = None) -> Tuple[Tuple[int, int], Dict[str, Rendition]]:
+    """
+    원본 이미지를 크기별로 줄여 저장함. EXIF 방향은 반영하고 메타데이터(EXIF/GPS 등)는 모두 뺌.
+    투명도가 있으면 PNG, 없으면 JPEG로 저장하고, `webp`가 켜져 있으면 같은 크기의 WebP도 만듦.
+    움직이는 이미지(GIF 등)는 첫 프레임으로 가장 작은 크기만 만들고 나머지는 원본을 그대로 쓰게 함.
+    :param source: 원본 파일 경로 또는 읽을 수 있는 바이너리 객체
+    :param stem: 저장 파일명 앞부분 (예: 원본 파일명에서 확장자를 뺀 것, 하위 디렉터리 포함 가능)
+    :param sizes: `(이름, 긴 변 최대 픽셀)` 목록
+    :param max_pixels: 원본의 최대 픽셀 수(가로 x 세로). 헤더만 읽어 확인하므로 넘는 이미지는 디코딩하지 않음
+    :return: (원본 가로/세로, {이름 또는 "이름_webp": 변환 결과})
+    :raise RuntimeError: Pillow가 설치되어 있지 않은 경우
+    :raise ImageTooLargeError: 픽셀 수가 `max_pixels`를 넘는 경우
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError as e:
+        raise RuntimeError("이미지 변환에는 `pip install Pillow`가 필요합니다.") from e
+
+    with Image.open(source) as opened:
+        # 작은 파일이 거대한 이미지로 풀리는 경우(압축 폭탄)를 막기 위해 디코딩 전에 크기를 확인함
+        width, height = opened.size
+        if max_pixels and width * height > max_pixels:
+            raise ImageTooLargeError(f"이미지가 너무 큽니다: {width}x{height} (최대 {max_pixels} 픽셀)")
+        animated = getattr(opened, "is_animated", False)
+        image = ImageOps.exif_transpose(opened)
+        original_size = image.size
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    if animated:
+        sizes = sorted(sizes, key=lambda item: item[1])[:1]
+
+    results: Dict[str, Rendition] = {}
+    written: List[Path] = []
+    try:
+        for name, max_side in sizes:
+            resized = image.copy()
+            resized.thumbnail((max_side, max_side), Image.LANCZOS)
+
+            ext, fmt, content_type, options = (
+                ("png", "PNG", "image/png", {"optimize": True}) if has_alpha else
+                ("jpg", "JPEG", "image/jpeg", {"quality": quality, "optimize": True, "progressive": True})
+            )
+            encodings = [(name, ext, fmt, content_type, options)]
+            if webp:
+                encodings.append((f"{name}_webp", "webp", "WEBP", "image/webp", {"quality": quality, "method": 4}))
+
+            for key, ext, fmt, content_type, options in encodings:
+                # 크기를 이름에 넣어 설정이 바뀌어도 같은 이름이 다른 내용을 가리키지 않게 함 (영구 캐시 가능)
+                stored_name = f"{stem}.{name}-{max_side}.{ext}"
+                path = dest_dir / stored_name
+                tmp_path = path.with_name(f".{path.name}.tmp")
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # 새 이미지 객체로 저장하므로 원본의 EXIF/ICC/XMP는 따라가지 않음
+                resized.save(tmp_path, fmt, **options)
+                tmp_path.replace(path)
+                written.append(path)
+                results[key] = {
+                    "stored_name": stored_name,
+                    "content_type": content_type,
+                    "width": resized.width,
+                    "height": resized.height,
+                    "file_size": path.stat().st_size,
+                }
+    except Exception:
+        for path in written:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        raise
+
+    return original_size, results
+
@@ -0,0 +1,234 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.cache_util import SingleFlight
+from utils.neis_util import NeisClient, NeisError
+
+MealRow = Dict[str, str]
+
+
+class MealStore:
+    """
+    한 달치 급식을 NEIS에서 한 번에 받아 SQLite 파일에 저장해 두는 캐시.
+    서버를 다시 시작해도 저장된 급식표가 유지됨.
+    """
+    def __init__(self, path: str = "cache/meal_cache.sqlite3", refresh_hours: float = 24.0,
+                 empty_retry_minutes: float = 60.0, refresh_past_months: bool = False):
+        """
+        :param path: SQLite 파일 경로
+        :param refresh_hours: 이번 달/다음 달 급식을 다시 받아오는 주기(시간)
+        :param empty_retry_minutes: 아직 급식표가 올라오지 않은 달을 다시 확인하는 주기(분)
+        :param refresh_past_months: 지난 달도 주기적으로 다시 받을지 여부
+        """
+        self._flight = SingleFlight()
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        if hasattr(os, "register_at_fork"):
+            # SQLite 연결은 fork된 프로세스에서 이어 쓰면 안 되므로 워커마다 새로 엶
+            os.register_at_fork(after_in_child=self._reset_connections)
+        self.configure(path, refresh_hours, empty_retry_minutes, refresh_past_months)
+
+    def configure(self, path: Optional[str] = None, refresh_hours: Optional[float] = None,
+                  empty_retry_minutes: Optional[float] = None,
+                  refresh_past_months: Optional[bool] = None) -> None:
+        if path is not None:
+            self.path = Path(path)
+            self._initialized = False
+        if refresh_hours is not None:
+            self.refresh_seconds = float(refresh_hours) * 3600
+        if empty_retry_minutes is not None:
+            self.empty_retry_seconds = float(empty_retry_minutes) * 60
+        if refresh_past_months is not None:
+            self.refresh_past_months = bool(refresh_past_months)
+
+    def get_meals(self, date: str, meal_type: str) -> List[MealRow]:
+        """
+        해당 날짜의 급식을 반환함. 그 달의 급식표가 없으면 먼저 NEIS에서 받아옴.
+        :param date: `YYYYMMDD` 형식의 날짜
+        :param meal_type: `조식`, `중식`, `석식` 중 하나
+        :return: 급식 정보 딕셔너리의 리스트
+        """
+        return self.get_meals_with_state(date, meal_type)[0]
+
+    def get_meals_with_state(self, date: str, meal_type: str) -> Tuple[List[MealRow], bool]:
+        """
+        `get_meals`와 같지만 돌려준 급식표가 갱신 주기가 지난 오래된 데이터인지도 함께 반환함.
+        :return: (급식 정보 리스트, 오래된 데이터인지 여부)
+        """
+        try:
+            datetime.strptime(date, '%Y%m%d')
+        except (TypeError, ValueError):
+            return [], False
+
+        month = date[:6]
+        fetched, needs_refresh = self._month_status(month)
+        if not fetched:
+            # 처음 보는 달은 받아올 때까지 기다림 (같은 달 동시 요청은 한 번만 호출)
+            self.refresh_month(month)
+            fetched, needs_refresh = self._month_status(month)
+        elif needs_refresh and NeisClient().available('MEAL'):
+            # 저장된 급식표를 바로 돌려주고, 새로 받아오는 건 백그라운드에서 한 번만 함
+            self._flight.do_background(month, self._refresh_month, month)
+        return self._load(date, meal_type), fetched and needs_refresh
+
+    def refresh_month(self, month: str) -> bool:
+        """
+        한 달치 급식을 NEIS에서 받아 저장함. 같은 달을 동시에 요청하면 NEIS 호출은 한 번만 일어남.
+        NEIS 호출이 실패하면 기존에 저장된 데이터는 그대로 둠.
+        :param month: `YYYYMM` 형식의 달
+        :return: 성공 여부
+        """
+        return self._flight.do(month, self._refresh_month, month)
+
+    def _refresh_month(self, month: str) -> bool:
+        # 앞선 호출이 방금 끝났을 수 있으므로 한 번 더 확인
+        if not self._month_status(month)[1]:
+            return True
+        try:
+            data = NeisClient().get('MEAL', MLSV_FROM_YMD=f"{month}01", MLSV_TO_YMD=f"{month}31",
+                                    pIndex=1, pSize=1000)
+        except NeisError:
+            return False
+
+        rows = parse_meal_rows(data)
+        if rows is None:
+            return False
+
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM meals WHERE date LIKE ?", (f"{month}%",))
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO meals (date, meal_type, school_name, menu, calories, nutrition)
+                VALUES (:date, :meal_type, :school_name, :menu, :calories, :nutrition)
+                """,
+                rows
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meal_months (month, fetched_at, row_count) VALUES (?, ?, ?)",
+                (month, now, len(rows))
+            )
+        return True
+
+    def _month_status(self, month: str) -> Tuple[bool, bool]:
+        """
+        :return: (받아온 적이 있는지, 다시 받아와야 하는지)
+        """
+        row = self._conn().execute(
+            "SELECT fetched_at, row_count FROM meal_months WHERE month = ?", (month,)
+        ).fetchone()
+        if row is None:
+            return False, True
+
+        fetched_at, row_count = row
+        age = time.time() - fetched_at
+        if row_count == 0:
+            return True, age >= self.empty_retry_seconds
+        if month < datetime.now().strftime('%Y%m') and not self.refresh_past_months:
+            return True, False
+        return True, age >= self.refresh_seconds
+
+    def _load(self, date: str, meal_type: str) -> List[MealRow]:
+        rows = self._conn().execute(
+            """
+            SELECT school_name, date, menu, calories, nutrition FROM meals
+            WHERE date = ? AND meal_type = ?
+            """,
+            (date, meal_type)
+        ).fetchall()
+        return [
+            {
+                '학교명': school_name,
+                '급식일자': meal_date,
+                '메뉴': menu,
+                '칼로리': calories,
+                '영양정보': nutrition
+            }
+            for (school_name, meal_date, menu, calories, nutrition) in rows
+        ]
+
+    def _reset_connections(self) -> None:
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        # 스레드마다 연결을 하나씩 열어 두고 재사용 (조회마다 파일을 여는 비용을 없앰)
+        # 설정으로 경로가 바뀌면 새 경로로 다시 엶
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.path == self.path:
+            return conn
+        if conn is not None:
+            conn.close()
+        self._initialize()
+        conn = sqlite3.connect(str(self.path), timeout=10)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.conn = conn
+        self._local.path = self.path
+        return conn
+
+    def _initialize(self) -> None:
+        with self._init_lock:
+            if self._initialized:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS meals (
+                        date        TEXT NOT NULL,
+                        meal_type   TEXT NOT NULL,
+                        school_name TEXT,
+                        menu        TEXT,
+                        calories    TEXT,
+                        nutrition   TEXT,
+                        PRIMARY KEY (date, meal_type)
+                    );
+                    CREATE TABLE IF NOT EXISTS meal_months (
+                        month      TEXT PRIMARY KEY,
+                        fetched_at REAL NOT NULL,
+                        row_count  INTEGER NOT NULL
+                    );
+                    """
+                )
+            finally:
+                conn.close()
+            self._initialized = True
+
+
+def parse_meal_rows(data) -> Optional[List[Dict[str, str]]]:
+    """
+    NEIS 급식 응답을 저장용 행으로 변환함.
+    :return: 행 리스트. 해당 기간에 급식이 없으면 빈 리스트, 응답 형식이 잘못됐으면 `None`
+    """
+    try:
+        meals = data['mealServiceDietInfo'][1]['row']
+    except (KeyError, IndexError, TypeError):
+        # 급식이 없는 달은 {"RESULT": {"CODE": "INFO-200"}} 형태로 옴
+        try:
+            if data['RESULT']['CODE'] == 'INFO-200':
+                return []
+        except (KeyError, TypeError):
+            pass
+        return None
+
+    try:
+        return [
+            {
+                'date': meal['MLSV_YMD'],
+                'meal_type': meal['MMEAL_SC_NM'],
+                'school_name': meal['SCHUL_NM'],
+                'menu': meal['DDISH_NM'].replace('<br/>', '\n'),
+                'calories': meal['CAL_INFO'],
+                'nutrition': meal['NTR_INFO'],
+            }
+            for meal in meals
+        ]
+    except (KeyError, AttributeError):
+        return None
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# 픽스처 키를 만들 때 빼는 파라미터 (인증키와 응답 형식은 응답 내용과 무관)
+IGNORED_PARAMS = ("KEY", "Type")
+
+
+def fixture_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """
+    엔드포인트와 요청 파라미터로 픽스처 파일 이름을 만듦.
+    같은 요청이면 파라미터 순서나 값의 타입(1, "1")과 상관없이 같은 키가 나옴.
+    """
+    normalized = sorted(
+        (str(name), str(value))
+        for name, value in params.items()
+        if name not in IGNORED_PARAMS
+    )
+    digest = hashlib.sha1(json.dumps([endpoint, normalized]).encode("utf-8")).hexdigest()
+    return digest[:16]
+
+
+class FixtureStore:
+    """
+    NEIS 응답을 `<디렉터리>/<엔드포인트>/<키>.json` 파일로 저장하고 다시 읽는 클래스.
+    파일에는 요청 파라미터(인증키 제외)와 응답 JSON이 함께 들어 있음.
+    """
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    def path_for(self, endpoint: str, params: Dict[str, Any]) -> Path:
+        return self.directory / endpoint / f"{fixture_key(endpoint, params)}.json"
+
+    def save(self, endpoint: str, params: Dict[str, Any], response: Any) -> Path:
+        """
+        응답을 픽스처 파일로 저장함. 같은 요청의 기존 파일은 덮어씀.
+        :return: 저장한 파일 경로
+        """
+        path = self.path_for(endpoint, params)
+        document = {
+            "endpoint": endpoint,
+            "params": {name: str(value) for name, value in sorted(params.items()) if name not in IGNORED_PARAMS},
+            "response": response,
+        }
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(document, ensure_ascii=False, indent=2), encoding="utf-8")
+            tmp_path.replace(path)
+        return path
+
+    def load(self, endpoint: str, params: Dict[str, Any]) -> Optional[Any]:
+        """
+        :return: 저장된 응답 JSON, 없으면 `None`
+        """
+        path = self.path_for(endpoint, params)
+        try:
+            document = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return document.get("response")
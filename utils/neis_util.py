@@ -0,0 +1,460 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, NamedTuple, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.neis_fixture_util import FixtureStore
+
+logger = logging.getLogger(__name__)
+
+# NEIS가 불안정해 예전에 받아둔 데이터로 응답할 때 붙이는 헤더
+STALE_HEADERS = {
+    "X-Data-Stale": "1",
+    "Warning": '110 - "Response is Stale"',
+}
+
+
+class NeisError(Exception):
+    """
+    NEIS API 호출이 실패했을 때 발생하는 예외 (연결 실패, 시간 초과, HTTP 오류 등).
+    """
+
+
+class CircuitOpenError(NeisError):
+    """
+    서킷 브레이커가 열려 있어 NEIS API를 호출하지 않았을 때 발생하는 예외.
+    """
+
+
+class BreakerPermit(NamedTuple):
+    """
+    `CircuitBreaker.allow`가 내어주는 호출 허가. 결과를 기록할 때 그대로 돌려줌.
+    """
+    generation: int  # 허가를 받은 때의 상태 세대 (상태가 바뀌면 1씩 늘어남)
+    probe: bool      # 반열림 상태의 시험 호출인지
+
+
+class CircuitBreaker:
+    """
+    엔드포인트 하나의 서킷 브레이커.
+    최근 호출의 오류율이나 느린 호출 비율이 기준을 넘으면 열려서(open) 한동안 호출을 막고,
+    `open_seconds`가 지나면 반열림(half_open) 상태로 시험 호출을 보내 성공하면 다시 닫힘.
+    상태가 바뀔 때마다 세대를 올려, 이전 상태에서 시작된 호출의 결과는 새 상태 판단에 쓰지 않음.
+    """
+    CLOSED    = "closed"
+    OPEN      = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, window: int = 20, min_calls: int = 5, error_rate: float = 0.5,
+                 slow_ms: float = 3000.0, slow_rate: float = 0.5, open_seconds: float = 30.0,
+                 half_open_probes: int = 1):
+        """
+        :param window: 오류율 계산에 쓸 최근 호출 수
+        :param min_calls: 서킷을 열기 전에 필요한 최소 호출 수
+        :param error_rate: 서킷을 여는 오류 비율 (0~1)
+        :param slow_ms: 이 시간(ms) 이상 걸린 호출은 느린 호출로 셈
+        :param slow_rate: 서킷을 여는 느린 호출 비율 (0~1)
+        :param open_seconds: 열린 뒤 시험 호출을 보내기까지 기다리는 시간(초)
+        :param half_open_probes: 반열림 상태에서 동시에 보낼 수 있는 시험 호출 수
+        """
+        self.min_calls        = max(1, int(min_calls))
+        self.error_rate       = float(error_rate)
+        self.slow_ms          = float(slow_ms)
+        self.slow_rate        = float(slow_rate)
+        self.open_seconds     = float(open_seconds)
+        self.half_open_probes = max(1, int(half_open_probes))
+
+        self._lock = threading.Lock()
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=max(1, int(window)))
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._generation = 0
+
+        self.opens    = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def reconfigure(self, window: int = 20, min_calls: int = 5, error_rate: float = 0.5,
+                    slow_ms: float = 3000.0, slow_rate: float = 0.5, open_seconds: float = 30.0,
+                    half_open_probes: int = 1) -> None:
+        """
+        기준값만 바꿈. 현재 상태와 최근 호출 기록은 그대로 유지함.
+        """
+        with self._lock:
+            self.min_calls        = max(1, int(min_calls))
+            self.error_rate       = float(error_rate)
+            self.slow_ms          = float(slow_ms)
+            self.slow_rate        = float(slow_rate)
+            self.open_seconds     = float(open_seconds)
+            self.half_open_probes = max(1, int(half_open_probes))
+            self._outcomes = deque(self._outcomes, maxlen=max(1, int(window)))
+
+    def allow(self) -> Optional[BreakerPermit]:
+        """
+        지금 호출해도 되면 허가를, 막혀 있으면 `None`을 반환함. 허가를 받았다면 반드시 `record`를 호출해야 함.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.OPEN:
+                self.rejected += 1
+                return None
+            if state == self.HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    self.rejected += 1
+                    return None
+                if self._state == self.OPEN:
+                    self._state = self.HALF_OPEN
+                    self._generation += 1
+                self._probes += 1
+                return BreakerPermit(self._generation, True)
+            return BreakerPermit(self._generation, False)
+
+    def record(self, permit: BreakerPermit, elapsed_ms: float, failed: bool) -> None:
+        """
+        호출 결과를 기록하고 필요하면 상태를 바꿈.
+        허가를 받은 뒤 상태가 바뀌었으면 (닫힘 상태에서 시작했는데 그 사이 열렸다가 반열림이 된 경우 등) 무시함.
+        """
+        slow = elapsed_ms >= self.slow_ms
+        with self._lock:
+            if permit.generation != self._generation:
+                return
+            if permit.probe:
+                self._probes = max(0, self._probes - 1)
+                if failed or slow:
+                    self._open()
+                else:
+                    self._state = self.CLOSED
+                    self._generation += 1
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append((failed, slow))
+            if len(self._outcomes) < self.min_calls:
+                return
+            total = len(self._outcomes)
+            errors = sum(1 for failed, _ in self._outcomes if failed)
+            slows = sum(1 for _, slow in self._outcomes if slow)
+            if errors / total >= self.error_rate or slows / total >= self.slow_rate:
+                self._open()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._current_state()
+            total = len(self._outcomes)
+            return {
+                "state":        state,
+                "error_rate":   (sum(1 for failed, _ in self._outcomes if failed) / total) if total else 0.0,
+                "slow_rate":    (sum(1 for _, slow in self._outcomes if slow) / total) if total else 0.0,
+                "retry_in":     max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+                                if state == self.OPEN else 0.0,
+                "opens":        self.opens,
+                "rejected":     self.rejected,
+            }
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            return self.HALF_OPEN
+        return self._state
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._generation += 1
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._probes = 0
+        self.opens += 1
+
+
+class EndpointMetrics:
+    """
+    엔드포인트 하나의 호출 횟수, 오류 수, 지연 시간을 기록하는 클래스.
+    """
+    def __init__(self, window: int = 200):
+        """
+        :param window: 백분위 계산에 쓸 최근 표본 수
+        """
+        self.calls     = 0
+        self.errors    = 0
+        self.total_ms  = 0.0
+        self.max_ms    = 0.0
+        self.last_error: Optional[str] = None
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, elapsed_ms: float, error: Optional[str] = None) -> None:
+        self.calls    += 1
+        self.total_ms += elapsed_ms
+        self.max_ms    = max(self.max_ms, elapsed_ms)
+        self._samples.append(elapsed_ms)
+        if error is not None:
+            self.errors    += 1
+            self.last_error = error
+
+    def snapshot(self) -> Dict[str, Any]:
+        samples = sorted(self._samples)
+
+        def percentile(p: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+        return {
+            "calls":      self.calls,
+            "errors":     self.errors,
+            "avg_ms":     (self.total_ms / self.calls) if self.calls else 0.0,
+            "p50_ms":     percentile(0.5),
+            "p95_ms":     percentile(0.95),
+            "max_ms":     self.max_ms,
+            "last_error": self.last_error,
+        }
+
+
+class SharedSession:
+    """
+    여러 스레드가 함께 쓰는 `requests.Session`. 설정이 바뀌어 교체되면 진행 중인 호출이 모두 끝난 뒤 닫음.
+    """
+    def __init__(self, session: requests.Session):
+        self.session = session
+        self._lock = threading.Lock()
+        self._active = 0
+        self._retired = False
+
+    def acquire(self) -> Optional[requests.Session]:
+        """
+        :return: 세션, 이미 교체된 세션이면 `None`
+        """
+        with self._lock:
+            if self._retired:
+                return None
+            self._active += 1
+            return self.session
+
+    def release(self) -> None:
+        with self._lock:
+            self._active -= 1
+            close = self._retired and self._active == 0
+        if close:
+            self.session.close()
+
+    def retire(self) -> None:
+        with self._lock:
+            self._retired = True
+            close = self._active == 0
+        if close:
+            self.session.close()
+
+
+class __NeisClient(type):
+    __instances = {}
+
+    def __call__(cls, *args, **kwargs):
+        if cls not in cls.__instances:
+            instance = super().__call__(*args, **kwargs)
+            cls.__instances[cls] = instance
+        return cls.__instances[cls]
+
+
+class NeisClient(metaclass=__NeisClient):
+    """
+    급식/학사일정/시간표가 함께 쓰는 NEIS Open API 클라이언트.
+    오직 하나의 인스턴스만 생성되며, keep-alive 연결 풀과 타임아웃, 재시도를 공유함.
+    """
+    def __init__(self):
+        self._lock    = threading.Lock()
+        self._metrics: Dict[str, EndpointMetrics] = {}
+        self._session: Optional[SharedSession] = None
+        self._session_key: Optional[Tuple[Any, ...]] = None
+        self._urls: Dict[str, str] = {}
+        self._default_params: Dict[str, str] = {}
+        self._timeout = (3.0, 5.0)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breaker_options: Dict[str, Any] = {}
+        self._mode = "live"
+        self._fixtures: Optional[FixtureStore] = None
+        self._config: Optional[Dict[str, Any]] = None
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """
+        `config.json`의 `NICEAPI` 항목으로 클라이언트를 설정함.
+        설정을 다시 읽을 때도 호출되며, 연결 관련 항목이 바뀐 경우에만 세션을 새로 만들고
+        서킷 브레이커와 통계는 유지함 (브레이커는 기준값만 바뀜).
+        :param config: `KEY`, `SCHULSC`, `SCHULC`, 엔드포인트 URL(`MEAL`, `SCHEDULE`, `TIMETABLE`)과
+                       선택 항목 `ConnectTimeout`, `ReadTimeout`, `Retries`, `Backoff`, `PoolSize`,
+                       서킷 브레이커 항목 `BreakerWindow`, `BreakerMinCalls`, `BreakerErrorRate`,
+                       `BreakerSlowMs`, `BreakerSlowRate`, `BreakerOpenSeconds`,
+                       픽스처 항목 `Mode`(`live`, `record`, `replay`), `FixtureDir`
+        """
+        self._config = dict(config)
+        self._urls = {
+            name: config[name]
+            for name in ("MEAL", "SCHEDULE", "TIMETABLE")
+            if name in config
+        }
+        self._default_params = {
+            'KEY': config["KEY"],
+            'Type': 'json',
+            'ATPT_OFCDC_SC_CODE': config["SCHULSC"],
+            'SD_SCHUL_CODE': config["SCHULC"],
+        }
+        self._timeout = (float(config.get("ConnectTimeout", 3)), float(config.get("ReadTimeout", 5)))
+
+        self._breaker_options = {
+            'window':       int(config.get("BreakerWindow", 20)),
+            'min_calls':    int(config.get("BreakerMinCalls", 5)),
+            'error_rate':   float(config.get("BreakerErrorRate", 0.5)),
+            'slow_ms':      float(config.get("BreakerSlowMs", 3000)),
+            'slow_rate':    float(config.get("BreakerSlowRate", 0.5)),
+            'open_seconds': float(config.get("BreakerOpenSeconds", 30)),
+        }
+        with self._lock:
+            breakers = list(self._breakers.values())
+        for breaker in breakers:
+            breaker.reconfigure(**self._breaker_options)
+
+        # record: 실제 응답을 픽스처 파일로 저장, replay: NEIS 대신 저장된 픽스처로 응답
+        mode = str(config.get("Mode", "live")).lower()
+        if mode not in ("live", "record", "replay"):
+            raise ValueError(f"알 수 없는 NICEAPI Mode입니다: {mode}")
+        self._fixtures = FixtureStore(config.get("FixtureDir", "fixtures/neis")) if mode != "live" else None
+        self._mode = mode
+
+        session_key = (
+            tuple(sorted(self._urls.items())),
+            int(config.get("Retries", 2)),
+            float(config.get("Backoff", 0.3)),
+            int(config.get("PoolSize", 10)),
+        )
+        if self._session is not None and session_key == self._session_key:
+            return
+
+        retries = Retry(
+            total=session_key[1],
+            backoff_factor=session_key[2],
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=len(self._urls) or 1, pool_maxsize=session_key[3],
+                              max_retries=retries)
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        # 새 세션으로 바꾼 뒤, 예전 세션은 진행 중인 호출이 끝나면 닫힘
+        old, self._session = self._session, SharedSession(session)
+        self._session_key = session_key
+        if old is not None:
+            old.retire()
+
+    def get(self, endpoint: str, **params) -> Any:
+        """
+        NEIS API를 호출하고 JSON 응답을 반환함.
+        :param endpoint: `MEAL`, `SCHEDULE`, `TIMETABLE` 중 하나
+        :param params: 기본 파라미터(인증키, 교육청/학교 코드) 외에 추가할 파라미터
+        :return: 파싱된 JSON 객체
+        """
+        if self._session is None:
+            raise NeisError("NeisClient.configure()가 호출되지 않았습니다.")
+        url = self._urls.get(endpoint)
+        if url is None:
+            raise NeisError(f"알 수 없는 NEIS 엔드포인트입니다: {endpoint}")
+
+        breaker = self._breaker(endpoint)
+        permit = breaker.allow()
+        if permit is None:
+            raise CircuitOpenError(f"NEIS API가 불안정해 호출을 잠시 중단했습니다: {endpoint}")
+
+        query = dict(self._default_params)
+        query.update(params)
+
+        shared = None
+        started = time.perf_counter()
+        error = None
+        try:
+            if self._mode == "replay":
+                data = self._fixtures.load(endpoint, query)
+                if data is None:
+                    error = "픽스처 없음"
+                    raise NeisError(f"저장된 NEIS 픽스처가 없습니다: {endpoint} {self._fixtures.path_for(endpoint, query)}")
+                return data
+
+            # 설정이 바뀌어 세션이 교체되는 중이면 새 세션을 씀
+            session = None
+            while session is None:
+                candidate = self._session
+                session = candidate.acquire()
+            shared = candidate
+            response = session.get(url, params=query, timeout=self._timeout)
+            if response.status_code != 200:
+                error = f"HTTP {response.status_code}"
+                raise NeisError(f"NEIS API 요청 실패: {error}")
+            try:
+                data = response.json()
+            except ValueError as exc:
+                error = "잘못된 JSON 응답"
+                raise NeisError(error) from exc
+            if self._mode == "record":
+                try:
+                    self._fixtures.save(endpoint, query, data)
+                except OSError as exc:
+                    logger.warning("NEIS 픽스처 저장 실패: %s", exc)
+            return data
+        except requests.RequestException as exc:
+            error = type(exc).__name__
+            raise NeisError(f"NEIS API 요청 실패: {error}") from exc
+        finally:
+            if shared is not None:
+                shared.release()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                metrics = self._metrics.setdefault(endpoint, EndpointMetrics())
+                metrics.record(elapsed_ms, error)
+            breaker.record(permit, elapsed_ms, error is not None)
+
+    def _after_fork(self) -> None:
+        # fork된 워커는 부모의 keep-alive 소켓을 같이 쓰면 안 되므로 세션을 새로 만듦
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._session = None
+        self._session_key = None
+        if self._config is not None:
+            self.configure(self._config)
+
+    def available(self, endpoint: str) -> bool:
+        """
+        해당 엔드포인트의 서킷이 열려 있지 않은지 반환함.
+        """
+        return self._breaker(endpoint).state != CircuitBreaker.OPEN
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        엔드포인트별 호출 횟수, 오류 수, 지연 시간 통계와 서킷 브레이커 상태를 반환함.
+        """
+        with self._lock:
+            names = sorted(set(self._metrics) | set(self._breakers))
+            metrics = {name: self._metrics[name].snapshot() if name in self._metrics else {} for name in names}
+            breakers = dict(self._breakers)
+        for name, breaker in breakers.items():
+            metrics[name]["breaker"] = breaker.snapshot()
+        return metrics
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(**self._breaker_options)
+                self._breakers[endpoint] = breaker
+            return breaker
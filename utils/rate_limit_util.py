@@ -0,0 +1,212 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from flask import jsonify, request, session
+
+# 엔드포인트별 기본 한도. 범위("IP", "Student")마다 분당 충전량(PerMinute)과 최대 누적량(Burst)
+# `config.json`의 `RateLimit.Endpoints`에 같은 이름으로 적으면 덮어씀
+DEFAULT_LIMITS: Dict[str, Dict[str, Dict[str, float]]] = {
+    "login":              {"IP": {"PerMinute": 20,  "Burst": 10}, "Student": {"PerMinute": 5,  "Burst": 5}},
+    "create_post":        {"IP": {"PerMinute": 60,  "Burst": 20}, "Student": {"PerMinute": 6,  "Burst": 3}},
+    "create_comment":     {"IP": {"PerMinute": 120, "Burst": 40}, "Student": {"PerMinute": 20, "Burst": 10}},
+    "create_sub_comment": {"IP": {"PerMinute": 120, "Burst": 40}, "Student": {"PerMinute": 20, "Burst": 10}},
+    "toggle_like":        {"IP": {"PerMinute": 300, "Burst": 60}, "Student": {"PerMinute": 60, "Burst": 20}},
+}
+
+SCOPES = ("IP", "Student")
+
+
+class TokenBucket:
+    """
+    키별 토큰 버킷. 초당 `rate`개씩 최대 `burst`개까지 채워지고, 요청마다 1개를 씀.
+    키가 `max_keys`개를 넘으면 다시 가득 찬 버킷(버려도 결과가 같음)부터, 그래도 넘으면 가장 오래 안 쓴 키부터 버림
+    (버려진 키는 가득 찬 버킷으로 다시 시작).
+    스레드 안전하지 않으므로 `RateLimiter`의 잠금 안에서만 사용.
+    """
+    def __init__(self, per_minute: float, burst: float, max_keys: int = 10000):
+        self.rate = float(per_minute) / 60.0
+        self.burst = max(1.0, float(burst))
+        self.max_keys = max(1, int(max_keys))
+        self._buckets: "OrderedDict[Any, List[float]]" = OrderedDict()  # 키 -> [남은 토큰, 마지막 갱신 시각]
+
+    def wait_time(self, key: Any, now: float) -> float:
+        """
+        :return: 지금 1개를 쓸 수 있으면 0, 아니면 토큰이 찰 때까지 기다려야 하는 시간(초)
+        """
+        tokens = self._tokens(key, now)
+        if tokens >= 1.0:
+            return 0.0
+        if self.rate <= 0:
+            return math.inf
+        return (1.0 - tokens) / self.rate
+
+    def take(self, key: Any, now: float, evict: bool = True) -> bool:
+        """
+        :param evict: `False`면 자리가 없을 때 아직 차는 중인 다른 키를 버리지 않고, 이 키를 기록하지 않음
+        :return: 기록했으면 `True`
+        """
+        if key not in self._buckets and len(self._buckets) >= self.max_keys:
+            self._prune(now)
+            if not evict and len(self._buckets) >= self.max_keys:
+                return False
+        tokens = self._tokens(key, now)
+        self._buckets[key] = [tokens - 1.0, now]
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _prune(self, now: float) -> None:
+        # 오래 안 쓴 키부터 보면서 다시 가득 찬 버킷을 버리고, 아직 차는 중인 버킷을 만나면 멈춤
+        while self._buckets:
+            key = next(iter(self._buckets))
+            if self._tokens(key, now) < self.burst:
+                return
+            del self._buckets[key]
+
+    def _tokens(self, key: Any, now: float) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return self.burst
+        tokens, updated = bucket
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+
+class __RateLimiter(type):
+    __instances = {}
+
+    def __call__(cls, *args, **kwargs):
+        if cls not in cls.__instances:
+            instance = super().__call__(*args, **kwargs)
+            cls.__instances[cls] = instance
+        return cls.__instances[cls]
+
+
+class RateLimiter(metaclass=__RateLimiter):
+    """
+    엔드포인트별로 IP와 학번에 토큰 버킷 한도를 적용하는 클래스.
+    워커 프로세스마다 따로 세므로, 실제 한도는 설정값 x 워커 수까지 늘어날 수 있음.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enabled = True
+        self.max_keys = 10000
+        self._limits: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self.configure({})
+
+    def configure(self, config: Mapping[str, Any]) -> None:
+        """
+        :param config: `config.json`의 `RateLimit` 섹션
+            `{"Enabled": true, "MaxKeys": 10000, "Endpoints": {"login": {"IP": {"PerMinute": 20, "Burst": 10}}}}`
+            범위를 `null`로 두면 해당 범위는 제한하지 않음
+        """
+        limits = {name: {scope: dict(limit) for scope, limit in scopes.items()}
+                  for name, scopes in DEFAULT_LIMITS.items()}
+        for name, scopes in (config.get("Endpoints") or {}).items():
+            target = limits.setdefault(name, {})
+            for scope, limit in scopes.items():
+                if limit is None:
+                    target.pop(scope, None)
+                else:
+                    target[scope] = {**target.get(scope, {}), **limit}
+
+        with self._lock:
+            self.enabled = bool(config.get("Enabled", True))
+            self.max_keys = int(config.get("MaxKeys", 10000))
+            old_buckets, self._buckets = self._buckets, {}
+            self._limits = limits
+            for name, scopes in limits.items():
+                for scope, limit in scopes.items():
+                    bucket = TokenBucket(limit.get("PerMinute", 60), limit.get("Burst", 10), self.max_keys)
+                    previous = old_buckets.get((name, scope))
+                    if previous is not None:
+                        # 설정만 바뀐 경우 지금까지 쓴 토큰은 그대로 이어감
+                        bucket._buckets = previous._buckets
+                    self._buckets[(name, scope)] = bucket
+                self._counters.setdefault(name, {"allowed": 0, "rejected": 0, "rejected_ip": 0,
+                                                 "rejected_student": 0, "untracked_student": 0})
+
+    def hit(self, endpoint: str, ip: Optional[str] = None, student: Any = None,
+            authenticated: bool = True) -> float:
+        """
+        요청 1건을 기록함. 모든 범위에 토큰이 있을 때만 토큰을 씀. IP 한도를 먼저 확인함.
+        :param endpoint: 한도 이름 (`DEFAULT_LIMITS`의 키)
+        :param ip: 클라이언트 IP
+        :param student: 학번 (로그인 전이면 입력한 학번, 없으면 `None`)
+        :param authenticated: `student`가 세션에서 온 학번인지 여부. `False`(로그인 시 입력값)면
+                              아무 학번이나 넣어 다른 학생의 버킷을 밀어내지 못하도록,
+                              자리가 없을 때 새 학번은 기록하지 않고 IP 한도만 적용함
+        :return: 허용하면 0, 거절하면 다시 시도할 수 있을 때까지의 시간(초)
+        """
+        if not self.enabled:
+            return 0.0
+        keys = {"IP": ip, "Student": None if student in (None, "") else str(student)}
+        now = time.monotonic()
+        with self._lock:
+            counters = self._counters.get(endpoint)
+            if counters is None:
+                return 0.0
+            targets = [(scope, self._buckets[(endpoint, scope)], key) for scope, key in keys.items()
+                       if key is not None and (endpoint, scope) in self._buckets]
+            for scope, bucket, key in targets:
+                wait = bucket.wait_time(key, now)
+                if wait > 0:
+                    counters["rejected"] += 1
+                    counters[f"rejected_{scope.lower()}"] += 1
+                    return wait
+            for scope, bucket, key in targets:
+                evict = authenticated or scope != "Student"
+                if not bucket.take(key, now, evict=evict):
+                    counters["untracked_student"] += 1
+            counters["allowed"] += 1
+        return 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "endpoints": {
+                    name: {
+                        **counters,
+                        "keys": {scope: len(self._buckets[(name, scope)])
+                                 for scope in SCOPES if (name, scope) in self._buckets},
+                    }
+                    for name, counters in self._counters.items()
+                },
+            }
+
+
+def too_many_requests(retry_after: float):
+    response = jsonify({
+        "status": "error",
+        "message": "요청이 너무 많습니다. 잠시 후 다시 시도해 주세요."
+    })
+    response.status_code = 429
+    if math.isfinite(retry_after):
+        response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def rate_limited(endpoint: str) -> Callable:
+    """
+    뷰 함수 앞에서 IP와 세션의 학번으로 한도를 확인하고, 넘으면 DB 작업 없이 429를 반환하는 데코레이터.
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            retry_after = RateLimiter().hit(endpoint, ip=request.remote_addr,
+                                            student=session.get('session_student_id'))
+            if retry_after > 0:
+                return too_many_requests(retry_after)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,336 @@
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Flask, Request, Response
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer, URLSafeTimedSerializer
+from werkzeug.datastructures import CallbackDict
+
+logger = logging.getLogger(__name__)
+
+# (세션 데이터, 만료 시각 UNIX timestamp)
+StoredSession = Tuple[Dict[str, Any], float]
+
+# 세션에 넣어 두는 서명된 로그인 정보의 키
+CLAIMS_KEY = "claims"
+
+
+class SessionStore(ABC):
+    """
+    서버 쪽 세션 저장소의 기본 클래스. 세션 데이터는 JSON으로 저장함.
+    """
+    @abstractmethod
+    def load(self, sid: str) -> Optional[StoredSession]:
+        """
+        :return: (세션 데이터, 만료 시각), 없거나 만료됐으면 `None`
+        """
+
+    @abstractmethod
+    def save(self, sid: str, data: Dict[str, Any], ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, sid: str) -> None:
+        ...
+
+    def sweep(self) -> int:
+        """
+        만료된 세션을 지움.
+        :return: 지운 세션 수
+        """
+        return 0
+
+
+class MemorySessionStore(SessionStore):
+    """
+    프로세스 메모리에 세션을 보관하는 저장소. 워커가 하나일 때나 개발용으로 사용.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[str, Tuple[str, float]] = {}
+
+    def load(self, sid: str) -> Optional[StoredSession]:
+        with self._lock:
+            entry = self._data.get(sid)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return json.loads(entry[0]), entry[1]
+
+    def save(self, sid: str, data: Dict[str, Any], ttl: float) -> None:
+        with self._lock:
+            self._data[sid] = (json.dumps(data), time.time() + ttl)
+
+    def delete(self, sid: str) -> None:
+        with self._lock:
+            self._data.pop(sid, None)
+
+    def sweep(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [sid for sid, (_, expires_at) in self._data.items() if expires_at <= now]
+            for sid in expired:
+                del self._data[sid]
+        return len(expired)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite 파일(WAL 모드)에 세션을 보관하는 저장소. 같은 서버의 여러 워커가 함께 사용할 수 있음.
+    """
+    def __init__(self, path: str = "cache/sessions.sqlite3"):
+        self.path = Path(path)
+        self._local = threading.local()
+        if hasattr(os, "register_at_fork"):
+            # SQLite 연결은 fork된 프로세스에서 이어 쓰면 안 되므로 워커마다 새로 엶
+            os.register_at_fork(after_in_child=self._reset_connections)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(str(self.path), timeout=10)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    sid        TEXT PRIMARY KEY,
+                    data       TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at);
+                """
+            )
+
+    def load(self, sid: str) -> Optional[StoredSession]:
+        row = self._conn().execute(
+            "SELECT data, expires_at FROM sessions WHERE sid = ? AND expires_at > ?", (sid, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def save(self, sid: str, data: Dict[str, Any], ttl: float) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (sid, data, expires_at) VALUES (?, ?, ?)",
+                (sid, json.dumps(data), time.time() + ttl)
+            )
+
+    def delete(self, sid: str) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+    def sweep(self) -> int:
+        conn = self._conn()
+        with conn:
+            return conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def _reset_connections(self) -> None:
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        # 스레드마다 연결을 하나씩 열어 두고 재사용 (요청마다 파일을 여는 비용을 없앰)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=10)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Redis 프로토콜 서버에 세션을 보관하는 저장소. 여러 서버가 세션을 공유할 때 사용.
+    `redis` 패키지가 필요하며, `client`로 `get`/`setex`/`delete`를 지원하는 객체를 직접 넘길 수도 있음.
+    만료는 Redis의 TTL로 처리되므로 따로 지울 필요가 없음.
+    """
+    def __init__(self, url: str = "redis://127.0.0.1:6379/0", key_prefix: str = "session:", client: Any = None):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("Session.Type이 redis면 `pip install redis`가 필요합니다.") from e
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.key_prefix = key_prefix
+
+    def load(self, sid: str) -> Optional[StoredSession]:
+        raw = self.client.get(self.key_prefix + sid)
+        if raw is None:
+            return None
+        document = json.loads(raw)
+        return document["data"], document["expires_at"]
+
+    def save(self, sid: str, data: Dict[str, Any], ttl: float) -> None:
+        expires_at = time.time() + ttl
+        self.client.setex(self.key_prefix + sid, max(1, int(ttl)),
+                          json.dumps({"data": data, "expires_at": expires_at}))
+
+    def delete(self, sid: str) -> None:
+        self.client.delete(self.key_prefix + sid)
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    def __init__(self, initial: Optional[Dict[str, Any]] = None, sid: Optional[str] = None,
+                 expires_at: float = 0.0):
+        def on_update(_) -> None:
+            self.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.expires_at = expires_at
+        self.modified = False
+
+
+class StoreSessionInterface(SessionInterface):
+    """
+    `SessionStore`에 세션을 저장하는 Flask 세션 인터페이스.
+    쿠키에는 서명된 세션 ID만 들어가고, 내용이 바뀌었거나 만료가 가까울 때만 저장소에 씀.
+    """
+    def __init__(self, store: SessionStore, sweep_interval: float = 300.0):
+        """
+        :param store: 세션 저장소
+        :param sweep_interval: 만료된 세션을 지우는 주기(초), 0이면 지우지 않음
+        """
+        self.store = store
+        self.sweep_interval = float(sweep_interval)
+        self._next_sweep = time.monotonic() + self.sweep_interval
+        self._sweep_lock = threading.Lock()
+
+    def open_session(self, app: Flask, request: Request) -> ServerSession:
+        self._maybe_sweep()
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        sid = self._unsign(app, cookie) if cookie else None
+        if sid:
+            stored = self.store.load(sid)
+            if stored is not None:
+                return ServerSession(stored[0], sid=sid, expires_at=stored[1])
+        return ServerSession(sid=None)
+
+    def regenerate(self, session: ServerSession) -> None:
+        """
+        기존 세션 ID를 버리고, 응답을 저장할 때 새 세션 ID를 발급하게 함 (로그인 시 세션 고정 방지).
+        """
+        if session.sid:
+            self.store.delete(session.sid)
+        session.sid = None
+        session.modified = True
+
+    def save_session(self, app: Flask, session: ServerSession, response: Response) -> None:
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified and session.sid:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        ttl = app.permanent_session_lifetime.total_seconds()
+        # 내용이 그대로면 남은 시간이 절반 아래로 떨어졌을 때만 만료를 연장함
+        refresh = session.expires_at - time.time() < ttl / 2
+        if not (session.modified or refresh):
+            return
+        if session.sid is None:
+            session.sid = secrets.token_urlsafe(32)
+        self.store.save(session.sid, dict(session), ttl)
+
+        response.set_cookie(
+            name,
+            self._sign(app, session.sid),
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+    def _maybe_sweep(self) -> None:
+        if self.sweep_interval <= 0 or time.monotonic() < self._next_sweep:
+            return
+        if not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_sweep = time.monotonic() + self.sweep_interval
+            self.store.sweep()
+        except Exception:
+            logger.exception("만료 세션 정리 실패")
+        finally:
+            self._sweep_lock.release()
+
+    @staticmethod
+    def _signer(app: Flask) -> Signer:
+        return Signer(app.secret_key, salt="server-session", key_derivation="hmac")
+
+    def _sign(self, app: Flask, sid: str) -> str:
+        return self._signer(app).sign(sid).decode("utf-8")
+
+    def _unsign(self, app: Flask, cookie: str) -> Optional[str]:
+        try:
+            return self._signer(app).unsign(cookie).decode("utf-8")
+        except BadSignature:
+            return None
+
+
+def build_session_store(app: Flask, session_type: str, config: Dict[str, Any]) -> Optional[SessionStore]:
+    """
+    `Session.Type`에 맞는 세션 저장소를 만듦.
+    :return: 저장소, 이 모듈이 지원하지 않는 종류(`filesystem` 등)면 `None`
+    """
+    session_type = session_type.lower()
+    if session_type == "memory":
+        return MemorySessionStore()
+    if session_type == "sqlite":
+        path = Path(config.get("Path", "cache/sessions.sqlite3"))
+        if not path.is_absolute():
+            path = Path(app.root_path) / path
+        return SQLiteSessionStore(str(path))
+    if session_type == "redis":
+        return RedisSessionStore(config.get("RedisURL", "redis://127.0.0.1:6379/0"),
+                                 key_prefix=config.get("KeyPrefix", "session:"))
+    return None
+
+
+def regenerate_session(app: Flask, session: SessionMixin) -> None:
+    """
+    로그인처럼 권한이 바뀔 때 세션 ID를 새로 발급함 (세션 고정 방지).
+    `StoreSessionInterface`와 flask_session은 저장소의 예전 세션을 지우고,
+    Flask 기본 쿠키 세션은 저장소가 없으므로 내용만 비움.
+    """
+    regenerate = getattr(app.session_interface, "regenerate", None)
+    if regenerate is not None:
+        regenerate(session)
+    session.clear()
+
+
+def _claims_serializer(app: Flask) -> URLSafeTimedSerializer:
+    return URLSafeTimedSerializer(app.secret_key, salt="session-claims")
+
+
+def issue_claims(app: Flask, student_id: int, student_name: str, is_admin: bool) -> str:
+    """
+    로그인한 사용자 정보를 서명해 세션에 넣을 문자열로 만듦.
+    """
+    return _claims_serializer(app).dumps({"sid": student_id, "name": student_name, "admin": bool(is_admin)})
+
+
+def read_claims(app: Flask, token: Optional[str], max_age: float) -> Optional[Dict[str, Any]]:
+    """
+    :param max_age: 발급 후 이 시간(초)이 지난 정보는 무효로 봄 (DB에서 다시 확인해야 함)
+    :return: 로그인 정보, 서명이 틀렸거나 오래됐으면 `None`
+    """
+    if not token:
+        return None
+    try:
+        return _claims_serializer(app).loads(token, max_age=max_age)
+    except BadSignature:
+        return None
@@ -0,0 +1,317 @@
+import os
+import shutil
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from werkzeug.security import safe_join
+
+from utils.cache_util import LRUCache
+
+# (저장 이름, 올릴 로컬 파일, MIME 타입)
+PutItem = Tuple[str, Path, str]
+
+# 저장 이름은 내용 해시(또는 크기가 붙은 변환본 이름)라 내용이 바뀌지 않으므로 오래 캐시해도 됨
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# 객체 저장소에서 "없음"을 뜻하는 오류 코드
+MISSING_CODES = ("404", "NoSuchKey", "NotFound")
+
+
+class ImageStorage(ABC):
+    """
+    게시물 이미지 파일 저장소의 기본 클래스. 이름은 `ab/cd/<해시>.<확장자>`처럼 `/`로 나눈 상대 경로.
+    """
+    @abstractmethod
+    def put(self, name: str, source: Path, content_type: str) -> bool:
+        """
+        로컬 파일을 `name`으로 저장하고 원본 파일은 지움 (옮기거나 올린 뒤 삭제).
+        같은 이름이 이미 있으면 `gc-images`가 오래된 파일로 보고 지우지 않도록 수정 시각만 갱신함.
+        :return: 새로 저장했으면 `True`, 같은 이름(같은 내용)이 이미 있어 건너뛰었으면 `False`
+        """
+
+    def put_many(self, items: Sequence[PutItem]) -> List[bool]:
+        """
+        여러 파일을 저장함. 하나라도 실패하면 예외를 다시 발생시킴.
+        이미 저장한 파일은 다른 요청이 같은 내용으로 쓰고 있을 수 있으므로 지우지 않고 `gc-images`에 맡김.
+        :return: 항목마다 `put`의 결과
+        """
+        return [self.put(name, source, content_type) for name, source, content_type in items]
+
+    @abstractmethod
+    def get(self, name: str) -> bytes:
+        """
+        :raise FileNotFoundError: 없는 이름인 경우
+        """
+
+    @abstractmethod
+    def delete(self, names: Sequence[str]) -> None:
+        """
+        없는 이름은 무시함.
+        """
+
+    @abstractmethod
+    def modified(self, name: str) -> Optional[float]:
+        """
+        :return: 수정 시각 UNIX timestamp, 없는 이름이면 `None`
+        """
+
+    def url(self, name: str) -> Optional[str]:
+        """
+        :return: 클라이언트가 앱을 거치지 않고 받을 수 있는 URL, 앱이 직접 전송해야 하면 `None`
+        """
+        return None
+
+    def local_path(self, name: str) -> Optional[Path]:
+        """
+        :return: 이 서버의 파일 경로, 로컬 저장소가 아니거나 잘못된 이름이면 `None`
+        """
+        return None
+
+    @abstractmethod
+    def iter_files(self) -> Iterator[Tuple[str, float]]:
+        """
+        :return: (저장 이름, 수정 시각 UNIX timestamp) 목록. 업로드 중인 임시 파일은 빠짐
+        """
+
+
+class LocalImageStorage(ImageStorage):
+    """
+    업로드 폴더에 파일로 저장하는 저장소. 앱 서버가 하나일 때 사용하며, 전송은 이미지 경로가 맡음.
+    """
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def put(self, name: str, source: Path, content_type: str) -> bool:
+        path = self._path(name)
+        if path.exists():
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass  # 그 사이 gc-images가 지웠으면 새로 저장함
+            else:
+                source.unlink()
+                return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 같은 파일 시스템 안에서 옮기므로 원자적으로 교체됨 (받다 만 파일이 보이지 않음)
+        os.replace(source, path)
+        return True
+
+    def get(self, name: str) -> bytes:
+        return self._path(name).read_bytes()
+
+    def delete(self, names: Sequence[str]) -> None:
+        for name in names:
+            try:
+                self._path(name).unlink()
+            except (FileNotFoundError, OSError):
+                continue
+
+    def modified(self, name: str) -> Optional[float]:
+        try:
+            return self._path(name).stat().st_mtime
+        except OSError:
+            return None
+
+    def local_path(self, name: str) -> Optional[Path]:
+        joined = safe_join(str(self.root), name)
+        return Path(joined) if joined is not None else None
+
+    def iter_files(self) -> Iterator[Tuple[str, float]]:
+        for path in self.root.rglob('*'):
+            name = path.relative_to(self.root).as_posix()
+            if path.is_file() and not name.startswith('.'):
+                yield name, path.stat().st_mtime
+
+    def _path(self, name: str) -> Path:
+        path = self.local_path(name)
+        if path is None:
+            raise FileNotFoundError(name)
+        return path
+
+
+class S3ImageStorage(ImageStorage):
+    """
+    S3 호환 객체 저장소(AWS S3, MinIO 등)에 저장하는 저장소. 여러 앱 서버가 같은 버킷을 함께 씀.
+    `boto3` 패키지가 필요하며, `client`로 같은 메서드를 지원하는 객체를 직접 넘길 수도 있음.
+    여러 장은 스레드 여러 개로 동시에 올리고, 큰 파일은 boto3가 여러 조각으로 나눠 동시에 올림.
+    다운로드는 `PublicBaseURL`이 있으면 그 주소로, 없으면 서명된 URL(presigned)로 버킷에서 바로 받게 함.
+    서명된 URL은 `presign_window`초 단위 구간마다 한 번만 만들어 같은 구간의 응답이 같은 URL을 쓰게 함
+    (요청마다 URL이 바뀌면 브라우저 캐시를 쓰지 못함). 워커마다 따로 만들므로 오래 캐시하려면 `PublicBaseURL`(CDN)을 쓸 것.
+    """
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None,
+                 region: Optional[str] = None, access_key: Optional[str] = None, secret_key: Optional[str] = None,
+                 public_base_url: Optional[str] = None, presign_seconds: int = 3600, presign_window: int = 600,
+                 presign_cache_size: int = 4096, workers: int = 4,
+                 multipart_threshold: int = 8 * 1024 * 1024, multipart_chunk: int = 8 * 1024 * 1024,
+                 client: Any = None):
+        self.bucket = bucket
+        self.prefix = prefix.strip('/') + '/' if prefix.strip('/') else ""
+        self.public_base_url = public_base_url.rstrip('/') if public_base_url else None
+        self.presign_seconds = int(presign_seconds)
+        self.presign_window = max(1, int(presign_window))
+        self._presigned = LRUCache(max_size=presign_cache_size, ttl=self.presign_window)
+        self.workers = max(1, int(workers))
+        self.transfer_config = None
+        if client is None:
+            try:
+                import boto3
+                from boto3.s3.transfer import TransferConfig
+            except ImportError as e:
+                raise RuntimeError("Uploads.Storage.Type이 s3면 `pip install boto3`가 필요합니다.") from e
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url,
+                region_name=region,
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_key,
+            )
+            self.transfer_config = TransferConfig(
+                multipart_threshold=int(multipart_threshold),
+                multipart_chunksize=int(multipart_chunk),
+                max_concurrency=self.workers,
+            )
+        self.client = client
+
+    def put(self, name: str, source: Path, content_type: str) -> bool:
+        key = self._key(name)
+        extra = {"ContentType": content_type, "CacheControl": IMMUTABLE_CACHE_CONTROL}
+        # 같은 키로 복사해 보고, 없으면(NoSuchKey) 새로 올림
+        if self._touch(key, extra):
+            source.unlink()
+            return False
+        if self.transfer_config is not None:
+            self.client.upload_file(str(source), self.bucket, key, ExtraArgs=extra, Config=self.transfer_config)
+        else:
+            self.client.upload_file(str(source), self.bucket, key, ExtraArgs=extra)
+        source.unlink()
+        return True
+
+    def put_many(self, items: Sequence[PutItem]) -> List[bool]:
+        if len(items) <= 1 or self.workers == 1:
+            return super().put_many(items)
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(items))) as pool:
+            futures = [pool.submit(self.put, name, source, content_type) for name, source, content_type in items]
+        return [future.result() for future in futures]
+
+    def get(self, name: str) -> bytes:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(name))
+        except Exception as e:
+            if _error_code(e) in MISSING_CODES:
+                raise FileNotFoundError(name) from e
+            raise
+        return response["Body"].read()
+
+    def delete(self, names: Sequence[str]) -> None:
+        keys = [self._key(name) for name in dict.fromkeys(names)]
+        # 한 번에 최대 1000개까지 지울 수 있음
+        for start in range(0, len(keys), 1000):
+            self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in keys[start:start + 1000]], "Quiet": True}
+            )
+
+    def modified(self, name: str) -> Optional[float]:
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=self._key(name))
+        except Exception as e:
+            if _error_code(e) in MISSING_CODES:
+                return None
+            raise
+        return response["LastModified"].timestamp()
+
+    def url(self, name: str) -> Optional[str]:
+        key = self._key(name)
+        if self.public_base_url:
+            return f"{self.public_base_url}/{key}"
+        cache_key = (key, int(time.time() // self.presign_window))
+        url = self._presigned.get(cache_key)
+        if url is None:
+            # 구간 끝에 내준 URL도 `presign_seconds`초 이상 유효하도록 구간 길이만큼 더 길게 서명함
+            url = self.client.generate_presigned_url(
+                "get_object", Params={"Bucket": self.bucket, "Key": key},
+                ExpiresIn=self.presign_seconds + self.presign_window
+            )
+            self._presigned.set(cache_key, url)
+        return url
+
+    def iter_files(self) -> Iterator[Tuple[str, float]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get("Contents", ()):
+                yield item["Key"][len(self.prefix):], item["LastModified"].timestamp()
+
+    def _key(self, name: str) -> str:
+        return self.prefix + name
+
+    def _touch(self, key: str, extra: Mapping[str, str]) -> bool:
+        """
+        객체를 같은 키로 복사해 수정 시각(LastModified)을 갱신함.
+        :return: 갱신했으면 `True`, 없는 키면 `False`
+        """
+        try:
+            self.client.copy_object(Bucket=self.bucket, Key=key, CopySource={"Bucket": self.bucket, "Key": key},
+                                    MetadataDirective="REPLACE", **extra)
+        except Exception as e:
+            if _error_code(e) in MISSING_CODES:
+                return False
+            raise
+        return True
+
+
+def _error_code(error: Exception) -> str:
+    # botocore의 ClientError는 `response["Error"]["Code"]`에 오류 코드가 있음
+    response = getattr(error, "response", None) or {}
+    return str(response.get("Error", {}).get("Code", ""))
+
+
+def build_image_storage(upload_dir: Path, config: Mapping[str, Any], client: Any = None) -> ImageStorage:
+    """
+    `Uploads.Storage.Type`에 맞는 저장소를 만듦.
+    :param upload_dir: 업로드 폴더 (local이면 저장 위치, s3면 업로드 중인 임시 파일만 둠)
+    :param client: s3일 때 boto3 대신 쓸 S3 호환 클라이언트 (테스트용 가짜 클라이언트 등)
+    :raise ValueError: 지원하지 않는 종류인 경우
+    """
+    storage_type = str(config.get("Type", "local")).lower()
+    if storage_type == "local":
+        return LocalImageStorage(upload_dir)
+    if storage_type == "s3":
+        return S3ImageStorage(
+            config["Bucket"],
+            prefix=config.get("Prefix", "posts/"),
+            endpoint_url=config.get("EndpointURL"),
+            region=config.get("Region"),
+            access_key=config.get("AccessKey"),
+            secret_key=config.get("SecretKey"),
+            public_base_url=config.get("PublicBaseURL"),
+            presign_seconds=config.get("PresignSeconds", 3600),
+            presign_window=config.get("PresignWindowSeconds", 600),
+            workers=config.get("Workers", 4),
+            multipart_threshold=int(config.get("MultipartThresholdMB", 8) * 1024 * 1024),
+            multipart_chunk=int(config.get("MultipartChunkMB", 8) * 1024 * 1024),
+            client=client,
+        )
+    raise ValueError(f"지원하지 않는 이미지 저장소입니다: {storage_type}")
+
+
+def remove_stale_temp_files(upload_dir: Path, cutoff: float) -> int:
+    """
+    업로드 폴더 맨 위의 임시 파일/폴더(`.`으로 시작) 중 `cutoff`보다 오래된 것을 지움.
+    :return: 지운 개수
+    """
+    removed = 0
+    for path in Path(upload_dir).glob('.*'):
+        try:
+            if path.stat().st_mtime >= cutoff:
+                continue
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+            removed += 1
+        except OSError:
+            continue
+    return removed
@@ -0,0 +1,238 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+import pymysql
+
+from utils.cache_util import SingleFlight
+from utils.database_util import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# (이름, 관리자 여부)
+StudentEntry = Tuple[str, bool]
+
+
+class __StudentDirectory(type):
+    __instances = {}
+
+    def __call__(cls, *args, **kwargs):
+        if cls not in cls.__instances:
+            instance = super().__call__(*args, **kwargs)
+            cls.__instances[cls] = instance
+        return cls.__instances[cls]
+
+
+class StudentDirectory(metaclass=__StudentDirectory):
+    """
+    학번 -> (이름, 관리자 여부)를 메모리에 들고 있는 학생 명부.
+    처음에 `Students` 전체를 읽고, 이후에는 `updated_at`이 바뀐 학생만 주기적으로 다시 읽음.
+    삭제된 학생은 전체 다시 읽기(`full_reload_seconds`)나 `verify`로 DB를 확인할 때 빠짐.
+    명부에 없는 학번은 한 명씩 조회하고, 없는 학번은 잠시 기억해 반복 조회하지 않음.
+    """
+    def __init__(self, refresh_seconds: float = 60.0, full_reload_seconds: float = 3600.0):
+        """
+        :param refresh_seconds: 바뀐 학생을 다시 읽는 주기(초)
+        :param full_reload_seconds: 전체를 다시 읽는 주기(초)
+        """
+        self.refresh_seconds = float(refresh_seconds)
+        self.full_reload_seconds = float(full_reload_seconds)
+
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._entries: Dict[int, StudentEntry] = {}
+        self._missing: Dict[int, float] = {}  # 없는 학번 -> 다시 조회할 수 있는 시각
+        self._watermark: Optional[datetime] = None  # 읽은 학생 중 가장 늦은 updated_at
+        self._loaded_at: Optional[float] = None
+        self._refreshed_at: Optional[float] = None
+        # `updated_at` 컬럼이 없으면(마이그레이션 004 전) 매번 전체를 다시 읽음
+        self._incremental = True
+
+        self.full_loads = 0
+        self.incremental_loads = 0
+        self.lookups = 0
+
+    def configure(self, refresh_seconds: Optional[float] = None,
+                  full_reload_seconds: Optional[float] = None) -> None:
+        if refresh_seconds is not None:
+            self.refresh_seconds = float(refresh_seconds)
+        if full_reload_seconds is not None:
+            self.full_reload_seconds = float(full_reload_seconds)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def get(self, student_id: int) -> Optional[StudentEntry]:
+        """
+        :return: (이름, 관리자 여부), DB에도 없는 학번이면 `None`
+        """
+        self.warm()
+        entry = self._entries.get(student_id)
+        if entry is not None:
+            return entry
+        return self._lookup([student_id]).get(student_id)
+
+    def verify(self, student_id: int) -> Optional[StudentEntry]:
+        """
+        명부를 거치지 않고 DB에서 바로 확인함. 로그인 정보를 다시 발급할 때처럼 삭제된 학생을 놓치면 안 될 때 사용.
+        :return: (이름, 관리자 여부), DB에 없는 학번이면 명부에서도 빼고 `None`
+        """
+        rows = DatabaseManager().query(
+            "SELECT student_name, is_admin FROM Students WHERE student_id = %(student_id)s",
+            student_id=student_id
+        ).result
+        with self._lock:
+            self.lookups += 1
+            if not rows:
+                self._entries.pop(student_id, None)
+                self._missing[student_id] = time.monotonic() + self.refresh_seconds
+                return None
+            entry = (rows[0][0], bool(rows[0][1]))
+            self._entries[student_id] = entry
+            self._missing.pop(student_id, None)
+        return entry
+
+    def names(self, student_ids: Iterable[int]) -> Dict[int, str]:
+        """
+        여러 학번의 이름을 한 번에 찾음. 명부에 없는 학번은 한 번의 쿼리로 모아서 조회함.
+        :return: 학번 -> 이름 (없는 학번은 빠짐)
+        """
+        self.warm()
+        entries = self._entries
+        found: Dict[int, str] = {}
+        unknown = []
+        for student_id in set(student_ids):
+            if student_id is None:
+                continue
+            entry = entries.get(student_id)
+            if entry is not None:
+                found[student_id] = entry[0]
+            else:
+                unknown.append(student_id)
+        if unknown:
+            found.update({sid: entry[0] for sid, entry in self._lookup(unknown).items()})
+        return found
+
+    def put(self, student_id: int, name: str, is_admin: bool) -> None:
+        """
+        로그인 등으로 방금 DB에서 읽은 학생 정보를 명부에 반영함.
+        """
+        with self._lock:
+            self._entries[student_id] = (name, bool(is_admin))
+            self._missing.pop(student_id, None)
+
+    def warm(self) -> None:
+        """
+        처음이거나 갱신 주기가 지났으면 백그라운드에서 명부를 읽음. 요청은 기다리지 않음.
+        """
+        if self._refreshed_at is None or time.monotonic() - self._refreshed_at >= self.refresh_seconds:
+            self._flight.do_background("refresh", self._refresh_in_background)
+
+    def refresh(self) -> int:
+        """
+        명부를 갱신함. 전체 다시 읽기 주기가 지났으면 전체를, 아니면 바뀐 학생만 읽음.
+        :return: 읽은 학생 수
+        """
+        self._refreshed_at = time.monotonic()
+        full_due = (self._loaded_at is None or not self._incremental or self._watermark is None
+                    or time.monotonic() - self._loaded_at >= self.full_reload_seconds)
+        if not full_due:
+            try:
+                return self._load_changed()
+            except pymysql.err.MySQLError as e:
+                # 1054: Unknown column (`updated_at` 없음)
+                if e.args and e.args[0] == 1054:
+                    logger.warning("updated_at 컬럼이 없어 전체 다시 읽기로 갱신합니다 (migrations/004).")
+                    self._incremental = False
+                else:
+                    raise
+        return self._load_all()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "entries": len(self._entries),
+            "loaded": self.loaded,
+            "incremental": self._incremental,
+            "full_loads": self.full_loads,
+            "incremental_loads": self.incremental_loads,
+            "lookups": self.lookups,
+        }
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("학생 명부 갱신 실패")
+        finally:
+            DatabaseManager().release()
+
+    def _load_all(self) -> int:
+        db = DatabaseManager()
+        try:
+            rows = db.query("SELECT student_id, student_name, is_admin, updated_at FROM Students").result
+        except pymysql.err.MySQLError as e:
+            if not (e.args and e.args[0] == 1054):
+                raise
+            self._incremental = False
+            rows = [row + (None,) for row in
+                    db.query("SELECT student_id, student_name, is_admin FROM Students").result]
+        db.commit()
+
+        entries = {sid: (name, bool(is_admin)) for sid, name, is_admin, _ in rows}
+        stamps = [updated_at for *_, updated_at in rows if updated_at is not None]
+        with self._lock:
+            # 통째로 교체하므로 읽는 쪽은 잠금 없이 예전 또는 새 명부 중 하나를 봄
+            self._entries = entries
+            self._missing = {}
+            self._watermark = max(stamps) if stamps else None
+            self._loaded_at = time.monotonic()
+            self.full_loads += 1
+        return len(entries)
+
+    def _load_changed(self) -> int:
+        db = DatabaseManager()
+        # 같은 초에 바뀐 학생을 놓치지 않도록 마지막 시각도 포함해서 읽음
+        rows = db.query(
+            """
+            SELECT student_id, student_name, is_admin, updated_at FROM Students
+            WHERE updated_at >= %(since)s
+            """,
+            since=self._watermark
+        ).result
+        db.commit()
+
+        with self._lock:
+            for sid, name, is_admin, updated_at in rows:
+                self._entries[sid] = (name, bool(is_admin))
+                self._missing.pop(sid, None)
+                if updated_at is not None and (self._watermark is None or updated_at > self._watermark):
+                    self._watermark = updated_at
+            self.incremental_loads += 1
+        return len(rows)
+
+    def _lookup(self, student_ids) -> Dict[int, StudentEntry]:
+        now = time.monotonic()
+        with self._lock:
+            targets = [sid for sid in student_ids if self._missing.get(sid, 0.0) <= now]
+        if not targets:
+            return {}
+
+        params = {f"id_{idx}": sid for idx, sid in enumerate(targets)}
+        placeholders = ", ".join(f"%({key})s" for key in params)
+        rows = DatabaseManager().query(
+            f"SELECT student_id, student_name, is_admin FROM Students WHERE student_id IN ({placeholders})",
+            **params
+        ).result
+
+        found = {sid: (name, bool(is_admin)) for sid, name, is_admin in rows}
+        with self._lock:
+            self.lookups += 1
+            self._entries.update(found)
+            retry_at = now + self.refresh_seconds
+            for sid in targets:
+                if sid not in found:
+                    self._missing[sid] = retry_at
+        return found
@@ -0,0 +1,233 @@
+import logging
+import threading
+import time
+from datetime import date as date_type, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.cache_util import SingleFlight
+from utils.neis_util import NeisClient, NeisError
+
+logger = logging.getLogger(__name__)
+
+# NEIS 한 페이지 최대 행 수
+PAGE_SIZE = 1000
+
+
+def normalize_class_key(value: Any) -> str:
+    """
+    학년/반 값을 NEIS 응답과 같은 형식("1", "12")으로 맞춤. 예: 1, "01" -> "1"
+    """
+    text = str(value).strip()
+    return str(int(text)) if text.isdigit() else text
+
+
+def week_start(day: date_type) -> date_type:
+    return day - timedelta(days=day.weekday())
+
+
+class TimetableStore:
+    """
+    전 학년/전 반의 한 주 시간표를 NEIS에서 한꺼번에 받아 메모리에 색인해 두는 저장소.
+    (학년, 반, 날짜) -> {교시: 과목} 형태로 바로 찾을 수 있음.
+    """
+    def __init__(self, refresh_minutes: float = 60.0, max_weeks: int = 8):
+        """
+        :param refresh_minutes: 받아온 주 시간표를 다시 받아오는 주기(분)
+        :param max_weeks: 메모리에 보관할 최대 주 수
+        """
+        self.refresh_seconds = float(refresh_minutes) * 60
+        self.max_weeks = max(1, int(max_weeks))
+
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._index: Dict[Tuple[str, str, str], Dict[str, str]] = {}
+        self._dates_with_data: set = set()
+        self._weeks: Dict[str, float] = {}  # 주 시작일(YYYYMMDD) -> 받아온 시각
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def configure(self, refresh_minutes: Optional[float] = None) -> None:
+        if refresh_minutes is not None:
+            self.refresh_seconds = float(refresh_minutes) * 60
+
+    def get_day(self, date: str, grade: Any, class_nm: Any) -> Optional[Dict[str, Any]]:
+        """
+        하루 시간표를 반환함.
+        :param date: `YYYYMMDD` 형식의 날짜
+        :return: `{"data": [...], "message": ...}`, 해당 주를 불러오지 못했으면 `None`
+        """
+        day = self._parse_date(date)
+        if day is None or not self._ensure_week(day):
+            return None
+
+        grade, class_nm = normalize_class_key(grade), normalize_class_key(class_nm)
+        with self._lock:
+            periods = self._index.get((grade, class_nm, date))
+            has_any = date in self._dates_with_data
+
+        if not periods:
+            message = "시간표 데이터가 없습니다." if has_any else "오늘은 쉬는날"
+            return {"data": [], "message": message}
+        return {"data": self._rows(grade, class_nm, periods), "message": ""}
+
+    def get_week(self, date: str, grade: Any, class_nm: Any) -> Optional[Dict[str, Any]]:
+        """
+        해당 날짜가 속한 주(월~일)의 시간표를 날짜별로 반환함.
+        :return: `{"data": {날짜: [...]}, "message": ...}`, 해당 주를 불러오지 못했으면 `None`
+        """
+        day = self._parse_date(date)
+        if day is None or not self._ensure_week(day):
+            return None
+
+        grade, class_nm = normalize_class_key(grade), normalize_class_key(class_nm)
+        monday = week_start(day)
+        week: Dict[str, List[Dict[str, str]]] = {}
+        with self._lock:
+            for offset in range(7):
+                key = (monday + timedelta(days=offset)).strftime('%Y%m%d')
+                periods = self._index.get((grade, class_nm, key))
+                if periods:
+                    week[key] = self._rows(grade, class_nm, periods)
+        return {"data": week, "message": "" if week else "시간표 데이터가 없습니다."}
+
+    def is_stale(self, date: str) -> bool:
+        """
+        해당 날짜가 속한 주의 시간표가 갱신 주기가 지난 오래된 데이터인지 반환함.
+        """
+        day = self._parse_date(date)
+        if day is None:
+            return False
+        fetched_at = self._weeks.get(week_start(day).strftime('%Y%m%d'))
+        return fetched_at is not None and time.time() - fetched_at >= self.refresh_seconds
+
+    def refresh_week(self, day: date_type) -> bool:
+        """
+        `day`가 속한 주의 전 학년/전 반 시간표를 받아 색인을 교체함.
+        :return: 성공 여부 (실패하면 기존 색인을 유지)
+        """
+        monday = week_start(day)
+        from_ymd = monday.strftime('%Y%m%d')
+        to_ymd = (monday + timedelta(days=6)).strftime('%Y%m%d')
+
+        rows = []
+        page = 1
+        try:
+            while True:
+                data = NeisClient().get('TIMETABLE', TI_FROM_YMD=from_ymd, TI_TO_YMD=to_ymd,
+                                        pIndex=page, pSize=PAGE_SIZE)
+                try:
+                    head = data['hisTimetable'][0]['head']
+                    page_rows = data['hisTimetable'][1]['row']
+                    total = int(head[0]['list_total_count'])
+                except (KeyError, IndexError, TypeError, ValueError):
+                    # 방학 등으로 한 주 전체가 비어 있으면 INFO-200이 옴
+                    if data.get('RESULT', {}).get('CODE') == 'INFO-200':
+                        break
+                    return False
+                rows.extend(page_rows)
+                if not page_rows or len(rows) >= total:
+                    break
+                page += 1
+        except NeisError:
+            return False
+
+        index: Dict[Tuple[str, str, str], Dict[str, str]] = {}
+        dates = set()
+        for row in rows:
+            try:
+                key = (normalize_class_key(row['GRADE']), normalize_class_key(row['CLASS_NM']), row['ALL_TI_YMD'])
+                index.setdefault(key, {})[str(row['PERIO'])] = row['ITRT_CNTNT']
+                dates.add(row['ALL_TI_YMD'])
+            except KeyError:
+                continue
+
+        week_dates = {(monday + timedelta(days=offset)).strftime('%Y%m%d') for offset in range(7)}
+        with self._lock:
+            for key in [key for key in self._index if key[2] in week_dates]:
+                del self._index[key]
+            self._index.update(index)
+            self._dates_with_data -= week_dates
+            self._dates_with_data |= dates
+            self._weeks[from_ymd] = time.time()
+            self._evict_old_weeks()
+        return True
+
+    def _evict_old_weeks(self) -> None:
+        # 이전 주 등을 조회해 쌓인 주는 가장 오래전에 받은 것부터 버림
+        while len(self._weeks) > self.max_weeks:
+            oldest = min(self._weeks, key=self._weeks.get)
+            del self._weeks[oldest]
+            monday = datetime.strptime(oldest, '%Y%m%d').date()
+            week_dates = {(monday + timedelta(days=offset)).strftime('%Y%m%d') for offset in range(7)}
+            for key in [key for key in self._index if key[2] in week_dates]:
+                del self._index[key]
+            self._dates_with_data -= week_dates
+
+    def start(self, interval_minutes: Optional[float] = None) -> None:
+        """
+        이번 주(주말이면 다음 주도) 시간표를 주기적으로 다시 받아오는 백그라운드 스레드를 시작함.
+        """
+        if interval_minutes is not None:
+            self.refresh_seconds = float(interval_minutes) * 60
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="timetable-refresh", daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while True:
+            today = datetime.now().date()
+            targets = [today]
+            if today.weekday() >= 4:
+                targets.append(today + timedelta(days=7))
+            for day in targets:
+                try:
+                    self.refresh_week(day)
+                except Exception as e:
+                    logger.warning("시간표 갱신 실패: %s", e)
+            if self._stop.wait(max(self.refresh_seconds, 60)):
+                return
+
+    def _ensure_week(self, day: date_type) -> bool:
+        key = week_start(day).strftime('%Y%m%d')
+        fetched_at = self._weeks.get(key)
+        if fetched_at is not None:
+            if time.time() - fetched_at >= self.refresh_seconds and NeisClient().available('TIMETABLE'):
+                # 받아둔 주를 바로 쓰고, 새로 받아오는 건 백그라운드에서 한 번만 함
+                self._flight.do_background(key, self._refresh_if_stale, day)
+            return True
+        # 처음 보는 주는 받아올 때까지 기다림 (같은 주 동시 요청은 한 번만 호출)
+        return self._flight.do(key, self._refresh_if_stale, day)
+
+    def _refresh_if_stale(self, day: date_type) -> bool:
+        fetched_at = self._weeks.get(week_start(day).strftime('%Y%m%d'))
+        if fetched_at is not None and time.time() - fetched_at < self.refresh_seconds:
+            return True
+        return self.refresh_week(day)
+
+    @staticmethod
+    def _parse_date(date: str) -> Optional[date_type]:
+        try:
+            return datetime.strptime(date, '%Y%m%d').date()
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _rows(grade: str, class_nm: str, periods: Dict[str, str]) -> List[Dict[str, str]]:
+        return [
+            {
+                'grade': grade,
+                'class': class_nm,
+                'period': period,
+                'subject': subject
+            }
+            for period, subject in sorted(periods.items(), key=lambda item: int(item[0]) if item[0].isdigit() else 99)
+        ]
@@ -0,0 +1,183 @@
+import hashlib
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+from uuid import uuid4
+
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+
+# 스트림에서 한 번에 읽는 크기
+CHUNK_SIZE = 64 * 1024
+
+# 업로드 중인 임시 파일 이름 앞부분
+TEMP_PREFIX = ".upload-"
+
+# 형식 판별에 필요한 앞부분 바이트 수
+SNIFF_BYTES = 12
+
+# 파일 앞부분(매직 바이트) -> (확장자, MIME 타입)
+IMAGE_SIGNATURES: Tuple[Tuple[bytes, int, str, str], ...] = (
+    # (시그니처, 시작 위치, 확장자, MIME 타입)
+    (b"\xff\xd8\xff", 0, "jpg", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", 0, "png", "image/png"),
+    (b"GIF87a", 0, "gif", "image/gif"),
+    (b"GIF89a", 0, "gif", "image/gif"),
+    (b"WEBP", 8, "webp", "image/webp"),  # RIFF....WEBP
+)
+
+
+class UploadRejected(ValueError):
+    """
+    업로드가 크기 제한이나 형식 검사를 통과하지 못했을 때 발생하는 예외. 메시지는 사용자에게 그대로 보여줌.
+    """
+
+
+def sniff_image_type(head: bytes) -> Optional[Tuple[str, str]]:
+    """
+    :param head: 파일 앞부분 (`SNIFF_BYTES` 이상)
+    :return: (확장자, MIME 타입), 지원하지 않는 형식이면 `None`
+    """
+    for signature, offset, ext, mimetype in IMAGE_SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            if ext == "webp" and not head.startswith(b"RIFF"):
+                continue
+            return ext, mimetype
+    return None
+
+
+@dataclass
+class StreamedFile:
+    """
+    업로드 디렉터리의 임시 파일에 바로 기록된 업로드 파일 하나.
+    """
+    field_name: str
+    filename: str
+    temp_path: Path
+    ext: str = ""
+    content_type: str = ""
+    size: int = 0
+    sha256: str = ""
+    _hasher: "hashlib._Hash" = field(default_factory=hashlib.sha256, repr=False)
+    _head: bytes = field(default=b"", repr=False)
+
+
+class MultipartImageReceiver:
+    """
+    multipart/form-data 요청 본문을 스트림에서 조금씩 읽어 파일 부분은 업로드 디렉터리의 임시 파일에 바로 씀.
+    파일마다 읽는 동안 SHA-256을 계산하고, 크기 제한과 앞부분 형식(매직 바이트)을 검사해 어긋나면 바로 중단함.
+    요청 전체를 메모리나 별도 임시 파일에 먼저 받아두지 않으므로 한 번만 복사함.
+    """
+    def __init__(self, upload_dir: Path, max_file_bytes: Optional[int] = None,
+                 allowed_exts: Iterable[str] = (), max_field_bytes: int = 500 * 1024):
+        """
+        :param max_file_bytes: 파일 하나의 최대 크기, `None`이면 제한 없음
+        :param allowed_exts: 허용할 확장자 (비어 있으면 판별 가능한 이미지 형식 모두)
+        :param max_field_bytes: 파일이 아닌 필드 값 전체의 최대 크기
+        """
+        self.upload_dir = Path(upload_dir)
+        self.max_file_bytes = max_file_bytes
+        self.allowed_exts = {"jpg" if ext == "jpeg" else ext for ext in allowed_exts}
+        self.max_field_bytes = max_field_bytes
+
+    def receive(self, stream: BinaryIO, boundary: bytes) -> Tuple[MultiDict, List[StreamedFile]]:
+        """
+        :return: (일반 필드, 받은 파일 목록). 파일의 임시 파일은 호출한 쪽에서 옮기거나 지워야 함
+        :raise UploadRejected: 크기 제한을 넘었거나 지원하지 않는 형식인 경우 (받던 임시 파일은 모두 지움)
+        """
+        decoder = MultipartDecoder(boundary, max_form_memory_size=self.max_field_bytes)
+        fields: MultiDict = MultiDict()
+        files: List[StreamedFile] = []
+        current: Optional[StreamedFile] = None
+        out: Optional[BinaryIO] = None
+        field_name: Optional[str] = None
+        field_parts: List[bytes] = []
+        field_bytes = 0
+
+        try:
+            finished = False
+            while not finished:
+                chunk = stream.read(CHUNK_SIZE)
+                decoder.receive_data(chunk or None)
+                event = decoder.next_event()
+                while not isinstance(event, NeedData):
+                    if isinstance(event, File):
+                        if event.filename:
+                            current = StreamedFile(event.name, event.filename,
+                                                   self.upload_dir / f"{TEMP_PREFIX}{uuid4().hex}.tmp")
+                            files.append(current)
+                            out = open(current.temp_path, "wb")
+                        else:
+                            current = None  # 빈 파일 입력칸은 건너뜀
+                    elif isinstance(event, Field):
+                        field_name, field_parts = event.name, []
+                    elif isinstance(event, Data):
+                        if field_name is not None:
+                            field_bytes += len(event.data)
+                            if field_bytes > self.max_field_bytes:
+                                raise UploadRejected("요청 본문이 너무 큽니다.")
+                            field_parts.append(event.data)
+                            if not event.more_data:
+                                fields.add(field_name, b"".join(field_parts).decode("utf-8", "replace"))
+                                field_name = None
+                        elif current is not None:
+                            self._write(current, out, event.data)
+                            if not event.more_data:
+                                self._finish(current, out)
+                                current, out = None, None
+                    elif isinstance(event, Epilogue):
+                        finished = True
+                        break
+                    event = decoder.next_event()
+                if not chunk and not finished:
+                    raise UploadRejected("요청 본문이 완전하지 않습니다.")
+        except Exception as e:
+            if out is not None:
+                out.close()
+            discard_streamed_files(files)
+            # 디코더가 필드 크기 제한(413)이나 잘못된 형식(ValueError)으로 멈춘 경우도 사용자 오류로 알림
+            if isinstance(e, RequestEntityTooLarge):
+                raise UploadRejected("요청 본문이 너무 큽니다.") from e
+            if isinstance(e, ValueError) and not isinstance(e, UploadRejected):
+                raise UploadRejected("요청 본문이 완전하지 않습니다.") from e
+            raise
+        return fields, files
+
+    def _write(self, current: StreamedFile, out: BinaryIO, data: bytes) -> None:
+        current.size += len(data)
+        if self.max_file_bytes and current.size > self.max_file_bytes:
+            limit_mb = self.max_file_bytes / (1024 * 1024)
+            raise UploadRejected(f"이미지 크기는 {limit_mb:.0f}MB 이하만 가능합니다: {current.filename}")
+        if not current.ext:
+            current._head += data[:SNIFF_BYTES]
+            if len(current._head) >= SNIFF_BYTES:
+                self._sniff(current)
+        current._hasher.update(data)
+        out.write(data)
+
+    def _finish(self, current: StreamedFile, out: BinaryIO) -> None:
+        out.close()
+        if not current.ext:
+            self._sniff(current)  # 앞부분보다 작은 파일
+        current.sha256 = current._hasher.hexdigest()
+
+    def _sniff(self, current: StreamedFile) -> None:
+        kind = sniff_image_type(current._head)
+        if kind is None or (self.allowed_exts and kind[0] not in self.allowed_exts):
+            raise UploadRejected(f"지원하지 않는 이미지 형식입니다: {current.filename}")
+        current.ext, current.content_type = kind
+
+
+def discard_streamed_files(files: Iterable[StreamedFile]) -> None:
+    for streamed in files:
+        try:
+            os.unlink(streamed.temp_path)
+        except OSError:
+            continue
+
+
+def multipart_boundary(mimetype_params: Dict[str, str]) -> Optional[bytes]:
+    boundary = mimetype_params.get("boundary")
+    return boundary.encode("latin-1") if boundary else None